@@ -0,0 +1,91 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from dataclasses import dataclass
+from typing import Optional
+
+from a2a.types import AgentCard
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CARD_CACHE_DIR = os.path.join(tempfile.gettempdir(), "mafia_agent_cards")
+
+
+@dataclass
+class CachedCard:
+    """디스크에 저장된 피어 카드 한 장."""
+    url: str
+    card: AgentCard
+    fingerprint: str            # 카드 내용 해시 (재검증 시 변경 여부 판단)
+    etag: Optional[str] = None  # 서버가 ETag를 주면 If-None-Match로 재검증
+
+
+class AgentCardCache:
+    """
+    피어 URL을 키로 AgentCard를 디스크에 저장하는 캐시.
+
+    클러스터를 다시 띄울 때 캐시된 카드로 연결을 즉시 등록하고,
+    실제 카드 조회는 백그라운드에서 재검증용으로만 수행합니다.
+    같은 호스트의 여러 에이전트 프로세스가 함께 쓰므로 URL마다 파일을 따로 두고
+    임시 파일 + os.replace로 원자적으로 교체합니다.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: 캐시 디렉터리, None이면 MAFIA_CARD_CACHE_DIR 또는 임시 디렉터리
+        """
+        self.path = path or os.getenv("MAFIA_CARD_CACHE_DIR", DEFAULT_CARD_CACHE_DIR)
+        os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(card: AgentCard) -> str:
+        raw = json.dumps(card.model_dump(mode="json", exclude_none=True), sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _file(self, url: str) -> str:
+        return os.path.join(self.path, hashlib.sha1(str(url).encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url: str) -> Optional[CachedCard]:
+        """url에 해당하는 캐시된 카드를 반환합니다. 없거나 손상되었으면 None."""
+        try:
+            with open(self._file(url), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            card = AgentCard.model_validate(data["card"])
+            return CachedCard(url=data["url"], card=card,
+                              fingerprint=data["fingerprint"], etag=data.get("etag"))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ 카드 캐시 읽기 실패 ({url}): {e}")
+            return None
+
+    def put(self, url: str, card: AgentCard, etag: Optional[str] = None) -> CachedCard:
+        """카드를 저장하고 저장된 항목을 반환합니다."""
+        entry = CachedCard(url=str(url), card=card, fingerprint=self.fingerprint(card), etag=etag)
+        data = {
+            "url": entry.url,
+            "fingerprint": entry.fingerprint,
+            "etag": entry.etag,
+            "card": card.model_dump(mode="json", exclude_none=True),
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self._file(url))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return entry
+
+    def invalidate(self, url: str):
+        try:
+            os.remove(self._file(url))
+        except FileNotFoundError:
+            pass
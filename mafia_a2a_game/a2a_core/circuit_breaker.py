@@ -0,0 +1,133 @@
+import time
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable
+from typing import Optional
+
+from .metrics import CIRCUIT_TRANSITIONS
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"         # 정상: 모든 요청 전송
+    OPEN = "open"             # 차단: 요청을 보내지 않고 즉시 실패
+    HALF_OPEN = "half_open"   # 시험: 요청 하나(또는 probe)로 회복 여부 확인
+
+
+class CircuitOpenError(ConnectionError):
+    """피어의 circuit이 열려 있어 요청을 보내지 않았습니다."""
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """피어별 circuit breaker 설정."""
+    enabled: bool = True
+    # 연속 실패(timeout 포함)가 이 횟수에 도달하면 circuit을 엶
+    failure_threshold: int = 3
+    # 열린 뒤 회복 확인(probe)까지 기다리는 시간, 회복 확인이 실패할 때마다 두 배 (max_reset_timeout까지)
+    reset_timeout: float = 1.0
+    max_reset_timeout: float = 30.0
+    probe_timeout: float = 2.0
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> "CircuitBreakerConfig":
+        """
+        에이전트 설정의 "circuitBreaker" 항목.
+        예: {"failureThreshold": 3, "resetTimeout": 1.0}
+        """
+        config = config or {}
+        return cls(
+            enabled=config.get("enabled", cls.enabled),
+            failure_threshold=config.get("failureThreshold", cls.failure_threshold),
+            reset_timeout=config.get("resetTimeout", cls.reset_timeout),
+            max_reset_timeout=config.get("maxResetTimeout", cls.max_reset_timeout),
+            probe_timeout=config.get("probeTimeout", cls.probe_timeout),
+        )
+
+
+class CircuitBreaker:
+    """
+    피어 하나에 대한 circuit breaker.
+
+    CLOSED에서 연속 실패가 failure_threshold에 도달하면 OPEN이 되어 allow()가 바로 False를 반환합니다.
+    reset_timeout이 지나면 HALF_OPEN이 되어 시험 요청 하나만 허용하고,
+    그 결과에 따라 CLOSED로 돌아가거나 (더 긴 reset_timeout으로) 다시 OPEN이 됩니다.
+    """
+
+    def __init__(self, owner: str, peer: str, config: CircuitBreakerConfig,
+                 on_open: Optional[Callable[["CircuitBreaker"], None]] = None):
+        """
+        Args:
+            owner: 이 breaker를 사용하는 에이전트 이름 (지표 레이블)
+            peer: 대상 피어 이름
+            config: 임계값과 대기 시간
+            on_open: circuit이 열릴 때 호출 (회복 probe 시작용)
+        """
+        self.owner = owner
+        self.peer = peer
+        self.config = config
+        self.on_open = on_open
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.open_for = config.reset_timeout
+        self._trial = False
+
+    @property
+    def available(self) -> bool:
+        """회복이 확인된 피어인지 (HALF_OPEN은 아직 확인 전이므로 False)."""
+        return not self.config.enabled or self.state == CircuitState.CLOSED
+
+    def retry_in(self) -> float:
+        """HALF_OPEN으로 바뀔 때까지 남은 시간(초)."""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.open_for - time.monotonic())
+
+    def allow(self) -> bool:
+        """지금 요청을 보내도 되는지. HALF_OPEN에서는 시험 요청 하나에만 True를 반환합니다."""
+        if not self.config.enabled or self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.OPEN:
+            if self.retry_in() > 0:
+                return False
+            self.transition(CircuitState.HALF_OPEN)
+        if self._trial:
+            return False
+        self._trial = True
+        return True
+
+    def record_success(self):
+        self._trial = False
+        self.failures = 0
+        self.open_for = self.config.reset_timeout
+        if self.state != CircuitState.CLOSED:
+            self.transition(CircuitState.CLOSED)
+
+    def record_failure(self):
+        self._trial = False
+        if self.state == CircuitState.HALF_OPEN:
+            # 시험 요청 실패: 더 오래 차단
+            self.open_for = min(self.open_for * 2, self.config.max_reset_timeout)
+            self.trip()
+            return
+        self.failures += 1
+        if self.state == CircuitState.CLOSED and self.failures >= self.config.failure_threshold:
+            self.trip()
+
+    def release(self):
+        """시험 요청이 결과 없이 (취소 등으로) 끝났을 때 다음 시험을 허용합니다."""
+        self._trial = False
+
+    def trip(self):
+        self.opened_at = time.monotonic()
+        self.transition(CircuitState.OPEN)
+        if self.on_open is not None:
+            self.on_open(self)
+
+    def transition(self, state: CircuitState):
+        if state == self.state:
+            return
+        print(f"🔌 {self.owner} → {self.peer} circuit {self.state.value} → {state.value}")
+        self.state = state
+        CIRCUIT_TRANSITIONS.inc((self.owner, self.peer, state.value))
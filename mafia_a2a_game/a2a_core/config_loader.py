@@ -4,6 +4,15 @@ from pathlib import Path
 from typing import Any
 from .a2a_client import A2AServerEntry
 
+def agent_url(config: dict[str, Any]) -> str:
+    """
+    에이전트 설정의 A2A 서버 주소.
+    한 서버에 여러 에이전트를 경로로 나눠 올린 경우 "path" 항목이 붙습니다. (예: http://host:port/agents/alice/)
+    """
+    path = config.get("path", "").strip("/")
+    return f"http://{config['host']}:{config['port']}/" + (f"{path}/" if path else "")
+
+
 def load_a2a_config(path: str | Path) -> dict[str, Any]:
     with open(path, 'r', encoding='utf-8') as f:
         return json.load(f)
@@ -42,9 +51,7 @@ def load_a2a_server_addresses_from_config_dir(config_dir: str, except_file: str
                     print(f"[경고] {filename}에 host 또는 port 정보가 없습니다. 건너뜁니다.")
                     continue
 
-                url = f"http://{host}:{port}/"
-                
-                entry = A2AServerEntry(name=name, url=url)
+                entry = A2AServerEntry(name=name, url=agent_url(config))
                 server_entries.append(entry)
 
             except (json.JSONDecodeError, FileNotFoundError) as e:
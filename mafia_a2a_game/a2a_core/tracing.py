@@ -0,0 +1,249 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import time
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+from typing import Iterator
+from typing import Optional
+from uuid import uuid4
+
+
+logger = logging.getLogger(__name__)
+
+# A2A Message.metadata 안에서 trace 문맥을 담는 키
+TRACE_METADATA_KEY = "mafia.trace"
+TRACE_DIR_ENV = "MAFIA_TRACE_DIR"
+NO_CONTEXT = "no-context"
+
+
+@dataclass(slots=True, frozen=True)
+class SpanContext:
+    """현재 span의 식별자. 자식 span과 다른 에이전트로 보내는 메시지가 이어받습니다."""
+    trace_id: str
+    span_id: str
+    agent: str = ""
+    context_id: Optional[str] = None
+
+
+# 현재 실행 중인 span (execute/send_to_other/LLM 호출이 중첩되며 설정)
+current_span: ContextVar[Optional[SpanContext]] = ContextVar("mafia_trace_span", default=None)
+
+
+def _new_id() -> str:
+    return uuid4().hex[:16]
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", value) or NO_CONTEXT
+
+
+class Tracer:
+    """
+    span을 게임(context_id)별 JSONL 파일에 기록합니다.
+
+    파일은 {trace_dir}/{context_id}.{pid}.jsonl 이므로 에이전트 프로세스가 여러 개여도
+    서로 다른 파일에 쓰고, merge_trace가 한 게임의 파일들을 하나의 Chrome trace로 합칩니다.
+    trace_dir가 없으면 비활성화되며 span()은 아무것도 기록하지 않습니다.
+    """
+
+    def __init__(self, trace_dir: Optional[str] = None):
+        self.configure(trace_dir)
+
+    def configure(self, trace_dir: Optional[str]):
+        self.trace_dir = trace_dir or None
+        if self.trace_dir:
+            os.makedirs(self.trace_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.trace_dir is not None
+
+    def path_for(self, context_id: Optional[str]) -> str:
+        return os.path.join(self.trace_dir, f"{_safe_name(context_id or NO_CONTEXT)}.{os.getpid()}.jsonl")
+
+    @contextmanager
+    def span(self, name: str,
+             agent: Optional[str] = None,
+             context_id: Optional[str] = None,
+             parent: Optional[SpanContext] = None,
+             **attrs: Any) -> Iterator[Optional[SpanContext]]:
+        """
+        블록 실행 시간을 span 하나로 기록합니다.
+
+        Args:
+            name: span 이름 (예: "execute VOTE_REQUEST")
+            agent: span을 실행한 에이전트, None이면 부모 span의 에이전트
+            context_id: 게임 context_id, None이면 부모 span의 값
+            parent: 다른 에이전트에서 받은 부모 span, None이면 현재 span
+            **attrs: trace viewer에 함께 표시할 값
+
+        Yields:
+            SpanContext | None: 새 span (비활성화 상태면 None)
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        parent = parent or current_span.get()
+        ctx = SpanContext(
+            trace_id=parent.trace_id if parent else _new_id(),
+            span_id=_new_id(),
+            agent=agent or (parent.agent if parent else ""),
+            context_id=context_id or (parent.context_id if parent else None),
+        )
+        token = current_span.set(ctx)
+        start_us = time.time_ns() // 1000
+        start = time.perf_counter_ns()
+        error = None
+        try:
+            yield ctx
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            current_span.reset(token)
+            self.write(ctx, {
+                "name": name,
+                "trace_id": ctx.trace_id,
+                "span_id": ctx.span_id,
+                "parent_id": parent.span_id if parent else None,
+                "agent": ctx.agent,
+                "context_id": ctx.context_id,
+                "ts": start_us,
+                "dur": (time.perf_counter_ns() - start) // 1000,
+                "pid": os.getpid(),
+                "attrs": attrs,
+                "error": error,
+            })
+
+    def write(self, ctx: SpanContext, record: dict):
+        try:
+            with open(self.path_for(ctx.context_id), "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        except OSError as e:
+            logger.warning(f"trace 기록 실패: {e}")
+
+
+TRACER = Tracer(os.getenv(TRACE_DIR_ENV))
+span = TRACER.span
+
+
+def inject(metadata: Optional[dict] = None) -> Optional[dict]:
+    """
+    현재 span을 A2A Message.metadata에 담습니다.
+
+    Returns:
+        dict | None: trace 문맥이 추가된 metadata (현재 span이 없으면 입력 그대로)
+    """
+    ctx = current_span.get()
+    if ctx is None:
+        return metadata
+    metadata = dict(metadata or {})
+    metadata[TRACE_METADATA_KEY] = {"trace_id": ctx.trace_id, "span_id": ctx.span_id}
+    return metadata
+
+
+def extract(metadata: Optional[dict]) -> Optional[SpanContext]:
+    """수신한 Message.metadata에서 보낸 쪽의 span을 읽습니다. 없거나 형식이 다르면 None."""
+    data = (metadata or {}).get(TRACE_METADATA_KEY)
+    if not isinstance(data, dict):
+        return None
+    trace_id, span_id = data.get("trace_id"), data.get("span_id")
+    if not isinstance(trace_id, str) or not isinstance(span_id, str):
+        return None
+    return SpanContext(trace_id=trace_id, span_id=span_id)
+
+
+def load_spans(trace_dir: str, context_id: str) -> list[dict]:
+    """한 게임에 대해 모든 프로세스가 기록한 span을 읽습니다."""
+    spans = []
+    for path in glob.glob(os.path.join(trace_dir, f"{_safe_name(context_id)}.*.jsonl")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    spans.append(json.loads(line))
+    spans.sort(key=lambda s: (s["ts"], -s["dur"]))
+    return spans
+
+
+def _assign_lanes(spans: list[dict]) -> list[int]:
+    """
+    에이전트 하나의 span들을 겹치지 않게 쌓을 수 있는 lane(스레드 행)에 배치합니다.
+    Chrome trace의 한 행에서는 span이 완전히 포함되거나 떨어져 있어야 하므로,
+    동시에 처리한 요청들은 서로 다른 행으로 나뉩니다.
+    """
+    lanes: list[list[int]] = []   # lane별 열린 span의 종료 시각 스택
+    result = []
+    for s in spans:
+        start, end = s["ts"], s["ts"] + s["dur"]
+        for i, stack in enumerate(lanes):
+            while stack and stack[-1] <= start:
+                stack.pop()
+            if not stack or end <= stack[-1]:
+                stack.append(end)
+                result.append(i)
+                break
+        else:
+            lanes.append([end])
+            result.append(len(lanes) - 1)
+    return result
+
+
+def to_chrome_trace(spans: list[dict]) -> dict:
+    """span 목록을 Chrome/Perfetto에서 열 수 있는 Trace Event 포맷으로 변환합니다. (에이전트 = 프로세스 행)"""
+    agents = sorted({s["agent"] or f"pid {s['pid']}" for s in spans})
+    pids = {agent: i + 1 for i, agent in enumerate(agents)}
+    events: list[dict] = [
+        {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": agent}}
+        for agent, pid in pids.items()
+    ]
+    for agent, pid in pids.items():
+        own = [s for s in spans if (s["agent"] or f"pid {s['pid']}") == agent]
+        for s, lane in zip(own, _assign_lanes(own)):
+            args = {"trace_id": s["trace_id"], "span_id": s["span_id"], "parent_id": s["parent_id"], **s["attrs"]}
+            if s["error"]:
+                args["error"] = s["error"]
+            events.append({
+                "name": s["name"], "ph": "X", "ts": s["ts"], "dur": s["dur"],
+                "pid": pid, "tid": lane, "args": args,
+            })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def merge_trace(trace_dir: str, context_id: str, output: Optional[str] = None) -> str:
+    """
+    한 게임의 span 파일들을 Chrome trace JSON 하나로 합칩니다.
+
+    Returns:
+        str: 만들어진 파일 경로 (기본값: {trace_dir}/{context_id}.trace.json)
+    """
+    output = output or os.path.join(trace_dir, f"{_safe_name(context_id)}.trace.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(to_chrome_trace(load_spans(trace_dir, context_id)), f, ensure_ascii=False)
+    return output
+
+
+def list_traced_games(trace_dir: str) -> list[str]:
+    names = {os.path.basename(path).rsplit(".", 2)[0] for path in glob.glob(os.path.join(trace_dir, "*.jsonl"))}
+    return sorted(names)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="게임별 span 파일을 Chrome/Perfetto trace로 합칩니다.")
+    parser.add_argument("--trace-dir", default=os.getenv(TRACE_DIR_ENV), help="span 파일 디렉터리")
+    parser.add_argument("--context-id", help="합칠 게임의 context_id, 생략하면 모든 게임")
+    parser.add_argument("-o", "--output", help="출력 파일 (--context-id와 함께 사용)")
+    args = parser.parse_args()
+    if not args.trace_dir:
+        parser.error(f"--trace-dir 또는 {TRACE_DIR_ENV}가 필요합니다.")
+
+    for context_id in [args.context_id] if args.context_id else list_traced_games(args.trace_dir):
+        print(f"🧵 {merge_trace(args.trace_dir, context_id, args.output if args.context_id else None)}")
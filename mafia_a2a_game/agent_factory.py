@@ -16,20 +16,40 @@ import os
 
 from a2a_core.config_loader import load_a2a_config
 from a2a_core.config_loader import get_server_list
+from a2a_core.config_loader import agent_url
 from a2a_core.a2a_client import A2AServerEntry
+from a2a_core.a2a_client import LoopbackHub
+from a2a_core.call_policy import CallPolicy
+from a2a_core.card_cache import AgentCardCache
+from a2a_core.circuit_breaker import CircuitBreakerConfig
+from a2a_core.http_pool import HttpPool
+from a2a_core.http_pool import HttpPoolConfig
+from a2a_core.metrics import metrics_routes
 from a2a_core.server_executor import GenericAgentExecutor
+from codec import codec_extension
 from manager_agent import ManagerAgent
 from member_agent import MemberAgent
+from night_phase import NightPolicy
 
 
-def get_agent(agent_card: AgentCard):
+def get_agent(agent_card: AgentCard, config: dict | None = None):
     """Get the agent, given an agent card."""
+    config = config or {}
     try:
         if agent_card.name == 'Manager Agent':
-            return ManagerAgent(agent_card.name, agent_card.description)
+            return ManagerAgent(agent_card.name, agent_card.description,
+                                discussion_max_wait=config.get("discussionMaxWait", 5),
+                                night_policy=NightPolicy.from_config(config),
+                                vote_deadline=config.get("voteDeadline", 10))
             
         else :
-            return MemberAgent(agent_card.name, agent_card.description) 
+            return MemberAgent(agent_card.name, agent_card.description,
+                               use_llm=config.get("useLlm", True),
+                               llm_concurrency=config.get("llmConcurrency", 4),
+                               llm_cache=config.get("llmCache", True),
+                               judge_batch_window=config.get("judgeBatchWindowMs", 50) / 1000,
+                               judge_batch_max=config.get("judgeBatchMaxSize", 16),
+                               llm_options=config.get("llm")) 
             
     except Exception as e:
         raise e
@@ -53,16 +73,18 @@ def build_server_from_config(config_file:str) :
     return server_config, app, handler
 
 
-def build_agent_from_config(config: dict, other_server_entries: list[A2AServerEntry]) -> tuple[str, A2AStarletteApplication]:
-    host = config["host"]
-    port = config["port"]
-    url = f"http://{host}:{port}/"
+def build_agent_card(config: dict) -> AgentCard:
+    """에이전트 설정(JSON)으로부터 AgentCard를 생성합니다."""
+    url = agent_url(config)
 
     skills = [
         AgentSkill(**skill) for skill in config.get("skills", [])
     ]
 
     capabilities = AgentCapabilities(**config.get("capabilities", {}))
+    # 압축 메시지 코덱 지원 여부를 카드로 알림 (피어는 확장이 없으면 JSON으로 보냄)
+    if config.get("wireCodec", True):
+        capabilities.extensions = [*(capabilities.extensions or []), codec_extension()]
 
     agent_card = AgentCard(
         name=config["name"],
@@ -74,7 +96,16 @@ def build_agent_from_config(config: dict, other_server_entries: list[A2AServerEn
         capabilities=capabilities,
         skills=skills,
     )
+    return agent_card
+
 
+def build_agent_from_config(config: dict, other_server_entries: list[A2AServerEntry],
+                            loopback: LoopbackHub | None = None,
+                            http_pool: HttpPool | None = None,
+                            discover_peers: bool = True) -> tuple[str, A2AStarletteApplication]:
+    host = config["host"]
+    port = config["port"]
+    agent_card = build_agent_card(config)
 
     # PushNotification 
     #httpx_client = httpx.AsyncClient()
@@ -82,8 +113,19 @@ def build_agent_from_config(config: dict, other_server_entries: list[A2AServerEn
     #push_sender = BasePushNotificationSender(httpx_client=httpx_client, 
     #                                        config_store=push_config_store)
 
-    executor  = GenericAgentExecutor(agent=get_agent(agent_card),
-                                    remote_agent_entries=other_server_entries)
+    executor  = GenericAgentExecutor(agent=get_agent(agent_card, config),
+                                    remote_agent_entries=other_server_entries,
+                                    loopback=loopback,
+                                    http_pool_config=HttpPoolConfig.from_config(config.get("httpClient")),
+                                    call_policy=CallPolicy.from_config(config.get("calls")),
+                                    breaker_config=CircuitBreakerConfig.from_config(config.get("circuitBreaker")),
+                                    http_pool=http_pool,
+                                    discover_peers=discover_peers,
+                                    card_cache=AgentCardCache() if loopback is None and config.get("cardCache", True) else None)
+
+    # loopback 모드: 같은 프로세스의 다른 에이전트가 HTTP 없이 호출할 수 있도록 등록
+    if loopback is not None:
+        loopback.register(agent_card, executor)
 
     #await executor.asyn_initialize()
 
@@ -100,4 +142,5 @@ def build_agent_from_config(config: dict, other_server_entries: list[A2AServerEn
     print(f"Starting {config["name"]} server on  http://{host}:{port}")
     
 
-    return app.build(), handler
+    # 프로세스별 Prometheus 지표 (GET /metrics)
+    return app.build(routes=metrics_routes()), handler
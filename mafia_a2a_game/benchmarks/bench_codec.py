@@ -0,0 +1,81 @@
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from codec import COMPACT_VERSION
+from codec import JSON_VERSION
+from messages import MessageType
+from messages import Role
+from messages import create_broadcast
+from messages import create_chat_message
+from messages import create_message
+from messages import parse_message
+
+
+def sample_messages(version: int) -> list[str]:
+    """게임 한 판에서 오가는 메시지 유형을 골고루 섞은 샘플."""
+    return [
+        create_message(MessageType.ROLE_ASSIGNMENT, "Manager Agent", "Alice Agent", role=Role.MAFIA, version=version),
+        create_message(MessageType.INTRO_REQUEST, "Manager Agent", "All", version=version),
+        create_chat_message(MessageType.INTRO_RESPONSE, "Alice Agent", "Bob Agent",
+                            text="안녕하세요, 저는 Alice Agent입니다. 모두와 협력해서 이기고 싶어요!", version=version),
+        create_chat_message(MessageType.QUESTION, "Bob Agent", "Alice Agent", version=version),
+        create_message(MessageType.VOTE_REQUEST, "Manager Agent", "All-Alive", version=version),
+        create_message(MessageType.EXECUTION_RESULT, "Manager Agent", "All-Alive", target="Bob Agent", version=version),
+        create_message(MessageType.NIGHT_ACTION_REQUEST, "Manager Agent", "Carol Agent", role=Role.DETECTIVE, version=version),
+        create_message(MessageType.NIGHT_ACTION_RESULT, "Manager Agent", "Carol Agent", target="Alice Agent",
+                       is_mafia=True, version=version),
+        create_message(MessageType.GAME_RESULT, "Manager Agent", "All-Alive", winner="CITIZENS", version=version),
+    ]
+
+
+def per_message_ns(fn, count: int, number: int) -> float:
+    """fn 한 번이 count건을 처리할 때, 메시지 한 건당 걸린 시간(ns)."""
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    return best / (number * count) * 1e9
+
+
+def bench(number: int, recipients: int) -> dict:
+    result = {}
+    for label, version in (("json", JSON_VERSION), ("compact", COMPACT_VERSION)):
+        encoded = sample_messages(version)
+        result[label] = {
+            "encode_ns": per_message_ns(lambda: sample_messages(version), len(encoded), number),
+            "decode_ns": per_message_ns(lambda: [parse_message(text) for text in encoded], len(encoded), number),
+            "avg_bytes": sum(len(text.encode("utf-8")) for text in encoded) / len(encoded),
+        }
+
+    names = [f"Agent {i}" for i in range(recipients)]
+    text = "안녕하세요, 저는 Alice Agent입니다. 모두와 협력해서 이기고 싶어요!"
+    result["broadcast"] = {
+        "recipients": recipients,
+        "json_per_recipient_ns": per_message_ns(
+            lambda: [create_chat_message(MessageType.INTRO_RESPONSE, "Alice Agent", name, text=text, version=JSON_VERSION)
+                     for name in names], recipients, number),
+        "compact_once_ns": per_message_ns(
+            lambda: [render(name) for render in [create_broadcast(MessageType.INTRO_RESPONSE, "Alice Agent", text=text)]
+                     for name in names], recipients, number),
+    }
+    return result
+
+
+def print_report(result: dict):
+    for label in ("json", "compact"):
+        row = result[label]
+        print(f"📦 {label:8s} encode {row['encode_ns']:8.0f} ns/msg | decode {row['decode_ns']:8.0f} ns/msg | "
+              f"{row['avg_bytes']:6.1f} bytes/msg")
+    b = result["broadcast"]
+    print(f"📢 broadcast x{b['recipients']}: json {b['json_per_recipient_ns']:.0f} ns/recipient | "
+          f"compact {b['compact_once_ns']:.0f} ns/recipient")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="게임 메시지 코덱(JSON/압축)의 인코딩/디코딩 비용을 측정합니다.")
+    parser.add_argument("--number", type=int, default=2000, help="측정 반복 횟수")
+    parser.add_argument("--recipients", type=int, default=16, help="브로드캐스트 수신자 수")
+    args = parser.parse_args()
+
+    print_report(bench(args.number, args.recipients))
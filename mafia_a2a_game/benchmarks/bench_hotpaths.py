@@ -0,0 +1,308 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import time
+import timeit
+
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from a2a.types import Part
+from a2a.types import TextPart
+
+from a2a_core.a2a_client import A2AClientAgent
+from a2a_core.a2a_client import LoopbackHub
+from bench_codec import sample_messages
+from codec import COMPACT_VERSION
+from codec import JSON_VERSION
+from manager_agent import AgentStatus
+from manager_agent import GameSession
+from manager_agent import ManagerAgent
+from member_agent import MemberAgent
+from messages import MessageType
+from messages import Role
+from messages import create_chat_message
+from messages import create_message
+from simulate import MANAGER_AGENT_NAME
+from simulate import build_simulated_table
+from simulate import make_roster
+
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+DEFAULT_THRESHOLD = 0.15
+
+# 케이스 함수: 반복 횟수 → 측정 구간 소요 시간(초). 준비 작업은 측정에서 제외
+CaseFn = Callable[[int], float]
+
+
+@dataclass
+class BenchCase:
+    name: str
+    fn: CaseFn
+    iterations: int
+
+
+@dataclass
+class BenchResult:
+    name: str
+    ns_per_op: float
+    iterations: int
+
+
+CASES: dict[str, BenchCase] = {}
+
+
+def case(name: str, iterations: int):
+    """벤치마크 케이스를 등록하는 데코레이터. iterations는 측정 한 번의 기본 반복 횟수."""
+    def decorator(fn: CaseFn) -> CaseFn:
+        CASES[name] = BenchCase(name, fn, iterations)
+        return fn
+    return decorator
+
+
+# ---- messages ----
+
+def _message_case(version: int) -> CaseFn:
+    count = len(sample_messages(version))
+    def run(number: int) -> float:
+        return timeit.timeit(lambda: sample_messages(version), number=max(1, number // count))
+    return run
+
+
+case("messages.create_message[compact]", 20_000)(_message_case(COMPACT_VERSION))
+case("messages.create_message[json]", 20_000)(_message_case(JSON_VERSION))
+
+
+@case("messages.create_chat_message[compact]", 20_000)
+def bench_create_chat_message(number: int) -> float:
+    text = "안녕하세요, 저는 Alice Agent입니다. 모두와 협력해서 이기고 싶어요!"
+    return timeit.timeit(
+        lambda: create_chat_message(MessageType.INTRO_RESPONSE, "Alice Agent", "Bob Agent", text=text),
+        number=number)
+
+
+# ---- member dispatch (use_llm=False) ----
+
+def _member_table(num_players: int = 6) -> tuple[ManagerAgent, MemberAgent, list[str]]:
+    manager = build_simulated_table(make_roster(num_players))
+    hub = manager.executor.client_agent.loopback
+    members = [executor.agent for executor in hub.executors.values() if isinstance(executor.agent, MemberAgent)]
+    member = members[0]
+    return manager, member, [m.name for m in members[1:]]
+
+
+def _dispatch_message(message_type: MessageType, member: MemberAgent, peers: list[str]) -> str:
+    manager = MANAGER_AGENT_NAME
+    peer = peers[0]
+    factories = {
+        MessageType.ROLE_ASSIGNMENT: lambda: create_message(message_type, manager, member.name, role=Role.VILLAGER),
+        MessageType.INTRO_REQUEST: lambda: create_message(message_type, manager, "All"),
+        MessageType.INTRO_RESPONSE: lambda: create_chat_message(message_type, peer, member.name, text="안녕하세요!"),
+        MessageType.DAY_ACTION_REQUEST: lambda: create_message(message_type, manager, "All-Alive"),
+        MessageType.VOTE_REQUEST: lambda: create_message(message_type, manager, "All-Alive"),
+        MessageType.VOTE_RESPONSE: lambda: create_message(message_type, peer, manager),
+        MessageType.EXECUTION_RESULT: lambda: create_message(message_type, manager, "All-Alive", target=peers[-1]),
+        MessageType.KILLED_RESULT: lambda: create_message(message_type, manager, "All-Alive", target=peers[-1]),
+        MessageType.NIGHT_ACTION_REQUEST: lambda: create_message(message_type, manager, member.name, role=Role.MAFIA),
+        MessageType.NIGHT_ACTION_RESULT: lambda: create_message(message_type, manager, member.name,
+                                                                target=peer, is_mafia=False),
+        MessageType.GAME_RESULT: lambda: create_message(message_type, manager, "All-Alive", winner="CITIZENS"),
+        MessageType.QUESTION: lambda: create_chat_message(message_type, peer, member.name),
+        MessageType.QUESTION_RESPONSE: lambda: create_chat_message(message_type, peer, member.name, text="시민이에요."),
+        MessageType.STATUS_REQUEST: lambda: create_message(message_type, manager, member.name),
+    }
+    return factories[message_type]()
+
+
+def _dispatch_case(message_type: MessageType) -> CaseFn:
+    def run(number: int) -> float:
+        async def main() -> float:
+            _, member, peers = _member_table()
+            context_id = f"bench-{message_type.name}"
+            text = _dispatch_message(message_type, member, peers)
+            role = _dispatch_message(MessageType.ROLE_ASSIGNMENT, member, peers)
+            await member.handle_message(role, context_id=context_id)
+            # DAY_ACTION_REQUEST는 의심 대상이 있어야 질문을 보냄
+            member.get_game(context_id).suspicion_scores[peers[0]] = 1
+
+            start = time.perf_counter()
+            for _ in range(number):
+                await member.handle_message(text, context_id=context_id)
+            return time.perf_counter() - start
+        return asyncio.run(main())
+    return run
+
+
+# 팬아웃이 있는 유형(INTRO_REQUEST, DAY_ACTION_REQUEST)은 loopback으로 피어 처리 시간까지 포함
+_FANOUT = {MessageType.INTRO_REQUEST: 200, MessageType.DAY_ACTION_REQUEST: 500}
+for _message_type in MessageType:
+    case(f"member.handle_message[{_message_type.name}]", _FANOUT.get(_message_type, 5_000))(
+        _dispatch_case(_message_type))
+
+
+# ---- manager ----
+
+def _manager() -> ManagerAgent:
+    return ManagerAgent("Manager Agent", "Manager")
+
+
+@case("manager.count_votes[1000]", 2_000)
+def bench_count_votes(number: int) -> float:
+    manager = _manager()
+    rng = random.Random(0)
+    names = [f"Player{i:04d} Agent" for i in range(1000)]
+    votes = {name: rng.choice(names[:50]) for name in names}
+    return timeit.timeit(lambda: manager.count_votes(votes), number=number)
+
+
+def _game_over_case(num_players: int) -> CaseFn:
+    def run(number: int) -> float:
+        manager = _manager()
+        roles = [Role.MAFIA] * (num_players // 4) + [Role.DETECTIVE] + [Role.VILLAGER] * num_players
+        session = GameSession(context_id="bench", agent_info={
+            f"Player{i:05d} Agent": AgentStatus(role=role) for i, role in enumerate(roles[:num_players])
+        })
+        return timeit.timeit(lambda: manager.is_game_over(session), number=number)
+    return run
+
+
+case("manager.is_game_over[1000]", 2_000)(_game_over_case(1_000))
+case("manager.is_game_over[10000]", 200)(_game_over_case(10_000))
+
+
+# ---- client ----
+
+@case("client.convert_parts[3]", 20_000)
+def bench_convert_parts(number: int) -> float:
+    async def main() -> float:
+        client = A2AClientAgent([], auto_init=False, loopback=LoopbackHub())
+        parts = [Part(root=TextPart(text=f"응답 {i}")) for i in range(3)]
+        start = time.perf_counter()
+        for _ in range(number):
+            await client.convert_parts(parts)
+        return time.perf_counter() - start
+    return asyncio.run(main())
+
+
+# ---- full game ----
+
+@case("game.full_round[7 players]", 20)
+def bench_full_game(number: int) -> float:
+    """loopback 테이블에서 게임 한 판(역할 배정~승패 결정) 전체."""
+    async def main() -> float:
+        manager = build_simulated_table(make_roster(7))
+        start = time.perf_counter()
+        for _ in range(number):
+            await manager.run_game_loop()
+        return time.perf_counter() - start
+    return asyncio.run(main())
+
+
+# ---- runner ----
+
+def run_case(bench: BenchCase, repeat: int, scale: float) -> BenchResult:
+    """repeat번 측정해 가장 빠른 값을 사용합니다. (다른 프로세스의 간섭을 덜 받음)"""
+    iterations = max(1, int(bench.iterations * scale))
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        bench.fn(max(1, iterations // 10))   # warm-up
+        best = min(bench.fn(iterations) for _ in range(repeat))
+    return BenchResult(bench.name, best / iterations * 1e9, iterations)
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "node": platform.node(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def default_baseline_path() -> str:
+    """baseline은 머신마다 다르므로 호스트 이름별로 저장합니다."""
+    return os.path.join(BASELINE_DIR, f"{platform.node() or 'local'}.json")
+
+
+def save_baseline(path: str, results: list[BenchResult]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(),
+                   "results": {r.name: asdict(r) for r in results}}, f, ensure_ascii=False, indent=2)
+
+
+def compare(results: list[BenchResult], baseline: dict, threshold: float) -> list[str]:
+    """
+    baseline과 비교해 결과를 출력하고, threshold보다 느려진 케이스 이름을 반환합니다.
+
+    Args:
+        results: 이번 측정 결과
+        baseline: save_baseline이 저장한 JSON
+        threshold: 허용하는 느려짐 비율 (0.15 = 15%)
+    """
+    previous = baseline.get("results", {})
+    regressions = []
+    for r in results:
+        old = previous.get(r.name)
+        if old is None:
+            print(f"🆕 {r.name:48s} {r.ns_per_op:14.0f} ns/op")
+            continue
+        delta = r.ns_per_op / old["ns_per_op"] - 1
+        mark = "🔺" if delta > threshold else ("🟢" if delta < -threshold else "  ")
+        if delta > threshold:
+            regressions.append(r.name)
+        print(f"{mark} {r.name:48s} {r.ns_per_op:14.0f} ns/op  (baseline {old['ns_per_op']:.0f}, {delta:+.1%})")
+    return regressions
+
+
+def main(args: argparse.Namespace) -> int:
+    selected = [bench for name, bench in CASES.items() if not args.filter or args.filter in name]
+    if not selected:
+        print(f"❌ '{args.filter}'에 해당하는 케이스가 없습니다.")
+        return 1
+
+    results = []
+    for bench in selected:
+        result = run_case(bench, args.repeat, args.scale)
+        results.append(result)
+        if not args.compare:
+            print(f"⏱️ {result.name:48s} {result.ns_per_op:14.0f} ns/op")
+
+    exit_code = 0
+    if args.compare:
+        path = default_baseline_path() if args.compare == "default" else args.compare
+        with open(path, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)}개 케이스가 {args.threshold:.0%} 이상 느려졌습니다: {', '.join(regressions)}")
+            exit_code = 1
+        else:
+            print(f"\n✅ {args.threshold:.0%} 이상 느려진 케이스가 없습니다.")
+
+    if args.save:
+        path = default_baseline_path() if args.save == "default" else args.save
+        save_baseline(path, results)
+        print(f"💾 baseline 저장: {path}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="게임 핫패스 마이크로벤치마크 (JSON baseline 저장/비교).")
+    parser.add_argument("--filter", help="이름에 이 문자열이 포함된 케이스만 실행")
+    parser.add_argument("--repeat", type=int, default=5, help="케이스별 측정 횟수 (최솟값 사용)")
+    parser.add_argument("--scale", type=float, default=1.0, help="반복 횟수 배율 (빠른 확인은 0.1)")
+    parser.add_argument("--save", nargs="?", const="default", help="결과를 baseline JSON으로 저장 (기본: baselines/<호스트>.json)")
+    parser.add_argument("--compare", nargs="?", const="default", help="baseline JSON과 비교, 느려진 케이스가 있으면 종료 코드 1")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀로 판단할 느려짐 비율")
+    args = parser.parse_args()
+
+    random.seed(0)
+    sys.exit(main(args))
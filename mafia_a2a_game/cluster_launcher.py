@@ -0,0 +1,339 @@
+import argparse
+import gc
+import importlib
+import os
+import signal
+import socket
+import sys
+import time
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+MANAGER_AGENT_NAME = "Manager Agent"
+
+# fork 전에 부모가 한 번만 import하는 모듈 (워커는 copy-on-write로 공유)
+PRELOAD_MODULES = [
+    "uvicorn",
+    "httpx",
+    "pydantic",
+    "a2a.server.apps",
+    "a2a.server.request_handlers",
+    "a2a.client",
+    "google.generativeai",
+    "agent_factory",
+    "manager_agent",
+    "member_agent",
+]
+
+
+@dataclass
+class Worker:
+    """에이전트 카드 하나를 실행하는 자식 프로세스."""
+    name: str
+    config: dict
+    cpu: Optional[int] = None
+    pid: int = 0
+    ready_fd: int = -1
+    forked_at: float = 0.0
+    startup: Optional[float] = None   # fork → 서버 listen까지 걸린 시간(초)
+    restarts: int = 0
+    exit_code: Optional[int] = None
+
+    @property
+    def port(self) -> int:
+        return self.config["port"]
+
+
+def preload(modules: list[str] = PRELOAD_MODULES) -> float:
+    """
+    무거운 모듈을 import하고 gc.freeze()로 현재 객체를 GC 대상에서 뺍니다.
+    (GC가 참조 카운트/헤더를 건드리면 공유 페이지가 복사되므로)
+
+    Returns:
+        float: 걸린 시간(초)
+    """
+    start = time.perf_counter()
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            print(f"⚠️ preload 생략: {name} ({e})")
+    gc.collect()
+    gc.freeze()
+    return time.perf_counter() - start
+
+
+def free_port(host: str, start: int) -> int:
+    """start부터 비어 있는 포트를 찾습니다."""
+    port = start
+    while True:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            try:
+                s.bind((host, port))
+                return port
+            except OSError:
+                port += 1
+
+
+def assign_ports(configs: list[dict], host: str, base_port: int) -> list[dict]:
+    """카드의 host/port를 base_port부터 비어 있는 포트로 다시 배정합니다."""
+    assigned = []
+    port = base_port
+    for config in configs:
+        port = free_port(host, port)
+        assigned.append({**config, "host": host, "port": port})
+        port += 1
+    return assigned
+
+
+def assign_cpus(count: int, pin: bool) -> list[Optional[int]]:
+    """워커 순서대로 사용할 수 있는 코어를 돌아가며 배정합니다. (지원하지 않는 OS이면 None)"""
+    if not pin or not hasattr(os, "sched_getaffinity"):
+        return [None] * count
+    cpus = sorted(os.sched_getaffinity(0))
+    return [cpus[i % len(cpus)] for i in range(count)]
+
+
+def process_memory(pid: int) -> tuple[Optional[float], Optional[float]]:
+    """
+    프로세스 메모리(MB)를 /proc에서 읽습니다.
+
+    Returns:
+        (RSS, PSS): PSS는 공유 페이지를 공유한 프로세스 수로 나눈 값 (copy-on-write 효과 확인용),
+        읽을 수 없으면 None
+    """
+    def read_kb(path: str, key: str) -> Optional[float]:
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith(key):
+                        return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+        return None
+
+    return read_kb(f"/proc/{pid}/status", "VmRSS:"), read_kb(f"/proc/{pid}/smaps_rollup", "Pss:")
+
+
+async def run_agent(config: dict, others: list, ready_fd: int):
+    """워커 프로세스 안에서 에이전트 서버 하나를 실행합니다. (main.py와 같은 흐름)"""
+    import asyncio
+    import uvicorn
+
+    from agent_factory import build_agent_from_config
+    from a2a_core.readiness import PeersNotReadyError
+    from a2a_core.readiness import wait_for_peers
+    from manager_agent import ManagerAgent
+    from member_agent import MemberAgent
+
+    app, handler = build_agent_from_config(config, others)
+    server = uvicorn.Server(uvicorn.Config(app=app, host=config["host"], port=config["port"], log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+
+    agent = handler.agent_executor.agent
+    if isinstance(agent, (ManagerAgent, MemberAgent)):
+        agent.set_server_shutdown_callback(lambda: setattr(server, "should_exit", True))
+
+    # listen을 시작하면 부모에게 알림 (startup 시간 측정)
+    while not server.started and not server_task.done():
+        await asyncio.sleep(0.005)
+    os.write(ready_fd, b"1")
+    os.close(ready_fd)
+
+    if config["name"] == MANAGER_AGENT_NAME and not server_task.done():
+        try:
+            await wait_for_peers(handler.agent_executor.client_agent, deadline=config.get("readinessTimeout", 30))
+        except PeersNotReadyError as e:
+            print(f"❌ 게임을 시작할 수 없습니다. 준비되지 않은 에이전트: {e.missing}")
+            server.should_exit = True
+            await server_task
+            sys.exit(1)
+        await agent.run_game_loop()
+
+    await server_task
+
+
+def worker_main(worker: Worker, others: list, ready_fd: int):
+    """fork된 자식 프로세스의 진입점. 돌아오지 않습니다."""
+    import asyncio
+
+    code = 0
+    try:
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        if worker.cpu is not None:
+            os.sched_setaffinity(0, {worker.cpu})
+        asyncio.run(run_agent(worker.config, others, ready_fd))
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+    except BaseException as e:
+        print(f"❌ {worker.name} 워커 종료: {e!r}")
+        code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+
+
+class ClusterLauncher:
+    """
+    모듈을 미리 import한 부모 프로세스에서 에이전트 카드마다 워커를 fork하고 감독합니다.
+
+    - 워커는 부모의 import 결과를 copy-on-write로 공유하므로 시작이 빠르고 메모리를 덜 씁니다.
+    - 비정상 종료한 워커는 max_restarts번까지 다시 fork합니다. (정상 종료 = 게임 종료)
+    - report_interval마다 워커별 RSS/PSS와 startup 시간을 출력합니다.
+    """
+
+    def __init__(self, configs: list[dict], pin: bool = True, max_restarts: int = 3, report_interval: float = 10.0):
+        from a2a_core.a2a_client import A2AServerEntry
+        from a2a_core.config_loader import agent_url
+
+        self.entries = [A2AServerEntry(name=config["name"], url=agent_url(config)) for config in configs]
+        self.workers = [
+            Worker(name=config["name"], config=config, cpu=cpu)
+            for config, cpu in zip(configs, assign_cpus(len(configs), pin))
+        ]
+        self.max_restarts = max_restarts
+        self.report_interval = report_interval
+        self.stopping = False
+
+    def spawn(self, worker: Worker):
+        read_fd, write_fd = os.pipe()
+        others = [entry for entry in self.entries if entry.name != worker.name]
+        sys.stdout.flush()
+        worker.forked_at = time.perf_counter()
+        worker.startup = None
+        worker.exit_code = None
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            worker_main(worker, others, write_fd)
+        os.close(write_fd)
+        os.set_blocking(read_fd, False)
+        worker.pid = pid
+        worker.ready_fd = read_fd
+        print(f"🚀 {worker.name}: pid {pid}, port {worker.port}, cpu {worker.cpu}")
+
+    def poll_ready(self):
+        for worker in self.workers:
+            if worker.ready_fd < 0:
+                continue
+            try:
+                data = os.read(worker.ready_fd, 1)
+            except BlockingIOError:
+                continue
+            if data:
+                worker.startup = time.perf_counter() - worker.forked_at
+            os.close(worker.ready_fd)
+            worker.ready_fd = -1
+
+    def reap(self):
+        """종료된 워커를 확인하고, 비정상 종료면 다시 시작합니다."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            worker = next((w for w in self.workers if w.pid == pid), None)
+            if worker is None:
+                continue
+            worker.exit_code = os.waitstatus_to_exitcode(status)
+            worker.pid = 0
+            if worker.exit_code == 0 or self.stopping:
+                print(f"✅ {worker.name} 종료 (exit {worker.exit_code})")
+            elif worker.restarts < self.max_restarts:
+                worker.restarts += 1
+                print(f"🔁 {worker.name} 비정상 종료 (exit {worker.exit_code}), 재시작 {worker.restarts}/{self.max_restarts}")
+                self.spawn(worker)
+            else:
+                print(f"❌ {worker.name} 재시작 한도 초과 (exit {worker.exit_code})")
+
+    def report(self):
+        rss, pss = process_memory(os.getpid())
+        print(f"\n📊 {'name':<20} {'pid':>7} {'cpu':>4} {'port':>6} {'startup':>8} {'RSS MB':>8} {'PSS MB':>8} {'restarts':>8}")
+        print(f"   {'(launcher)':<20} {os.getpid():>7} {'':>4} {'':>6} {'':>8} {rss or 0:>8.1f} {pss or 0:>8.1f} {'':>8}")
+        total_rss = total_pss = 0.0
+        for worker in self.workers:
+            rss, pss = process_memory(worker.pid) if worker.pid else (None, None)
+            total_rss += rss or 0
+            total_pss += pss or 0
+            startup = f"{worker.startup:.3f}s" if worker.startup is not None else "-"
+            print(f"   {worker.name:<20} {worker.pid or '-':>7} {'' if worker.cpu is None else worker.cpu:>4} "
+                  f"{worker.port:>6} {startup:>8} {rss or 0:>8.1f} {pss or 0:>8.1f} {worker.restarts:>8}")
+        print(f"   {'total (workers)':<20} {'':>7} {'':>4} {'':>6} {'':>8} {total_rss:>8.1f} {total_pss:>8.1f}\n")
+
+    def stop(self, *_):
+        self.stopping = True
+        for worker in self.workers:
+            if worker.pid:
+                os.kill(worker.pid, signal.SIGTERM)
+
+    def run(self) -> int:
+        """모든 워커가 끝날 때까지 감독합니다. 재시작 한도를 넘긴 워커가 있으면 1을 반환합니다."""
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        # 멤버를 먼저 띄우고 Manager는 마지막에 (Manager는 readiness barrier로 멤버를 기다림)
+        for worker in sorted(self.workers, key=lambda w: w.name == MANAGER_AGENT_NAME):
+            self.spawn(worker)
+
+        reported_ready = False
+        next_report = time.perf_counter() + self.report_interval
+        while any(worker.pid for worker in self.workers):
+            time.sleep(0.05)
+            self.poll_ready()
+            self.reap()
+            if not reported_ready and all(worker.startup is not None for worker in self.workers):
+                reported_ready = True
+                print(f"✅ 워커 {len(self.workers)}개 준비 완료 "
+                      f"(가장 늦은 워커: {max(worker.startup for worker in self.workers):.3f}s)")
+                self.report()
+            if self.report_interval > 0 and time.perf_counter() >= next_report:
+                next_report += self.report_interval
+                self.report()
+
+        failed = [worker.name for worker in self.workers if worker.exit_code not in (0, None) and not self.stopping]
+        return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="모듈을 한 번만 import한 뒤 에이전트 카드마다 워커를 fork해 게임 클러스터를 실행합니다.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("config_dir", nargs="?", help="에이전트 카드 디렉터리")
+    source.add_argument("--roster", type=int, metavar="N", help="카드 대신 Manager + 멤버 N명을 생성")
+    parser.add_argument("--host", default="127.0.0.1", help="자동 배정 포트의 주소")
+    parser.add_argument("--base-port", type=int, help="카드의 포트 대신 이 포트부터 비어 있는 포트를 자동 배정")
+    parser.add_argument("--fake-llm", metavar="LATENCY", help="--roster 멤버가 fake LLM을 사용 (예: lognormal:800,0.6)")
+    parser.add_argument("--no-pin", action="store_true", help="워커를 코어에 고정하지 않음")
+    parser.add_argument("--max-restarts", type=int, default=3, help="워커별 최대 재시작 횟수")
+    parser.add_argument("--report-interval", type=float, default=10.0, help="RSS 보고 간격(초), 0이면 준비 완료 시에만")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        parser.error("os.fork를 지원하지 않는 플랫폼입니다. host_main.py를 사용하세요.")
+
+    elapsed = preload()
+    print(f"📦 preload {elapsed:.2f}s (gc.freeze: {gc.get_freeze_count()} objects)")
+
+    from host_main import load_cards
+    from host_main import make_host_roster
+    if args.roster:
+        configs = make_host_roster(args.roster, args.host, args.base_port or 21000,
+                                   llm={"backend": "fake", "latency": args.fake_llm} if args.fake_llm else None)
+    else:
+        configs = load_cards(args.config_dir)
+    if args.base_port is not None:
+        configs = assign_ports(configs, args.host, args.base_port)
+
+    launcher = ClusterLauncher(configs, pin=not args.no_pin, max_restarts=args.max_restarts,
+                               report_interval=args.report_interval)
+    sys.exit(launcher.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+
+from a2a.types import AgentCard
+from a2a.types import AgentExtension
+
+
+# 에이전트 카드의 capabilities.extensions 로 지원하는 코덱 버전을 알립니다.
+CODEC_EXTENSION_URI = "urn:mafia:codec"
+
+# 1: 기존 JSON 메시지 ({"type": ..., "payload": {...}})
+# 2: 압축 포맷 "~2|<type tag>|<from>|<to>|<arg>|..."
+JSON_VERSION = 1
+COMPACT_VERSION = 2
+SUPPORTED_VERSIONS = (JSON_VERSION, COMPACT_VERSION)
+
+FRAME_PREFIX = "~"
+SEPARATOR = "|"
+_COMPACT_HEAD = f"{FRAME_PREFIX}{COMPACT_VERSION}{SEPARATOR}"
+
+
+class CodecError(ValueError):
+    """압축 포맷으로 표현할 수 없거나 해석할 수 없는 메시지."""
+
+
+def codec_extension() -> AgentExtension:
+    """이 에이전트가 지원하는 코덱 버전을 알리는 AgentCard 확장."""
+    return AgentExtension(
+        uri=CODEC_EXTENSION_URI,
+        description="Mafia game wire codec versions",
+        params={"versions": list(SUPPORTED_VERSIONS)},
+    )
+
+
+def negotiate_version(card: Optional[AgentCard]) -> int:
+    """
+    피어 카드에 광고된 버전 중 양쪽이 모두 지원하는 가장 높은 버전을 고릅니다.
+    확장이 없는 (이전 버전) 피어는 JSON으로 통신합니다.
+    """
+    if card is None or card.capabilities is None:
+        return JSON_VERSION
+    for extension in card.capabilities.extensions or []:
+        if extension.uri != CODEC_EXTENSION_URI:
+            continue
+        versions = (extension.params or {}).get("versions", [])
+        common = [v for v in versions if v in SUPPORTED_VERSIONS]
+        return max(common, default=JSON_VERSION)
+    return JSON_VERSION
+
+
+def is_compact(text: str) -> bool:
+    return text.startswith(_COMPACT_HEAD)
+
+
+def frame_tag(text: str) -> int:
+    """
+    압축 포맷 메시지의 type tag만 읽습니다. (나머지 필드는 나누지 않음)
+
+    Raises:
+        ValueError: 압축 포맷이 아니거나 tag가 숫자가 아닌 경우
+    """
+    if not is_compact(text):
+        raise CodecError("압축 포맷 메시지가 아닙니다.")
+    start = len(_COMPACT_HEAD)
+    return int(text[start:text.index(SEPARATOR, start)])
+
+
+def _check_field(value: str):
+    if SEPARATOR in value:
+        raise CodecError(f"구분자 '{SEPARATOR}'가 포함된 필드는 압축 포맷으로 보낼 수 없습니다: {value!r}")
+
+
+def encode_frame(tag: int, from_name: str, to_name: str, args: Sequence[str] = ()) -> str:
+    """
+    압축 포맷 한 건을 만듭니다. 마지막 인자(자유 텍스트)만 구분자를 포함할 수 있습니다.
+
+    Raises:
+        CodecError: 이름이나 마지막이 아닌 인자에 구분자가 포함된 경우 (호출 측에서 JSON으로 대체)
+    """
+    head, tail = encode_broadcast_frame(tag, from_name, args)
+    _check_field(to_name)
+    return head + to_name + tail
+
+
+def encode_broadcast_frame(tag: int, from_name: str, args: Sequence[str] = ()) -> tuple[str, str]:
+    """
+    수신자만 다른 메시지를 위해 수신자 앞/뒤 부분을 한 번만 인코딩합니다.
+
+    Returns:
+        tuple[str, str]: (수신자 앞부분, 수신자 뒷부분) — head + 수신자 + tail 이 한 건의 메시지
+    """
+    _check_field(from_name)
+    for arg in args[:-1]:
+        _check_field(arg)
+    head = f"{_COMPACT_HEAD}{tag}{SEPARATOR}{from_name}{SEPARATOR}"
+    tail = "".join(SEPARATOR + arg for arg in args)
+    return head, tail
+
+
+def decode_frame(text: str, arg_counts: Mapping[int, int]) -> tuple[int, str, str, list[str]]:
+    """
+    압축 포맷 한 건을 (type tag, from, to, 인자 목록)으로 나눕니다.
+
+    Args:
+        text: 압축 포맷 메시지
+        arg_counts: type tag → 인자 개수 (마지막 인자는 구분자를 포함할 수 있음)
+
+    Raises:
+        CodecError: 압축 포맷이 아니거나 지원하지 않는 버전인 경우
+    """
+    if not text.startswith(FRAME_PREFIX):
+        raise CodecError("압축 포맷 메시지가 아닙니다.")
+    parts = text.split(SEPARATOR, 4)
+    if len(parts) < 4:
+        raise CodecError(f"필드가 부족한 메시지입니다: {text[:40]!r}")
+    version = parts[0][len(FRAME_PREFIX):]
+    if version != str(COMPACT_VERSION):
+        raise CodecError(f"지원하지 않는 코덱 버전입니다: {version}")
+    try:
+        tag = int(parts[1])
+    except ValueError:
+        raise CodecError(f"잘못된 type tag 입니다: {parts[1]!r}") from None
+
+    if tag not in arg_counts:
+        raise CodecError(f"알 수 없는 type tag 입니다: {tag}")
+
+    arg_count = arg_counts[tag]
+    if arg_count == 0 or len(parts) == 4:
+        args: list[str] = []
+    else:
+        args = parts[4].split(SEPARATOR, arg_count - 1)
+    return tag, parts[2], parts[3], args
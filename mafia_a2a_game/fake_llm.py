@@ -0,0 +1,405 @@
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import re
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import AsyncIterator
+from typing import Optional
+
+import httpx
+import uvicorn
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+
+from a2a_core.metrics import RETRIES_TOTAL
+from llm_cache import SharedResponseCache
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 18080
+# 스트리밍 응답에서 전체 지연 중 첫 조각까지 걸리는 비율
+FIRST_CHUNK_FRACTION = 0.3
+
+
+@dataclass
+class LatencyProfile:
+    """
+    호출 한 번의 응답 지연 분포.
+
+    - fixed: 항상 fixed_ms
+    - lognormal: 중앙값 median_ms, 로그 표준편차 sigma (sigma가 클수록 꼬리가 길어짐)
+    - histogram: [(버킷 상한 ms, 관측 수), ...] 에서 버킷을 관측 수 비율로 고르고 버킷 안에서 균등 분포
+      (mafia_llm_seconds 같은 실제 측정값을 그대로 재현할 때 사용)
+    """
+    kind: str = "fixed"
+    fixed_ms: float = 0.0
+    median_ms: float = 500.0
+    sigma: float = 0.5
+    buckets: list[tuple[float, float]] = field(default_factory=list)
+
+    def __post_init__(self):
+        if self.kind not in ("fixed", "lognormal", "histogram"):
+            raise ValueError(f"지원하지 않는 지연 프로필입니다: {self.kind}")
+        if self.kind == "histogram":
+            if not self.buckets:
+                raise ValueError("histogram 프로필에는 buckets가 필요합니다.")
+            self.buckets = sorted((float(le), float(count)) for le, count in self.buckets)
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyProfile":
+        """
+        'fixed:200', 'lognormal:800,0.6', 'histogram:latency.json' 형식의 문자열을 해석합니다.
+        histogram 파일은 [[상한 ms, 관측 수], ...] 또는 {"buckets": [...]} 형식의 JSON입니다.
+        """
+        kind, _, args = spec.partition(":")
+        if kind == "fixed":
+            return cls("fixed", fixed_ms=float(args or 0))
+        if kind == "lognormal":
+            median, _, sigma = args.partition(",")
+            return cls("lognormal", median_ms=float(median), sigma=float(sigma or 0.5))
+        if kind == "histogram":
+            with open(args, encoding="utf-8") as f:
+                data = json.load(f)
+            return cls("histogram", buckets=data["buckets"] if isinstance(data, dict) else data)
+        raise ValueError(f"지원하지 않는 지연 프로필입니다: {spec}")
+
+    @classmethod
+    def from_config(cls, value: "str | dict | None") -> "LatencyProfile":
+        """에이전트 설정의 "latency" 값 (문자열 spec 또는 필드 dict)."""
+        if value is None:
+            return cls()
+        if isinstance(value, str):
+            return cls.parse(value)
+        return cls(**value)
+
+    def sample(self, rng: random.Random) -> float:
+        """지연 시간(초)을 하나 뽑습니다."""
+        if self.kind == "fixed":
+            ms = self.fixed_ms
+        elif self.kind == "lognormal":
+            ms = rng.lognormvariate(math.log(self.median_ms), self.sigma)
+        else:
+            total = sum(count for _, count in self.buckets)
+            pick = rng.uniform(0, total)
+            lower = 0.0
+            ms = self.buckets[-1][0]
+            for le, count in self.buckets:
+                if pick <= count:
+                    ms = rng.uniform(lower, le)
+                    break
+                pick -= count
+                lower = le
+        return max(0.0, ms) / 1000
+
+
+class RateLimitError(Exception):
+    """가짜 모델이 429를 반환했고 재시도도 모두 실패한 경우."""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"429 RESOURCE_EXHAUSTED (retry after {retry_after:.2f}s)")
+
+
+@dataclass
+class FakeReply:
+    delay: float
+    text: str = ""
+    rate_limited: bool = False
+    retry_after: float = 0.0
+
+
+# member_agent의 gemini_* 프롬프트가 기대하는 응답 형태
+_INTROS = [
+    "안녕하세요, 저는 {name}입니다. 다들 잘 부탁드려요.",
+    "반갑습니다. {name}이에요. 이번 판은 꼭 이기고 싶네요.",
+    "{name}입니다. 조용히 지켜보다가 필요할 때 말할게요.",
+]
+_ANSWERS = [
+    "저는 그냥 평범한 시민이에요.",
+    "의심받을 이유가 없다고 생각합니다. 제 발언을 다시 봐주세요.",
+    "그냥 제 생각일 뿐이에요. 오해하지 마세요.",
+]
+_NAME_PATTERN = re.compile(r"당신의 이름은 (.+?)입니다")
+_BATCH_ITEM_PATTERN = re.compile(r"^\s*\[(\d+)\]", re.MULTILINE)
+
+
+class FakeModel:
+    """
+    프롬프트 모양을 보고 규칙 기반 응답을 만들고, 지연 시간과 429 여부를 정합니다.
+    (판단 프롬프트는 yes/no, true/false, JSON 판정, 나머지는 자유 텍스트)
+    """
+
+    def __init__(self, latency: Optional[LatencyProfile] = None, rate_limit: float = 0.0,
+                 suspicion_rate: float = 0.2, retry_after: float = 0.2, seed: Optional[int] = None):
+        """
+        Args:
+            latency: 응답 지연 분포, None이면 지연 없음
+            rate_limit: 호출이 429로 거부될 확률 (0~1)
+            suspicion_rate: 판단 프롬프트에 '의심스럽다'고 답할 확률
+            retry_after: 429 응답의 Retry-After(초)
+            seed: 난수 시드
+        """
+        self.latency = latency or LatencyProfile()
+        self.rate_limit = rate_limit
+        self.suspicion_rate = suspicion_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.rate_limited = 0
+
+    def reply(self, prompt: str) -> FakeReply:
+        self.calls += 1
+        if self.rng.random() < self.rate_limit:
+            self.rate_limited += 1
+            # 429는 짧게 실패 (실제 API처럼 대기 없이 거부)
+            return FakeReply(delay=0.0, rate_limited=True, retry_after=self.retry_after)
+        return FakeReply(delay=self.latency.sample(self.rng), text=self.answer(prompt))
+
+    def answer(self, prompt: str) -> str:
+        suspicious = self.rng.random() < self.suspicion_rate
+        if "JSON 객체로만" in prompt:
+            indexes = _BATCH_ITEM_PATTERN.findall(prompt)
+            return json.dumps({i: self.rng.random() < self.suspicion_rate for i in indexes})
+        if "yes 또는 no" in prompt:
+            return "yes" if suspicious else "no"
+        if "true를 반환" in prompt:
+            return "true" if suspicious else "false"
+        if '"YES"' in prompt:
+            return "YES" if suspicious else "NO"
+        if "자기소개" in prompt:
+            match = _NAME_PATTERN.search(prompt)
+            return self.rng.choice(_INTROS).format(name=match.group(1) if match else "참가자")
+        return self.rng.choice(_ANSWERS)
+
+
+def split_chunks(text: str, size: int = 8) -> list[str]:
+    """스트리밍 흉내를 위해 텍스트를 단어 size개 단위로 나눕니다."""
+    words = text.split(" ")
+    return [" ".join(words[i:i + size]) + (" " if i + size < len(words) else "")
+            for i in range(0, len(words), size)] or [""]
+
+
+async def stream_reply(reply: FakeReply) -> AsyncIterator[str]:
+    """전체 지연의 일부가 지난 뒤 첫 조각을 보내고, 나머지 조각은 남은 시간에 나눠 보냅니다."""
+    chunks = split_chunks(reply.text)
+    await asyncio.sleep(reply.delay * FIRST_CHUNK_FRACTION)
+    gap = reply.delay * (1 - FIRST_CHUNK_FRACTION) / max(1, len(chunks) - 1)
+    for i, chunk in enumerate(chunks):
+        if i:
+            await asyncio.sleep(gap)
+        yield chunk
+
+
+# ---- 서버 (Gemini REST API와 같은 경로/응답 모양) ----
+
+def _candidate(text: str) -> dict:
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+
+
+def _rate_limited(reply: FakeReply) -> JSONResponse:
+    return JSONResponse(
+        {"error": {"code": 429, "message": "Resource has been exhausted (fake)", "status": "RESOURCE_EXHAUSTED"}},
+        status_code=429,
+        headers={"Retry-After": f"{reply.retry_after:.3f}"},
+    )
+
+
+def build_fake_llm_app(model: FakeModel) -> Starlette:
+    """
+    POST /v1beta/models/{model}:generateContent 와 :streamGenerateContent(SSE)를 흉내 내는 앱.
+    """
+    async def handle(request: Request):
+        target = request.path_params["target"]
+        _, _, method = target.partition(":")
+        body = await request.json()
+        prompt = "".join(part.get("text", "") for content in body.get("contents", [])
+                         for part in content.get("parts", []))
+
+        reply = model.reply(prompt)
+        if reply.rate_limited:
+            return _rate_limited(reply)
+
+        if method == "streamGenerateContent":
+            async def events():
+                async for chunk in stream_reply(reply):
+                    yield f"data: {json.dumps(_candidate(chunk), ensure_ascii=False)}\n\n"
+            return StreamingResponse(events(), media_type="text/event-stream")
+        if method == "generateContent":
+            await asyncio.sleep(reply.delay)
+            return JSONResponse(_candidate(reply.text))
+        return JSONResponse({"error": {"code": 404, "message": f"unknown method: {method}"}}, status_code=404)
+
+    async def stats(request: Request):
+        return JSONResponse({"calls": model.calls, "rate_limited": model.rate_limited})
+
+    return Starlette(routes=[
+        Route("/v1beta/models/{target}", handle, methods=["POST"]),
+        Route("/stats", stats, methods=["GET"]),
+    ])
+
+
+# ---- 클라이언트 (GeminiExecutor와 같은 인터페이스) ----
+
+class FakeLLMExecutor:
+    """
+    MemberAgent가 GeminiExecutor 대신 사용하는 가짜 모델 클라이언트.
+
+    url이 있으면 fake_llm 서버에 HTTP로 요청하고, 없으면 같은 프로세스의 FakeModel로
+    지연만 흉내 냅니다 (simulate.py 부하 테스트용). 429는 지수 backoff(jitter 포함)로 재시도합니다.
+    """
+
+    def __init__(self, model_name: str, max_concurrency: int = 4, url: Optional[str] = None,
+                 model: Optional[FakeModel] = None, cache: Optional[SharedResponseCache] = None,
+                 max_retries: int = 3, initial_backoff: float = 0.1, max_backoff: float = 2.0):
+        """
+        Args:
+            model_name: 요청 경로에 넣을 모델 이름
+            max_concurrency: 동시에 실행할 수 있는 최대 호출 수
+            url: fake_llm 서버 주소 (예: http://localhost:18080), None이면 in-process
+            model: in-process 모드에서 사용할 FakeModel, None이면 지연 없는 기본값
+            cache: 프로세스 간 공유 응답 캐시
+            max_retries: 429 재시도 횟수
+            initial_backoff: 첫 재시도 대기(초), Retry-After가 더 길면 그 값을 따름
+            max_backoff: 재시도 대기 상한(초)
+        """
+        self.model_name = model_name
+        self.cache = cache
+        self.url = url.rstrip("/") if url else None
+        self.model = model or FakeModel()
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._client = httpx.AsyncClient(timeout=httpx.Timeout(60.0)) if self.url else None
+
+    @classmethod
+    def from_config(cls, model_name: str, config: dict, max_concurrency: int = 4,
+                    cache: Optional[SharedResponseCache] = None) -> "FakeLLMExecutor":
+        """
+        에이전트 설정의 "llm" 항목으로 만듭니다.
+        예: {"backend": "fake", "url": "http://localhost:18080"}
+            {"backend": "fake", "latency": "lognormal:800,0.6", "rateLimit": 0.05}
+        """
+        model = FakeModel(
+            latency=LatencyProfile.from_config(config.get("latency")),
+            rate_limit=config.get("rateLimit", 0.0),
+            suspicion_rate=config.get("suspicionRate", 0.2),
+            seed=config.get("seed"),
+        )
+        return cls(model_name, max_concurrency=max_concurrency, url=config.get("url"), model=model,
+                   cache=cache, max_retries=config.get("maxRetries", 3))
+
+    def backoff(self, attempt: int, retry_after: float) -> float:
+        delay = min(self.max_backoff, self.initial_backoff * (2 ** attempt))
+        return max(retry_after, delay * random.uniform(0.5, 1.0))
+
+    async def generate(self, prompt: str, model_name: Optional[str] = None,
+                       cache_version: Optional[str] = None) -> str:
+        name = model_name or self.model_name
+        if self.cache and cache_version:
+            return await self.cache.get_or_compute(name, cache_version, prompt,
+                                                   lambda: self._generate(prompt, name))
+        return await self._generate(prompt, name)
+
+    async def _generate(self, prompt: str, model_name: str) -> str:
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    return await self._call(prompt, model_name)
+            except RateLimitError as e:
+                if attempt == self.max_retries:
+                    raise
+                RETRIES_TOTAL.inc(("llm_rate_limit",))
+                await asyncio.sleep(self.backoff(attempt, e.retry_after))
+
+    async def _call(self, prompt: str, model_name: str) -> str:
+        if self._client is None:
+            reply = self.model.reply(prompt)
+            if reply.rate_limited:
+                raise RateLimitError(reply.retry_after)
+            await asyncio.sleep(reply.delay)
+            return reply.text
+
+        response = await self._client.post(f"{self.url}/v1beta/models/{model_name}:generateContent",
+                                           json={"contents": [{"parts": [{"text": prompt}]}]})
+        self._raise_for_status(response)
+        return "".join(part["text"] for part in response.json()["candidates"][0]["content"]["parts"])
+
+    async def stream(self, prompt: str, model_name: Optional[str] = None) -> AsyncIterator[str]:
+        """응답을 조각 단위로 돌려줍니다. 429는 첫 조각을 받기 전에만 재시도합니다."""
+        name = model_name or self.model_name
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    async for chunk in self._stream_call(prompt, name):
+                        yield chunk
+                return
+            except RateLimitError as e:
+                if attempt == self.max_retries:
+                    raise
+                RETRIES_TOTAL.inc(("llm_rate_limit",))
+                await asyncio.sleep(self.backoff(attempt, e.retry_after))
+
+    async def _stream_call(self, prompt: str, model_name: str) -> AsyncIterator[str]:
+        if self._client is None:
+            reply = self.model.reply(prompt)
+            if reply.rate_limited:
+                raise RateLimitError(reply.retry_after)
+            async for chunk in stream_reply(reply):
+                yield chunk
+            return
+
+        async with self._client.stream(
+            "POST", f"{self.url}/v1beta/models/{model_name}:streamGenerateContent?alt=sse",
+            json={"contents": [{"parts": [{"text": prompt}]}]},
+        ) as response:
+            if response.status_code == 429:
+                await response.aread()
+            self._raise_for_status(response)
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    data = json.loads(line[len("data: "):])
+                    yield "".join(part["text"] for part in data["candidates"][0]["content"]["parts"])
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response):
+        if response.status_code == 429:
+            raise RateLimitError(float(response.headers.get("Retry-After", 0)))
+        response.raise_for_status()
+
+    def shutdown(self):
+        if self._client is not None:
+            try:
+                asyncio.get_running_loop().create_task(self._client.aclose())
+            except RuntimeError:
+                pass
+        if self.cache:
+            self.cache.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="부하 테스트용 가짜 Gemini 서버를 실행합니다.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", default="fixed:0",
+                        help="지연 프로필: fixed:<ms> | lognormal:<중앙값 ms>,<sigma> | histogram:<JSON 파일>")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="429로 거부할 호출 비율 (0~1)")
+    parser.add_argument("--retry-after", type=float, default=0.2, help="429 응답의 Retry-After(초)")
+    parser.add_argument("--suspicion-rate", type=float, default=0.2, help="판단 프롬프트에 '의심'으로 답할 비율")
+    parser.add_argument("--seed", type=int, default=None, help="난수 시드")
+    args = parser.parse_args()
+
+    model = FakeModel(LatencyProfile.parse(args.latency), rate_limit=args.rate_limit,
+                      suspicion_rate=args.suspicion_rate, retry_after=args.retry_after, seed=args.seed)
+    print(f"🤖 가짜 Gemini 서버 http://{args.host}:{args.port} (latency={args.latency}, 429={args.rate_limit:.0%})")
+    uvicorn.run(build_fake_llm_app(model), host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+
+from dataclasses import dataclass
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JudgmentRequest:
+    """의심 판단 요청 한 건."""
+    kind: str      # "message" (자기소개 등 발언) | "answer" (질문에 대한 답변)
+    sender: str
+    text: str
+
+
+JudgeBatchFn = Callable[[list[JudgmentRequest]], Awaitable[list[bool]]]
+
+
+class JudgmentBatcher:
+    """
+    짧은 시간 창 동안 들어온 의심 판단 요청을 모아 한 번에 처리하는 micro-batcher.
+
+    자기소개가 몰리는 순간에는 N-1개의 메시지가 거의 동시에 도착합니다.
+    요청마다 LLM을 호출하는 대신 window 동안(또는 max_batch개가 찰 때까지) 모은 뒤
+    judge_batch를 한 번 호출하고, 각 호출자의 future를 해당 판정 결과로 완료합니다.
+    """
+
+    def __init__(self, judge_batch: JudgeBatchFn, window: float = 0.05, max_batch: int = 16):
+        """
+        Args:
+            judge_batch: 요청 목록을 받아 같은 순서의 판정(True = 의심) 목록을 반환하는 함수
+            window: 첫 요청 이후 배치를 모으는 시간(초)
+            max_batch: 한 배치의 최대 요청 수, 차면 즉시 처리
+        """
+        self.judge_batch = judge_batch
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self._pending: list[tuple[JudgmentRequest, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, request: JudgmentRequest) -> bool:
+        """요청을 현재 배치에 추가하고 판정 결과를 기다립니다."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((request, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[JudgmentRequest, asyncio.Future]]):
+        requests = [request for request, _ in batch]
+        try:
+            verdicts = await self.judge_batch(requests)
+            if len(verdicts) != len(batch):
+                raise ValueError(f"판정 개수 불일치: 요청 {len(batch)}개, 결과 {len(verdicts)}개")
+        except Exception as e:
+            logger.error(f"배치 판단 실패: {e}", exc_info=True)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), verdict in zip(batch, verdicts):
+            if not future.done():
+                future.set_result(verdict)
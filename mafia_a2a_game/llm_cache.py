@@ -0,0 +1,210 @@
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+from a2a_core.metrics import LLM_CACHE_TOTAL
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(tempfile.gettempdir(), "mafia_llm_cache.sqlite3")
+
+# _claim() 결과
+_HIT = "hit"
+_OWNER = "owner"
+_WAIT = "wait"
+
+
+class SharedResponseCache:
+    """
+    같은 호스트의 모든 에이전트 프로세스가 공유하는 LLM 응답 캐시.
+
+    SQLite(WAL 모드) 파일 하나를 여러 프로세스가 함께 사용합니다.
+    키는 (모델 이름, 프롬프트 템플릿 버전, 프롬프트)의 해시이며,
+    같은 프롬프트가 동시에 들어오면 한 호출만 LLM을 실행하고 나머지는
+    그 결과를 기다립니다 (single-flight).
+      - 프로세스 내부: 진행 중인 asyncio.Future를 공유
+      - 프로세스 간: 'pending' 행을 lease로 잡고, 다른 프로세스는 결과를 polling
+    """
+
+    def __init__(self,
+        path: Optional[str] = None,
+        ttl_seconds: float = 3600,
+        max_entries: int = 10_000,
+        lease_seconds: float = 60,
+        poll_interval: float = 0.05,
+    ):
+        """
+        Args:
+            path: SQLite 파일 경로, None이면 MAFIA_LLM_CACHE_PATH 또는 임시 디렉터리
+            ttl_seconds: 응답 유효 시간(초)
+            max_entries: 최대 보관 개수, 초과 시 가장 오래 사용되지 않은 항목부터 삭제 (LRU)
+            lease_seconds: 다른 프로세스가 계산 중인 항목을 기다리는 최대 시간
+            poll_interval: 다른 프로세스의 결과를 확인하는 주기(초)
+        """
+        self.path = path or os.getenv("MAFIA_LLM_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "waits": 0, "evictions": 0}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                value TEXT,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                lease_until REAL NOT NULL DEFAULT 0,
+                hits INTEGER NOT NULL DEFAULT 0
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_lru ON llm_responses(last_access)")
+
+    @staticmethod
+    def make_key(model_name: str, template_version: str, prompt: str) -> str:
+        raw = f"{model_name}\0{template_version}\0{prompt}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    async def get_or_compute(self,
+        model_name: str,
+        template_version: str,
+        prompt: str,
+        compute: Callable[[], Awaitable[str]],
+    ) -> str:
+        """캐시된 응답을 반환하고, 없으면 compute()를 한 번만 실행해 저장합니다."""
+        key = self.make_key(model_name, template_version, prompt)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["waits"] += 1
+            LLM_CACHE_TOTAL.inc(("wait",))
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._resolve(key, compute)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # 기다리는 쪽이 없으면 "exception was never retrieved" 경고가 나지 않도록 소비
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _resolve(self, key: str, compute: Callable[[], Awaitable[str]]) -> str:
+        waited = False
+        while True:
+            state, value = await asyncio.to_thread(self._claim, key)
+            if state == _HIT:
+                self.stats["hits"] += 1
+                LLM_CACHE_TOTAL.inc(("hit",))
+                return value
+            if state == _OWNER:
+                break
+            # 다른 프로세스가 같은 프롬프트를 계산 중
+            if not waited:
+                self.stats["waits"] += 1
+                LLM_CACHE_TOTAL.inc(("wait",))
+                waited = True
+            await asyncio.sleep(self.poll_interval)
+
+        self.stats["misses"] += 1
+        LLM_CACHE_TOTAL.inc(("miss",))
+        try:
+            value = await compute()
+        except BaseException:
+            await asyncio.to_thread(self._release, key)
+            raise
+        await asyncio.to_thread(self._store, key, value)
+        return value
+
+    def _claim(self, key: str) -> tuple[str, Optional[str]]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT status, value, created_at, lease_until FROM llm_responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+
+                if row:
+                    status, value, created_at, lease_until = row
+                    if status == "done" and now - created_at < self.ttl_seconds:
+                        self._conn.execute(
+                            "UPDATE llm_responses SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                            (now, key),
+                        )
+                        self._conn.execute("COMMIT")
+                        return _HIT, value
+                    if status == "pending" and lease_until > now:
+                        self._conn.execute("COMMIT")
+                        return _WAIT, None
+
+                # 없음, 만료됨, 또는 lease가 끝난 pending → 이 프로세스가 계산
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, status, value, created_at, last_access, lease_until) "
+                    "VALUES (?, 'pending', NULL, ?, ?, ?)",
+                    (key, now, now, now + self.lease_seconds),
+                )
+                self._conn.execute("COMMIT")
+                return _OWNER, None
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _store(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, status, value, created_at, last_access, lease_until) "
+                "VALUES (?, 'done', ?, ?, ?, 0)",
+                (key, value, now, now),
+            )
+            self._evict(now)
+
+    def _release(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses WHERE key = ? AND status = 'pending'", (key,))
+
+    def _evict(self, now: float):
+        expired = self._conn.execute(
+            "DELETE FROM llm_responses WHERE status = 'done' AND created_at < ?",
+            (now - self.ttl_seconds,),
+        ).rowcount
+
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        overflow = count - self.max_entries
+        lru = 0
+        if overflow > 0:
+            lru = self._conn.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                "SELECT key FROM llm_responses WHERE status = 'done' ORDER BY last_access LIMIT ?)",
+                (overflow,),
+            ).rowcount
+
+        self.stats["evictions"] += expired + lru
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
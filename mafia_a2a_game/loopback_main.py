@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+
+import asyncio
+
+from agent_factory import build_agent_from_config
+from a2a_core.a2a_client import LoopbackHub
+from a2a_core.config_loader import load_a2a_config
+from a2a_core.config_loader import get_server_list
+from manager_agent import ManagerAgent
+
+
+MANAGER_AGENT_NAME = "Manager Agent"
+
+
+def build_loopback_cluster(config_dir: str) -> tuple[LoopbackHub, dict]:
+    """
+    agent_cards 디렉터리의 모든 에이전트를 하나의 프로세스 안에 생성합니다.
+    에이전트 간 메시지는 HTTP 대신 LoopbackHub를 통해 직접 전달됩니다.
+
+    Returns:
+        (LoopbackHub, {에이전트 이름: RequestHandler})
+    """
+    hub = LoopbackHub()
+    handlers = {}
+
+    for filename in sorted(os.listdir(config_dir)):
+        if not filename.endswith(".json"):
+            continue
+
+        config = load_a2a_config(os.path.join(config_dir, filename))
+        other_server_entries = get_server_list(config_dir, filename)
+        _, handler = build_agent_from_config(config, other_server_entries, loopback=hub)
+        handlers[config["name"]] = handler
+
+    return hub, handlers
+
+
+async def main(config_dir: str):
+    """Manager와 모든 Member를 한 프로세스에서 loopback으로 실행합니다."""
+
+    # 1. 모든 에이전트 생성 (서버 없이 executor만 등록)
+    hub, handlers = build_loopback_cluster(config_dir)
+
+    if MANAGER_AGENT_NAME not in handlers:
+        print(f"❌ {config_dir}에 '{MANAGER_AGENT_NAME}' 설정이 없습니다.")
+        return
+
+    agent = handlers[MANAGER_AGENT_NAME].agent_executor.agent
+    print(f"✅ loopback 에이전트 {len(handlers)}개 준비 완료: {list(handlers.keys())}")
+
+    # 2. 게임 실행 (소켓이 없으므로 서버 기동 대기 불필요)
+    start = time.perf_counter()
+    if isinstance(agent, ManagerAgent):
+        await agent.run_game_loop()
+    print(f"⏱️ 게임 소요 시간: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python loopback_main.py <path_to_config_dir>")
+        sys.exit(1)
+
+    config_dir = sys.argv[1]
+
+    try:
+        asyncio.run(main(config_dir))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("👋 게임이 종료되었습니다.")
@@ -1,6 +1,7 @@
 import logging
 import os
 import sys
+import time
 
 import uvicorn
 import asyncio
@@ -8,6 +9,8 @@ import nest_asyncio  # 중첩 루프 허용
 
 from typing import Callable
 from agent_factory import build_server_from_config
+from a2a_core.readiness import PeersNotReadyError
+from a2a_core.readiness import wait_for_peers
 from manager_agent import ManagerAgent
 from member_agent import MemberAgent
 
@@ -24,6 +27,7 @@ async def main(config_path: str):
     """Starts the Test Agent with A2A protocol."""
 
     global server
+    started_at = time.perf_counter()
 
     # 1. 에이전트 설정 및 서버 빌드
     # Get My Own Server Config and Other Server List
@@ -47,7 +51,17 @@ async def main(config_path: str):
 
     # 4. ManagerAgent라면 게임 루프 시작 
     if name == "Manager Agent":
-        await asyncio.sleep(2)  # 모든 서버가 뜰 시간을 약간 확보
+        # 모든 멤버 서버가 응답할 때까지 대기 (고정 sleep 대신 readiness barrier)
+        try:
+            ready = await wait_for_peers(handler.agent_executor.client_agent,
+                                         deadline=server_config.get("readinessTimeout", 30))
+        except PeersNotReadyError as e:
+            print(f"❌ 게임을 시작할 수 없습니다. 준비되지 않은 에이전트: {e.missing}")
+            shutdown_server()
+            await server_task
+            sys.exit(1)
+        print(f"✅ 모든 에이전트 준비 완료 (가장 늦은 에이전트: {max(ready.values(), default=0):.3f}s)")
+        print(f"⏱️ 서버 시작 → 첫 게임 메시지: {time.perf_counter() - started_at:.3f}s")
         await agent.run_game_loop()
 
     # 5. 서버 종료 대기
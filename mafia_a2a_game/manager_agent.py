@@ -3,6 +3,7 @@ import logging
 import random
 import json
 import asyncio
+import uuid
 
 from math import floor
 from typing import Dict
@@ -12,6 +13,12 @@ from collections import Counter
 
 from base_agent import BaseAgent
 from a2a_core.server_executor import GenericAgentExecutor
+from a2a_core.server_executor import MulticastResult
+from a2a_core.tracing import span
+from night_phase import NightActions
+from night_phase import NightPhase
+from night_phase import NightPolicy
+from vote_collector import VoteCollector
 from messages import Role
 from messages import (
     Role,
@@ -19,19 +26,30 @@ from messages import (
     create_message
     )
 from dataclasses import dataclass
+from dataclasses import field
 
 @dataclass
 class AgentStatus:
     role: Role
     alive: bool = True
 
+
+@dataclass
+class GameSession:
+    """게임 한 판의 상태. A2A context_id 별로 하나씩 존재합니다."""
+    context_id: str
+    agent_info: Dict[str, AgentStatus] = field(default_factory=dict)
+    round: int = 1
+    winner: Optional[str] = None
+
 logger = logging.getLogger(__name__)
 
 
 
 class ManagerAgent(BaseAgent):
     """Manager Agent."""
-    def __init__(self, agent_name: str, description: str):
+    def __init__(self, agent_name: str, description: str, discussion_max_wait: float = 5,
+                 night_policy: Optional[NightPolicy] = None, vote_deadline: float = 10):
         
         super().__init__(
             agent_name=agent_name,
@@ -40,8 +58,17 @@ class ManagerAgent(BaseAgent):
         )
     
         self.name = agent_name
-        self.agent_info: Dict[str, AgentStatus] = {}
+        self.agent_names: list[str] = []
+        # 진행 중인 게임들 (context_id → GameSession)
+        self.sessions: Dict[str, GameSession] = {}
         self.executor: GenericAgentExecutor | None = None
+        # 자기소개 후 멤버들끼리의 대화가 잦아들기를 기다리는 최대 시간(초), 0이면 기다리지 않음
+        self.discussion_max_wait: float = discussion_max_wait
+        self.quiescence_poll_interval: float = 0.05
+        # 밤 행동 요청의 역할별 응답 기한과 마피아 quorum
+        self.night_policy: NightPolicy = night_policy or NightPolicy()
+        # 투표 단계 최대 시간(초), 결과가 확정되면 그 전에 끝남
+        self.vote_deadline: float = vote_deadline
 
     def set_server_shutdown_callback(self, callback: Callable[[], None]):
         self.shutdown_callback = callback
@@ -49,18 +76,36 @@ class ManagerAgent(BaseAgent):
 
     def initialize(self, agent_names: list[str], executor: GenericAgentExecutor = None):
         self.executor = executor
-        self.assign_roles(agent_names)
+        self.agent_names = list(agent_names)
+        if len(self.agent_names) < 3:
+            raise ValueError("플레이어 수가 3명 이상이어야 역할을 배정할 수 있습니다.")
         #await self.run_game_loop()
 
 
+    def create_session(self, context_id: Optional[str] = None) -> GameSession:
+        """새 게임을 만들고 역할을 배정합니다. context_id가 없으면 새로 생성합니다."""
+        context_id = context_id or str(uuid.uuid4())
+        if context_id in self.sessions:
+            raise ValueError(f"이미 진행 중인 게임입니다: {context_id}")
+
+        session = GameSession(context_id=context_id, agent_info=self.assign_roles(self.agent_names))
+        self.sessions[context_id] = session
+        return session
+
+
+    def end_session(self, session: GameSession):
+        self.sessions.pop(session.context_id, None)
+
+
     # 1. Role 할당
-    def assign_roles(self, agent_names: list[str]):
+    def assign_roles(self, agent_names: list[str]) -> Dict[str, AgentStatus]:
         """게임내 역할을 무작위로 할당합니다."""
         total_agents = len(agent_names)
         if total_agents < 3:
             raise ValueError("플레이어 수가 3명 이상이어야 역할을 배정할 수 있습니다.")
         
-        # 셔플
+        # 셔플 (게임마다 배정하므로 원본 목록은 유지)
+        agent_names = list(agent_names)
         random.shuffle(agent_names)
 
         # mafia 수 = 총 인원의 1/3, 최소 1명
@@ -69,7 +114,7 @@ class ManagerAgent(BaseAgent):
         num_villager = total_agents - num_mafia - num_detective
 
         # 역할 할당
-        self.agent_info: Dict[str, AgentStatus] = {}
+        agent_info: Dict[str, AgentStatus] = {}
 
         for i, name in enumerate(agent_names):
             if i < num_mafia:
@@ -79,139 +124,213 @@ class ManagerAgent(BaseAgent):
             else:
                 role = Role.VILLAGER
 
-            self.agent_info[name] = AgentStatus(role=role, alive=True)
+            agent_info[name] = AgentStatus(role=role, alive=True)
 
         print("✅ 역할이 무작위로 할당되었습니다:")
-        for name, status in self.agent_info.items():
+        for name, status in agent_info.items():
             print(f"  - {name}: {status.role.name} (alive={status.alive})")
 
+        return agent_info
+
 
     # Game Loop
-    async def run_game_loop(self):
+    async def run_game_loop(self, context_id: Optional[str] = None) -> Optional[GameSession]:
+        """
+        게임 한 판을 끝까지 진행합니다. 여러 게임을 동시에 실행할 수 있습니다.
+
+        Args:
+            context_id: 게임을 식별하는 A2A context_id, None이면 새로 생성
+
+        Returns:
+            GameSession: 종료된 게임 (winner에 "MAFIA" 또는 "CITIZENS")
+        """
         if not self.executor:
             print("❌ Executor가 설정되어 있지 않습니다.")
-            return
+            return None
 
-        print("🎲 게임을 시작합니다...\n")
+        session = self.create_session(context_id)
+        print(f"🎲 게임을 시작합니다... ({session.context_id})\n")
+
+        try:
+            # 게임 한 판이 하나의 trace (MAFIA_TRACE_DIR가 설정된 경우)
+            with span("game", agent=self.agent_name, context_id=session.context_id):
+                await self.play_session(session)
+        finally:
+            self.end_session(session)
+
+        # 진행 중인 게임이 더 없을 때만 콜백으로 서버 종료 요청
+        if hasattr(self, 'shutdown_callback') and not self.sessions:
+            print("🎮 모든 게임 종료됨 - 서버 종료 콜백 실행")
+            self.shutdown_callback()
 
+        return session
+
+    async def play_session(self, session: GameSession):
         # 1. 역할 할당 및 통보
-        await self.notify_roles_to_agents()
+        await self.notify_roles_to_agents(session)
 
         round_num = 1
         while True:
+            session.round = round_num
             print(f"\n🌞 낮 {round_num} 시작")
 
             # 2. 낮 - 자기소개 요청
-            await self.request_introduction()
+            await self.request_introduction(session)
 
-            # 멤버들끼리 자유 대화 
-            await asyncio.sleep(5)
+            # 멤버들끼리 자유 대화가 끝날 때까지 대기 (최대 discussion_max_wait초)
+            await self.wait_for_quiescence(session, self.discussion_max_wait)
 
             # 3. 낮 - 투표 및 처형
-            await self.execute_vote_phase()
+            await self.execute_vote_phase(session)
 
             # 4. 게임 종료 체크
-            is_over, winner = self.is_game_over()
+            is_over, winner = self.is_game_over(session)
             if is_over:
-                await self.announce_winner(winner)
+                await self.announce_winner(session, winner)
                 break
 
             print(f"\n🌙 밤 {round_num} 시작")
             
             # 5. 밤 - 마피아/경찰 행동
-            await self.execute_night_phase()
+            await self.execute_night_phase(session)
 
             # 6. 게임 종료 체크
-            is_over, winner = self.is_game_over()
+            is_over, winner = self.is_game_over(session)
             if is_over:
-                await self.announce_winner(winner)
+                await self.announce_winner(session, winner)
                 break
 
             round_num += 1
         
-        # 게임 종료 시 콜백으로 서버 종료 요청
-        if hasattr(self, 'shutdown_callback'):
-            print("🎮 게임 종료됨 - 서버 종료 콜백 실행")
-            self.shutdown_callback()
 
     # 1. 역할 할당 및 통보
-    async def notify_roles_to_agents(self):
+    async def notify_roles_to_agents(self, session: GameSession):
         """모든 에이전트에게 자신의 역할을 비공개로 알립니다."""
 
         if not self.executor:
             print("❌ Executor가 설정되어 있지 않습니다.")
             return
 
-        for agent_name, status in self.agent_info.items():
+        for agent_name, status in session.agent_info.items():
+            if not self.executor.reachable(agent_name):
+                print(f"🔌 {agent_name} 연결 차단 중, 역할 전송 생략")
+                continue
             try:
                 message = create_message(MessageType.ROLE_ASSIGNMENT, self.name, agent_name, role=status.role)
 
-                await self.executor.send_to_other(agent_name, message)
+                await self.executor.send_to_other(agent_name, message, context_id=session.context_id)
                 print(f"✅ 역할 전송 완료: {agent_name} → {status.role.name}")
             except Exception as e:
                 print(f"⚠️ 역할 전송 실패: {agent_name} → {status.role.name} ({e})")    
  
 
     # 2. 자기 소개 
-    async def request_introduction(self):
+    async def request_introduction(self, session: GameSession):
         """모든 에이전트에게 낮 시작 자기소개 요청 메시지를 보냅니다."""
         
         message = create_message(MessageType.INTRO_REQUEST, self.name, "All")
 
-        await self.broadcast_to_roles(message)
+        await self.broadcast_to_roles(session, message)
         print("📢 게임 시작 메시지를 모든 에이전트에게 전송했습니다.")
 
 
+    async def wait_for_quiescence(self, session: GameSession, max_wait: float, settle_polls: int = 2) -> float:
+        """
+        멤버들 사이에 처리 중인 대화가 없어질 때까지 기다립니다.
+
+        고정 sleep 대신 각 멤버에게 STATUS_REQUEST로 진행 중인 메시지 수를 묻고,
+        합계가 settle_polls번 연속 0이면 대화가 끝난 것으로 보고 즉시 반환합니다.
+        A2A 전송은 응답을 받을 때까지 보낸 쪽에서 집계되므로, 전송 중인 메시지도 놓치지 않습니다.
+
+        Args:
+            session: 대기할 게임
+            max_wait: 최대 대기 시간(초), 0 이하이면 기다리지 않음
+            settle_polls: 0이 연속으로 관측되어야 하는 횟수
+
+        Returns:
+            float: 실제로 기다린 시간(초)
+        """
+        if max_wait <= 0 or not self.executor:
+            return 0.0
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + max_wait
+        quiet = 0
+
+        while True:
+            # 매니저 자신의 전송도 포함 (STATUS_REQUEST를 보내기 전에 읽음)
+            pending = self.executor.inflight(session.context_id)
+            message = create_message(MessageType.STATUS_REQUEST, self.name, "All-Alive")
+            remaining = max(deadline - loop.time(), 0.01)
+            results = await self.executor.multicast(
+                self.present_agents(session),
+                message,
+                per_recipient_timeout=remaining,
+                context_id=session.context_id,
+            )
+            for result in results.values():
+                pending += self.parse_inflight(result)
+
+            quiet = quiet + 1 if pending == 0 else 0
+            elapsed = loop.time() - start
+            if quiet >= settle_polls:
+                print(f"🤫 대화 종료 감지 ({elapsed:.2f}s)")
+                return elapsed
+            if loop.time() >= deadline:
+                print(f"⏰ 최대 대기 시간 도달, 진행 중인 대화 {pending}건 ({elapsed:.2f}s)")
+                return elapsed
+
+            await asyncio.sleep(min(self.quiescence_poll_interval, max(deadline - loop.time(), 0)))
+
+    @staticmethod
+    def parse_inflight(result: MulticastResult) -> int:
+        """STATUS_REQUEST 응답에서 진행 중인 메시지 수를 읽습니다. 알 수 없으면 0으로 봅니다."""
+        if not result.ok or not result.response:
+            return 0
+        try:
+            return int(json.loads(result.response[0]).get("inflight", 0))
+        except (TypeError, ValueError, AttributeError):
+            return 0
+
+
     # 3. 낮 행동 : 토론
-    async def execute_day_phase(self):
+    async def execute_day_phase(self, session: GameSession):
         """모든 에이전트에게 낮 시작 요청 메시지를 보냅니다."""
         
         message = create_message(MessageType.DAY_ACTION_REQUEST, self.name, "All-Alive")
 
-        await self.broadcast_to_roles(message)
+        await self.broadcast_to_roles(session, message)
         print("📢 낮 시작 메시지를 모든 에이전트에게 전송했습니다.")
 
 
     # 3. 낮 행동 : 투표 
-    async def execute_vote_phase(self):
-        votes = await self.request_votes()
+    async def execute_vote_phase(self, session: GameSession):
+        votes = await self.request_votes(session)
         executed = self.count_votes(votes)
 
-        if executed and executed in self.agent_info:
-            self.agent_info[executed].alive = False
+        if executed and executed in session.agent_info:
+            session.agent_info[executed].alive = False
             print(f"🔪 {executed} 가 처형되었습니다.")
 
             message = create_message(MessageType.EXECUTION_RESULT, self.name, "All-Alive", target=executed)
 
-            await self.broadcast_to_roles(message)
+            await self.broadcast_to_roles(session, message)
 
         else:
             print("⚖️ 처형 없음 (동률 또는 투표 실패).")
 
-    async def request_votes(self) -> Dict[str, str]:
-        """모든 살아있는 에이전트에게 투표 요청하고 응답 수집."""
-       
+    async def request_votes(self, session: GameSession) -> Dict[str, str]:
+        """
+        살아 있는 에이전트에게 동시에 투표를 요청하고 도착하는 순서대로 집계합니다.
+        남은 표로 결과가 바뀔 수 없게 되거나 vote_deadline이 지나면 바로 반환합니다.
+        """
         message = create_message(MessageType.VOTE_REQUEST, self.name, "All-Alive")
 
-              
-        # 응답 수집
-        votes: Dict[str, str] = {}
-        for agent_name, status in self.agent_info.items():
-            if not status.alive:
-                continue
-
-            try:
-                response_list = await self.executor.send_to_other(agent_name, message)
-                if response_list:
-                    vote_target = response_list[0]
-                    votes[agent_name] = vote_target
-                    print(f"🗳️ {agent_name} → {vote_target}")
-                else:
-                    print(f"⚠️ {agent_name} 응답 없음.")
-            except Exception as e:
-                print(f"❌ {agent_name} 응답 실패: {e}")
-
-        return votes
+        collector = VoteCollector(self.executor, self.name, session.context_id,
+                                  message_for=lambda _: message, deadline=self.vote_deadline)
+        result = await collector.collect(self.present_agents(session))
+        return result.votes
 
     def count_votes( self, votes: Dict[str, str]) -> Optional[str]:
         
@@ -230,74 +349,38 @@ class ManagerAgent(BaseAgent):
 
 
     # 4. 밤 행동
-    async def execute_night_phase(self):
+    async def execute_night_phase(self, session: GameSession) -> NightActions:
+        """마피아/경찰에게 밤 행동을 동시에 요청합니다. (역할별 기한은 night_policy)"""
         print("\n🌙 밤이 되었습니다. 마피아는 공격할 대상을 선택하고, 경찰은 조사를 수행합니다.\n")
 
-        mafia_targets = []
-        detective_results = {}
+        async def announce_kill(killed: str):
+            print(f"\n💀 밤 동안 {killed} 가 제거되었습니다.")
+            # 전체에게 제거 사실을 알림
+            message = create_message(MessageType.KILLED_RESULT, self.name, "All-Alive", target=killed)
+            await self.broadcast_to_roles(session, message)
 
-        for name, status in self.agent_info.items():
-            if not status.alive:
-                continue
+        night = NightPhase(self.executor, self.name, session.agent_info, session.context_id, self.night_policy)
+        return await night.run(announce_kill)
 
-            # 4-1. 마피아의 밤 공격
-            if status.role == Role.MAFIA:
-                try:
-                    message = create_message(MessageType.NIGHT_ACTION_REQUEST, self.name, name, role=status.role)
-                    response = await self.executor.send_to_other(name, message)
-                    if response:
-                        mafia_targets.append(response[0])
-                        print(f"🧟‍♂️ {name} → {response[0]}")
-                except Exception as e:
-                    print(f"❌ 마피아 행동 실패: {e}")
-
-            # 4-2. 경찰의 조사
-            elif status.role == Role.DETECTIVE:
-                try:
-                    message = create_message(MessageType.NIGHT_ACTION_REQUEST, self.name, name, role=status.role)
-                    response = await self.executor.send_to_other(name, message)
-                    if response:
-                        target = response[0]
-                        is_mafia = self.agent_info.get(target, AgentStatus(Role.VILLAGER)).role == Role.MAFIA
-                        detective_results[name] = (target, is_mafia)
-                        print(f"🕵️ {name} → {target} is {'MAFIA' if is_mafia else 'NOT MAFIA'}")
-                except Exception as e:
-                    print(f"❌ 경찰 행동 실패: {e}")
-
-        # 4-3. 마피아 타겟 결정 (복수일 경우 랜덤 선택)
-        if mafia_targets:
-            votes = Counter(mafia_targets)
-            max_vote = max(votes.values())
-            candidates = [name for name, count in votes.items() if count == max_vote]
-            killed = random.choice(candidates)
-            if killed in self.agent_info:
-                self.agent_info[killed].alive = False
-                print(f"\n💀 밤 동안 {killed} 가 제거되었습니다.")
-
-                # 전체에게 제거 사실을 알림
-                message = create_message(MessageType.KILLED_RESULT, self.name, "All-Alive", target=killed)
-                await self.broadcast_to_roles(message)
-        else:
-            print("😴 마피아가 아무도 제거하지 않았습니다.")
 
-        # 4-4. 경찰에게 조사 결과 전달
-        for detective, (target, is_mafia) in detective_results.items():
-            try:
-                message = create_message(MessageType.NIGHT_ACTION_RESULT, self.name, detective, target=target, is_mafia=is_mafia)
-                await self.executor.send_to_other(detective, message)
-            except Exception as e:
-                print(f"❌ 경찰 결과 전송 실패: {e}")
+    def present_agents(self, session: GameSession) -> list[str]:
+        """
+        메시지를 보낼 살아 있는 에이전트.
+        circuit이 열린 (응답하지 않는) 에이전트는 회복될 때까지 없는 것으로 봅니다.
+        """
+        return [name for name, status in session.agent_info.items()
+                if status.alive and self.executor.reachable(name)]
 
 
     # 5. 게임 종료
-    def is_game_over(self) -> tuple[bool, Optional[str]]:
+    def is_game_over(self, session: GameSession) -> tuple[bool, Optional[str]]:
         """
         게임 종료 조건을 확인합니다.
         Returns:
             (is_over: bool, winner: Optional[str])
         """
-        mafia_count = sum(1 for s in self.agent_info.values() if s.alive and s.role == Role.MAFIA)
-        others_count = sum(1 for s in self.agent_info.values() if s.alive and s.role != Role.MAFIA)
+        mafia_count = sum(1 for s in session.agent_info.values() if s.alive and s.role == Role.MAFIA)
+        others_count = sum(1 for s in session.agent_info.values() if s.alive and s.role != Role.MAFIA)
 
         if mafia_count == 0:
             return True, "CITIZENS"
@@ -307,17 +390,19 @@ class ManagerAgent(BaseAgent):
             return False, None
 
     # 6. 게임 결과
-    async def announce_winner(self, winner: str):
+    async def announce_winner(self, session: GameSession, winner: str):
+        session.winner = winner
         message = create_message(MessageType.GAME_RESULT, self.name, "All-Alive", winner=winner)
-        await self.broadcast_to_all(message)
+        await self.broadcast_to_all(session, message)
         print(f"🏁 게임 종료! 승리 팀: {winner}")
            
 
-    async def broadcast_to_roles(self, user_text: str, roles: list[Role] = None ) -> None:
+    async def broadcast_to_roles(self, session: GameSession, user_text: str, roles: list[Role] = None ) -> dict[str, MulticastResult]:
         """
         특정 역할을 가진 에이전트들에게만 메시지를 브로드캐스트합니다.
         
         Args:
+            session: 메시지를 보낼 게임
             roles: 역할 문자열 리스트 (예: ["mafia", "detective"])
             user_text: 보낼 메시지 내용
         """
@@ -325,35 +410,33 @@ class ManagerAgent(BaseAgent):
             print("❌ Executor가 설정되어 있지 않습니다.")
             return
 
-        for agent_name, status in self.agent_info.items():
-            if roles and status.role not in roles: 
-                continue  # 역할이 매칭되지 않으면 skip
-            
-            if not status.alive :
-                continue # Alive가 아니면 skip
-
-            print(f"\n🎯 '{agent_name}' ({status.role})에게 메시지를 전송 중...")
-            await self.executor.send_to_other(agent_name, user_text)
+        recipients = [
+            agent_name for agent_name in self.present_agents(session)
+            if not roles or session.agent_info[agent_name].role in roles
+        ]
+        print(f"\n🎯 {recipients} 에게 메시지를 동시 전송 중...")
+        return await self.executor.multicast(recipients, user_text, context_id=session.context_id)
    
 
-    async def broadcast_to_all(self, user_text: str ) -> None:
+    async def broadcast_to_all(self, session: GameSession, user_text: str ) -> dict[str, MulticastResult]:
         """
-        특정 역할을 가진 에이전트들에게만 메시지를 브로드캐스트합니다.
+        생존 여부와 관계없이 모든 에이전트에게 메시지를 브로드캐스트합니다.
         
         Args:
+            session: 메시지를 보낼 게임
             user_text: 보낼 메시지 내용
         """
         if not self.executor:
             print("❌ Executor가 설정되어 있지 않습니다.")
             return
 
-        for agent_name, status in self.agent_info.items():
-           
-            print(f"\n🎯 '{agent_name}' ({status.role})에게 메시지를 전송 중...")
-            await self.executor.send_to_other(agent_name, user_text)
+        # 게임 종료 통보에 쓰이므로 circuit이 열린 에이전트도 제외하지 않음 (한 번씩은 시도)
+        recipients = list(session.agent_info)
+        print(f"\n🎯 {recipients} 에게 메시지를 동시 전송 중...")
+        return await self.executor.multicast(recipients, user_text, context_id=session.context_id)
     
     #
-    def handle_message(self, message: str) -> str: 
+    async def handle_message(self, message: str, context_id: Optional[str] = None) -> str: 
         # TODO
         logger.info(f"📩 ManagerAgent received message: {message}")
         return "Manager does not respond to messages."
@@ -1,23 +1,49 @@
 import logging
 import json
 import random
+import time
 
 from typing import Optional
 from typing import Callable
 from typing import Dict
 from collections import defaultdict
+from collections import OrderedDict
+from dataclasses import dataclass
+from dataclasses import field
 from base_agent import BaseAgent
+from a2a_core.metrics import timed_llm
 from a2a_core.server_executor import GenericAgentExecutor
+from a2a_core.streaming import emit_partial
 from messages import (
     Role,
     MessageType,
-    create_chat_message
+    MessageValidationError,
+    DayActionRequest,
+    ExecutionResult,
+    GameResult,
+    IntroRequest,
+    IntroResponse,
+    KilledResult,
+    NightActionRequest,
+    NightActionResult,
+    Question,
+    QuestionResponse,
+    RoleAssignment,
+    StatusRequest,
+    VoteRequest,
+    create_broadcast,
+    create_chat_message,
+    parse_message
     )
+from message_router import MessageRouter
+from message_router import UnhandledMessageError
 
-import os
-#from google import genai
-import google.generativeai as genai
 from dotenv import load_dotenv
+from llm_executor import GeminiExecutor
+from fake_llm import FakeLLMExecutor
+from llm_cache import SharedResponseCache
+from judgment_batcher import JudgmentBatcher
+from judgment_batcher import JudgmentRequest
 
 load_dotenv()
 
@@ -25,13 +51,40 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# 프롬프트 템플릿 버전 (공유 LLM 캐시 키에 포함, 템플릿을 바꾸면 올려주세요)
+JUDGE_MESSAGE_PROMPT_VERSION = "judge_message/v1"
+JUDGE_ANSWER_PROMPT_VERSION = "judge_answer/v1"
+JUDGE_SUSPICION_PROMPT_VERSION = "judge_suspicion/v1"
+JUDGE_BATCH_PROMPT_VERSION = "judge_batch/v1"
+
+# 규칙 기반 판단에 사용하는 의심 키워드
+SUSPICIOUS_KEYWORDS = ["도와드릴게요", "정의롭지 않다", "모두 없애자", "조용히 처리"]
+
+# context_id 없이 들어온 메시지가 사용하는 게임 키 (단일 게임 실행과의 호환용)
+DEFAULT_GAME_ID = "default"
+
+
+@dataclass
+class MemberGameState:
+    """한 게임(A2A context_id) 안에서의 멤버 상태."""
+    role: Optional[Role] = None
+    alive: bool = True
+    known_agents: list[str] = field(default_factory=list)
+    vote_history: list[str] = field(default_factory=list)
+    investigation_results: Dict[str, bool] = field(default_factory=dict) # 경찰, 시민의 조사 결과
+    dialog_history: Dict[str, list[str]] = field(default_factory=lambda: defaultdict(list))
+    suspicion_scores: Dict[str, int] = field(default_factory=dict)  # 기본값: 0 (중립)
+    last_active: float = field(default_factory=time.monotonic)
+
 
 class MemberAgent(BaseAgent):
     """Member Agent."""
 
     MANAGER_AGENT_NAME: str = 'Manager Agent'
 
-    def __init__(self, agent_name: str, description: str):
+    def __init__(self, agent_name: str, description: str, use_llm: bool = True, llm_concurrency: int = 4,
+                 llm_cache: bool = True, judge_batch_window: float = 0.05, judge_batch_max: int = 16,
+                 game_idle_ttl: float = 600, max_games: int = 1000, llm_options: Optional[dict] = None):
         
         super().__init__(
             agent_name=agent_name,
@@ -39,22 +92,39 @@ class MemberAgent(BaseAgent):
             content_types=['text', 'text/plain'],
         )
         self.name = agent_name
-        self.role: Optional[Role] = None
-        self.alive: bool = True
-        self.known_agents: list[str] = []
-        self.vote_history: list[str] = []
-        self.investigation_results: Dict[str, bool] = {} # 경찰, 시민의 조사 결과
-        self.dialog_history: Dict[str, list[str]] = defaultdict(list)
-        self.suspicion_scores: Dict[str, int] = {}  # 기본값: 0 (중립)
+        self.peer_names: list[str] = []
         self.executor: Optional[GenericAgentExecutor] = None
 
-        self.use_llm = True
+        # 게임별 상태 (context_id → 상태), 오래 사용하지 않은 게임부터 정렬
+        self.games: OrderedDict[str, MemberGameState] = OrderedDict()
+        self.game_idle_ttl = game_idle_ttl
+        self.max_games = max_games
+
+        self.use_llm = use_llm
+        self.llm: Optional[GeminiExecutor | FakeLLMExecutor] = None
         if self.use_llm : 
-            api_key=os.getenv("GEMINI_API_KEY")
-            genai.configure(api_key=api_key)
             self.llm_model = 'gemini-2.5-flash'
+            # LLM 호출은 전용 스레드 풀에서 실행 (이벤트 루프 블로킹 방지)
+            # 수신자와 무관한 판단 프롬프트는 같은 호스트의 에이전트끼리 응답을 공유
+            cache = SharedResponseCache() if llm_cache else None
+            llm_options = llm_options or {}
+            if llm_options.get("backend") == "fake":
+                # 부하 테스트용 가짜 모델 (fake_llm 서버 또는 in-process)
+                self.llm = FakeLLMExecutor.from_config(self.llm_model, llm_options,
+                                                       max_concurrency=llm_concurrency, cache=cache)
+            else:
+                self.llm = GeminiExecutor(self.llm_model, max_concurrency=llm_concurrency, cache=cache)
+            # 거의 동시에 도착한 발언/답변 판단을 모아 한 번의 LLM 호출로 처리
+            self.judge_batcher = JudgmentBatcher(
+                self.gemini_judge_batch,
+                window=judge_batch_window,
+                max_batch=judge_batch_max,
+            )
         
 
+        # MessageType → 핸들러 (dict 조회로 dispatch, 핸들러별 latency 집계)
+        self.router = self.build_router()
+
         logger.info(f'Init {self.agent_name}')
     
     def set_server_shutdown_callback(self, callback: Callable[[], None]):
@@ -62,21 +132,51 @@ class MemberAgent(BaseAgent):
 
     def initialize(self, agent_names: list[str], executor: GenericAgentExecutor = None):
         self.executor = executor
-        # Manager와 본인을 제외한 나머지 에이전트를 known_agents로 설정
-        self.known_agents = [
+        # Manager와 본인을 제외한 나머지 에이전트 (새 게임의 known_agents 초기값)
+        self.peer_names = [
             name for name in agent_names
             if name != self.name and name != self.MANAGER_AGENT_NAME
         ]
+
+    def get_game(self, context_id: Optional[str]) -> MemberGameState:
+        """context_id에 해당하는 게임 상태를 반환하고, 없으면 새로 만듭니다."""
+        game_id = context_id or DEFAULT_GAME_ID
+        now = time.monotonic()
+
+        game = self.games.get(game_id)
+        if game is None:
+            self.evict_games(now)
+            game = MemberGameState(known_agents=list(self.peer_names))
+            self.games[game_id] = game
+        else:
+            self.games.move_to_end(game_id)
+
+        game.last_active = now
+        return game
+
+    def evict_games(self, now: Optional[float] = None):
+        """game_idle_ttl 동안 메시지가 없었던 게임과 max_games를 넘는 게임을 제거합니다."""
+        now = now if now is not None else time.monotonic()
+        while self.games:
+            game_id, game = next(iter(self.games.items()))
+            if now - game.last_active < self.game_idle_ttl and len(self.games) < self.max_games:
+                break
+            del self.games[game_id]
+            logger.info(f"🧹 {self.name}: 비활성 게임 상태 제거 ({game_id})")
+
+    def end_game(self, context_id: Optional[str]):
+        self.games.pop(context_id or DEFAULT_GAME_ID, None)
     
-    async def gemini_generate_intro(self) -> str:
-        prompt = f"""당신은 마피아 게임의 '{self.role.name}' 역할을 맡고 있습니다.
+    @timed_llm
+    async def gemini_generate_intro(self, role: Role) -> str:
+        prompt = f"""당신은 마피아 게임의 '{role.name}' 역할을 맡고 있습니다.
         다른 참가자에게 자연스럽고 수상하지 않게 자기소개를 해주세요. 
         너무 티나지 않도록 진짜 사람처럼 행동하세요.
         당신의 이름은 {self.name}입니다.
         """
-        response = genai.GenerativeModel(self.llm_model).generate_content(prompt)
-        return response.text.strip()
+        return await self.stream_llm(prompt)
 
+    @timed_llm
     async def gemini_judge_message(self, sender: str, message: str) -> bool:
         prompt = f"""당신은 마피아 게임에서 사람들의 대화를 분석해 의심스러운 사람을 식별하는 인공지능입니다.
         아래는 {sender}의 발언입니다:
@@ -84,9 +184,10 @@ class MemberAgent(BaseAgent):
         "{message}"
 
         이 사람은 마피아일 가능성이 높습니까? (yes 또는 no로만 대답하세요)"""
-        response = genai.GenerativeModel(self.llm_model).generate_content(prompt)
-        return "yes" in response.text.lower()
+        response = await self.llm.generate(prompt, cache_version=JUDGE_MESSAGE_PROMPT_VERSION)
+        return "yes" in response.lower()
 
+    @timed_llm
     async def gemini_judge_answer(self, name: str, answer: str) -> bool:
         prompt = f"""
         누군가 다음과 같이 답했습니다:
@@ -98,26 +199,33 @@ class MemberAgent(BaseAgent):
         "신뢰할 수 있다"면 false,
         "아직 의심스럽다"면 true를 반환해주세요.
         """
-        response = genai.GenerativeModel(self.llm_model).generate_content(prompt)
-        return "true" in response.text.lower()
+        response = await self.llm.generate(prompt, cache_version=JUDGE_ANSWER_PROMPT_VERSION)
+        return "true" in response.lower()
 
-    async def gemini_answer_question(self, question: str) -> str:
+    @timed_llm
+    async def gemini_answer_question(self, question: str, role: Role) -> str:
         prompt = f"""당신은 마피아 게임 참가자이며, 아래와 같은 질문을 받았습니다:
 
         "{question}"
 
-        당신은 '{self.role.name}' 역할입니다.
+        당신은 '{role.name}' 역할입니다.
         질문에 자연스럽고 의심받지 않게 답변해주세요.
         """
-        response = genai.GenerativeModel(self.llm_model).generate_content(prompt)
-        return response.text.strip()
+        return await self.stream_llm(prompt)
+
+    async def stream_llm(self, prompt: str) -> str:
+        """LLM 응답을 생성되는 대로 현재 A2A 요청의 응답 스트림으로 보내고, 전체 텍스트를 반환합니다."""
+        chunks = []
+        async for chunk in self.llm.stream(prompt):
+            chunks.append(chunk)
+            await emit_partial(chunk)
+        return "".join(chunks).strip()
     
-    async def gemini_judge_suspicion(self, agent_name: str) -> bool:
+    @timed_llm
+    async def gemini_judge_suspicion(self, agent_name: str, history: list[str]) -> bool:
         """
         대화 히스토리를 기반으로 상대를 마피아로 의심할지 판단
         """
-        history = self.dialog_history.get(agent_name, [])
-
         if not history:
             return False
 
@@ -131,204 +239,333 @@ class MemberAgent(BaseAgent):
         위 대화를 바탕으로 {agent_name}이 수상하다고 판단되면 "YES", 그렇지 않으면 "NO"라고만 응답하세요.
         """
 
-        response = genai.GenerativeModel(self.llm_model).generate_content(prompt)
-        return "yes" in response.text.strip()
+        response = await self.llm.generate(prompt, cache_version=JUDGE_SUSPICION_PROMPT_VERSION)
+        return "yes" in response.strip()
 
-    async def handle_message(self, message: str) -> str: 
-        try:
-            data = json.loads(message)
-            message_type = data.get("type")
-            payload = data.get("payload", {})
-
-            print(message_type)
-
-            if message_type == MessageType.ROLE_ASSIGNMENT.name:
-                self.role = Role[payload.get("role")]
-                print(f"🧩 역할 부여됨: {self.role.name}")
-                return f"역할이 '{self.role.name}'로 설정되었습니다."
-                            
-            elif message_type == MessageType.INTRO_REQUEST.name:
-                
-                if self.use_llm : 
-                    text = await self.gemini_generate_intro() 
-                else : 
-                    if self.role == Role.MAFIA:
-                        text = f"안녕하세요, 저는 {self.name}입니다. 평범한 시민으로 이 게임을 즐기고 있어요. 잘 부탁드립니다!" 
-                    elif self.role == Role.DETECTIVE:
-                        text = f"안녕하세요, 저는 {self.name}입니다. 시민으로서 최선을 다할게요!"
-                    else:
-                        text = f"안녕하세요, 저는 {self.name}입니다. 모두와 협력해서 이기고 싶어요!" 
-                
-                               
-                # broadcast to all 
-                for name in self.known_agents:
-                    message = create_chat_message(MessageType.INTRO_RESPONSE, self.name, name, text=text)
-                    await self.executor.send_to_other(name, message)
-
-                # Manager에게는 간단히 이름만 응답
-                return f"저는 {self.name}입니다." 
-            
-            elif message_type == MessageType.INTRO_RESPONSE.name:
-                message = payload.get("message")
-                from_agent = payload.get("from")
-                print(f"{from_agent} 메시지 : {message}")
-                self.dialog_history[from_agent].append(message)
-
-                if self.use_llm : 
-                    is_suspicious = await self.gemini_judge_message(from_agent, message)
-                else :  
-                    # (단순 키워드 기반, 필요시 강화 가능)
-                    suspicious_keywords = ["도와드릴게요", "정의롭지 않다", "모두 없애자", "조용히 처리"]
-                    is_suspicious = any(kw in message for kw in suspicious_keywords)
-
-                
-                if is_suspicious:                   
-                    if self.role == Role.MAFIA:
-                        print(f"🤔 {from_agent}은 경찰/시민일 가능성이 높음 → 제거 후보")
-                    else:
-                        print(f"🤔 {from_agent}은 마피아일 가능성이 있음 → 질문 대상")
-                    
-                    self.update_suspicion_score(from_agent)
-                                     
-                return f"{from_agent}으로부터 메시지 잘 받았습니다"
-
-            elif message_type == MessageType.DAY_ACTION_REQUEST.name:
-                
-                if not self.alive:
-                    return "사망 상태이므로 행동 불가"
-
-                if not self.suspicion_scores  :
-                    return "의심되는 대상 없음"
-
-                # 가장 의심되는 대상에게 질문 전송
-                target = max(self.suspicion_scores, key=self.suspicion_scores.get)
-                if self.executor:
-                    message = create_chat_message(MessageType.QUESTION, self.name, target)
-                    await self.executor.send_to_other(name, message)
-
-                return f"{target}에게 질문 전송 완료"
-
-
-            elif message_type == MessageType.QUESTION.name:
-                from_agent = payload.get("from")
-                question = payload.get("message")
-                self.dialog_history[from_agent].append(question)
-                print(f"❓ {from_agent}로부터 질문 받음: {question}")
-
-                # 역할에 따라 자연스러운 답변 생성
-                if self.use_llm : 
-                    answer = await self.gemini_answer_question(question)
-                else : 
-                    if self.role == Role.MAFIA:
-                        answer = "그냥 제 생각일 뿐이에요. 의심하지 마세요. 😅"
-                    elif self.role == Role.DETECTIVE:
-                        answer = "저는 정의를 지키기 위해 행동할 뿐입니다."
-                    else:
-                        answer = "저는 그냥 평범한 시민이에요."
-
-                if self.executor:
-                    message = create_chat_message(MessageType.QUESTION_RESPONSE, self.name, from_agent, text=answer)
-                    await self.executor.send_to_other(name, message)
-
-                # 응답 전송
-                return f"{name}으로부터 질문 잘 받았습니다"
-           
-            elif message_type == MessageType.QUESTION_RESPONSE.name:
-                from_agent = payload.get("from")
-                answer = payload.get("message")
-                self.dialog_history[from_agent].append(message)
-
-                print(f"💬 {from_agent}의 질문 응답 수신: {answer}")
-
-                # LLM으로 응답 평가 → 신뢰할 만한지 판단
-                is_still_suspicious = await self.gemini_judge_answer(from_agent, answer)
-
-                if not is_still_suspicious:
-                    self.reduce_suspicion_score(from_agent)
-
-                return f"{from_agent}의 응답을 수신했습니다."
-
-            elif message_type == MessageType.VOTE_REQUEST.name:
-                print("📩 투표 요청을 받았습니다.")
-                return self.select_vote_target()
-
-            elif message_type == MessageType.NIGHT_ACTION_REQUEST.name:
-                print("🌙 밤 행동 요청을 받았습니다.")
-                role_str = payload.get("role")
-                if not self.alive:
-                    return ""
-                if role_str == "MAFIA" and self.role == Role.MAFIA:
-                    return self.choose_night_target()
-                elif role_str == "DETECTIVE" and self.role == Role.DETECTIVE:
-                    return self.choose_night_target()
-                else:
-                    return ""
-
-            elif message_type == MessageType.NIGHT_ACTION_RESULT.name:
-                message = payload.get("message")
-                print(f"🌙 밤 행동 결과: {message}")
-                
-                target = payload.get("target")
-                is_mafia = payload.get("is_mafia")
-                print(f"🔍 {self.name} 조사 결과: {target} → {'마피아' if is_mafia else '시민'}")
-
-                self.investigation_results[target] = is_mafia
-
-                return "조사 결과 확인"
-
-            elif message_type == MessageType.EXECUTION_RESULT.name:
-                message = payload.get("message")
-                executed = payload.get("executed")
-                print(f"🔪 {executed} 가 투표로 처형됨: {message}")
-
-                if executed == self.name:
-                    self.alive = False             
-                # Known list에서 제거
-                if executed in self.known_agents:
-                    self.known_agents.remove(executed)
-                return "처형 결과 확인"
-
-            elif message_type == MessageType.KILLED_RESULT.name:
-                message = payload.get("message")
-                killed = payload.get("killed")
-                print(f"💀 {killed} 가 밤에 사망함: {message}")
-                               
-                if killed == self.name:
-                    self.alive = False
-                if killed in self.known_agents:
-                    self.known_agents.remove(killed)
-                    
-                return "사망 처리 완료"
-
-            elif message_type == MessageType.GAME_RESULT.name:
-                print("🎉 게임 결과:", payload.get("message"))
-
-                # 게임 종료 시 콜백으로 서버 종료 요청
-                if hasattr(self, 'shutdown_callback'):
-                    print("🎮 게임 종료됨 - 서버 종료 콜백 실행")
-                    self.shutdown_callback()
-
-                return "게임 종료 확인"
+    @timed_llm
+    async def gemini_judge_batch(self, requests: list[JudgmentRequest]) -> list[bool]:
+        """
+        여러 (발신자, 발언) 쌍을 하나의 구조화된 프롬프트로 판단합니다.
 
-            else:
-                print(f"⚠️ 알 수 없는 메시지 타입: {message_type}")
-                return f"알 수 없는 메시지 타입입니다: {message_type}"
+        Returns:
+            list[bool]: 요청 순서대로 의심 여부 (True = 마피아로 의심)
+        """
+        if len(requests) == 1:
+            return [await self.judge_single(requests[0])]
+
+        kind_labels = {"message": "발언", "answer": "질문에 대한 답변"}
+        lines = [
+            f'[{i}] ({kind_labels.get(req.kind, req.kind)}) {req.sender}: "{req.text}"'
+            for i, req in enumerate(requests, start=1)
+        ]
+        prompt = f"""당신은 마피아 게임에서 사람들의 대화를 분석해 의심스러운 사람을 식별하는 인공지능입니다.
+        아래는 여러 참가자의 발언과 답변입니다:
+
+        {chr(10).join(lines)}
+
+        각 번호의 발언이 마피아처럼 거짓말하거나 회피하는 느낌이라면 true, 솔직하고 신뢰할 수 있다면 false로 판단하세요.
+        다른 설명 없이 JSON 객체로만 대답하세요. 예: {{"1": true, "2": false}}"""
+
+        response = await self.llm.generate(prompt, cache_version=JUDGE_BATCH_PROMPT_VERSION)
+        verdicts = self.parse_batch_verdicts(response, len(requests))
+
+        # 파싱되지 않은 항목만 개별 프롬프트로 다시 판단
+        for i, verdict in enumerate(verdicts):
+            if verdict is None:
+                verdicts[i] = await self.judge_single(requests[i])
+        return verdicts
+
+    async def judge_single(self, request: JudgmentRequest) -> bool:
+        if request.kind == "answer":
+            return await self.gemini_judge_answer(request.sender, request.text)
+        return await self.gemini_judge_message(request.sender, request.text)
+
+    @staticmethod
+    def parse_batch_verdicts(text: str, count: int) -> list[Optional[bool]]:
+        """LLM의 JSON 응답을 번호별 판정 목록으로 변환합니다. 누락된 항목은 None."""
+        verdicts: list[Optional[bool]] = [None] * count
+        start, end = text.find("{"), text.rfind("}")
+        if start < 0 or end <= start:
+            return verdicts
+        try:
+            data = json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            return verdicts
+
+        for key, value in data.items():
+            try:
+                index = int(key) - 1
+            except (TypeError, ValueError):
+                continue
+            if 0 <= index < count:
+                if isinstance(value, bool):
+                    verdicts[index] = value
+                elif isinstance(value, str) and value.strip().lower() in ("true", "false", "yes", "no"):
+                    verdicts[index] = value.strip().lower() in ("true", "yes")
+        return verdicts
+
+    def build_router(self) -> MessageRouter:
+        """메시지 유형별 핸들러를 등록합니다."""
+        router = MessageRouter()
+        router.register(MessageType.ROLE_ASSIGNMENT, self.on_role_assignment)
+        router.register(MessageType.INTRO_REQUEST, self.on_intro_request)
+        router.register(MessageType.INTRO_RESPONSE, self.on_intro_response)
+        router.register(MessageType.DAY_ACTION_REQUEST, self.on_day_action_request)
+        router.register(MessageType.QUESTION, self.on_question)
+        router.register(MessageType.QUESTION_RESPONSE, self.on_question_response)
+        router.register(MessageType.STATUS_REQUEST, self.on_status_request)
+        router.register(MessageType.VOTE_REQUEST, self.on_vote_request)
+        router.register(MessageType.NIGHT_ACTION_REQUEST, self.on_night_action_request)
+        router.register(MessageType.NIGHT_ACTION_RESULT, self.on_night_action_result)
+        router.register(MessageType.EXECUTION_RESULT, self.on_execution_result)
+        router.register(MessageType.KILLED_RESULT, self.on_killed_result)
+        router.register(MessageType.GAME_RESULT, self.on_game_result)
+        return router
+
+    async def handle_message(self, message: str, context_id: Optional[str] = None) -> str: 
+        # 형식 검증은 여기서 한 번만, 잘못된 메시지는 핸들러까지 가지 않음
+        try:
+            msg = parse_message(message)
+        except MessageValidationError as e:
+            error_msg = f"⚠️ 잘못된 메시지: {e}"
+            logger.warning(error_msg)
+            print(error_msg)
+            return error_msg
 
+        print(msg.type.name)
+        game = self.get_game(context_id)
+        try:
+            return await self.router.dispatch(msg, game, context_id)
+        except UnhandledMessageError as e:
+            print(f"⚠️ {e}")
+            return str(e)
         except Exception as e:
-            error_msg = f"⚠️ 메시지 파싱 실패: {e}"
+            error_msg = f"⚠️ {msg.type.name} 처리 실패: {e}"
             logger.error(error_msg, exc_info=True)
             print(error_msg)
             return error_msg
+
+    async def on_role_assignment(self, msg: RoleAssignment, game: MemberGameState, context_id: Optional[str]) -> str:
+        """역할 배정"""
+        game.role = msg.role
+        print(f"🧩 역할 부여됨: {game.role.name}")
+        return f"역할이 '{game.role.name}'로 설정되었습니다."
+
+    async def on_intro_request(self, msg: IntroRequest, game: MemberGameState, context_id: Optional[str]) -> str:
+        """자기소개 요청 → 다른 멤버들에게 자기소개 전송"""
+        if self.use_llm : 
+            text = await self.gemini_generate_intro(game.role) 
+        else : 
+            if game.role == Role.MAFIA:
+                text = f"안녕하세요, 저는 {self.name}입니다. 평범한 시민으로 이 게임을 즐기고 있어요. 잘 부탁드립니다!" 
+            elif game.role == Role.DETECTIVE:
+                text = f"안녕하세요, 저는 {self.name}입니다. 시민으로서 최선을 다할게요!"
+            else:
+                text = f"안녕하세요, 저는 {self.name}입니다. 모두와 협력해서 이기고 싶어요!" 
+        
+                       
+        # broadcast to all (동시 전송)
+        await self.executor.multicast(
+            game.known_agents,
+            create_broadcast(MessageType.INTRO_RESPONSE, self.name, text=text),
+            context_id=context_id,
+        )
+
+        # Manager에게는 간단히 이름만 응답
+        return f"저는 {self.name}입니다." 
+
+    async def on_intro_response(self, msg: IntroResponse, game: MemberGameState, context_id: Optional[str]) -> str:
+        """다른 멤버의 자기소개 → 의심 점수 갱신"""
+        message = msg.text
+        from_agent = msg.from_name
+        print(f"{from_agent} 메시지 : {message}")
+        game.dialog_history[from_agent].append(message)
+
+        if self.use_llm : 
+            is_suspicious = await self.judge_batcher.submit(
+                JudgmentRequest("message", from_agent, message))
+        else :  
+            # (단순 키워드 기반, 필요시 강화 가능)
+            is_suspicious = any(kw in message for kw in SUSPICIOUS_KEYWORDS)
+
+        
+        if is_suspicious:                   
+            if game.role == Role.MAFIA:
+                print(f"🤔 {from_agent}은 경찰/시민일 가능성이 높음 → 제거 후보")
+            else:
+                print(f"🤔 {from_agent}은 마피아일 가능성이 있음 → 질문 대상")
+            
+            self.update_suspicion_score(game, from_agent)
+                             
+        return f"{from_agent}으로부터 메시지 잘 받았습니다"
+
+    async def on_day_action_request(self, msg: DayActionRequest, game: MemberGameState, context_id: Optional[str]) -> str:
+        """낮 토론 → 가장 의심되는 멤버에게 질문"""
+        if not game.alive:
+            return "사망 상태이므로 행동 불가"
+
+        if not game.suspicion_scores  :
+            return "의심되는 대상 없음"
+
+        # 가장 의심되는 대상에게 질문 전송, 답변은 같은 요청의 스트리밍 응답으로 받음
+        target = max(game.suspicion_scores, key=game.suspicion_scores.get)
+        if self.executor:
+            message = create_chat_message(MessageType.QUESTION, self.name, target)
+            sent_at = time.perf_counter()
+            partial: list[str] = []
+            flagged = False
+
+            def on_partial(chunk: str):
+                # 답변이 끝나기 전에 도착한 부분부터 바로 검사
+                nonlocal flagged
+                if not partial:
+                    print(f"💬 {target}의 답변 수신 시작 ({time.perf_counter() - sent_at:.3f}s)")
+                partial.append(chunk)
+                if not flagged and any(kw in "".join(partial) for kw in SUSPICIOUS_KEYWORDS):
+                    flagged = True
+                    print(f"🤔 {target}의 답변 도중 의심스러운 표현 발견")
+                    self.update_suspicion_score(game, target)
+
+            response = await self.executor.send_to_other(target, message, context_id=context_id,
+                                                          on_partial=on_partial)
+            answer = response[0] if response else "".join(partial)
+            if answer:
+                await self.evaluate_answer(game, target, answer, flagged=flagged)
+
+        return f"{target}에게 질문 전송 완료"
+
+    async def on_question(self, msg: Question, game: MemberGameState, context_id: Optional[str]) -> str:
+        """다른 멤버의 질문에 답변"""
+        from_agent = msg.from_name
+        question = msg.message
+        game.dialog_history[from_agent].append(question)
+        print(f"❓ {from_agent}로부터 질문 받음: {question}")
+
+        # 역할에 따라 자연스러운 답변 생성
+        if self.use_llm : 
+            answer = await self.gemini_answer_question(question, game.role)
+        else : 
+            if game.role == Role.MAFIA:
+                answer = "그냥 제 생각일 뿐이에요. 의심하지 마세요. 😅"
+            elif game.role == Role.DETECTIVE:
+                answer = "저는 정의를 지키기 위해 행동할 뿐입니다."
+            else:
+                answer = "저는 그냥 평범한 시민이에요."
+
+        # 답변은 질문 요청의 응답으로 바로 전송 (LLM 답변은 생성되는 대로 스트리밍됨)
+        return answer
+
+    async def on_question_response(self, msg: QuestionResponse, game: MemberGameState, context_id: Optional[str]) -> str:
+        """질문에 대한 답변을 별도 메시지로 보내는 (이전 버전) 멤버의 답변 평가"""
+        await self.evaluate_answer(game, msg.from_name, msg.text)
+        return f"{msg.from_name}의 응답을 수신했습니다."
+
+    async def evaluate_answer(self, game: MemberGameState, from_agent: str, answer: str, flagged: bool = False):
+        """
+        질문에 대한 답변을 평가해 의심 점수를 조정합니다.
+
+        Args:
+            game: 게임 상태
+            from_agent: 답변한 멤버
+            answer: 전체 답변
+            flagged: 스트리밍 도중 이미 의심스러운 표현이 발견되었는지 여부
+        """
+        game.dialog_history[from_agent].append(answer)
+
+        print(f"💬 {from_agent}의 질문 응답 수신: {answer}")
+
+        # LLM으로 응답 평가 → 신뢰할 만한지 판단
+        if self.use_llm :
+            is_still_suspicious = await self.judge_batcher.submit(
+                JudgmentRequest("answer", from_agent, answer))
+        else :
+            # 자기소개와 같은 키워드 검사 (스트리밍되지 않은 답변은 flagged가 항상 False이므로 전체 답변도 검사)
+            is_still_suspicious = flagged or any(kw in answer for kw in SUSPICIOUS_KEYWORDS)
+
+        if not is_still_suspicious:
+            self.reduce_suspicion_score(game, from_agent)
+
+    async def on_status_request(self, msg: StatusRequest, game: MemberGameState, context_id: Optional[str]) -> str:
+        """진행 중인 대화 수 보고"""
+        # 이 STATUS_REQUEST 처리 자신은 제외하고, 아직 끝나지 않은 대화 수를 보고
+        inflight = self.executor.inflight(context_id) - 1 if self.executor else 0
+        return json.dumps({"inflight": max(0, inflight)})
+
+    async def on_vote_request(self, msg: VoteRequest, game: MemberGameState, context_id: Optional[str]) -> str:
+        """투표"""
+        print("📩 투표 요청을 받았습니다.")
+        return self.select_vote_target(game)
+
+    async def on_night_action_request(self, msg: NightActionRequest, game: MemberGameState, context_id: Optional[str]) -> str:
+        """밤 행동 (마피아: 제거 대상, 경찰: 조사 대상)"""
+        print("🌙 밤 행동 요청을 받았습니다.")
+        if not game.alive:
+            return ""
+        if msg.role == Role.MAFIA and game.role == Role.MAFIA:
+            return self.choose_night_target(game)
+        elif msg.role == Role.DETECTIVE and game.role == Role.DETECTIVE:
+            return self.choose_night_target(game)
+        else:
+            return ""
+
+    async def on_night_action_result(self, msg: NightActionResult, game: MemberGameState, context_id: Optional[str]) -> str:
+        """경찰 조사 결과"""
+        print(f"🌙 밤 행동 결과: {msg.message}")
+        
+        target = msg.target
+        is_mafia = msg.is_mafia
+        print(f"🔍 {self.name} 조사 결과: {target} → {'마피아' if is_mafia else '시민'}")
+
+        game.investigation_results[target] = is_mafia
+
+        return "조사 결과 확인"
+
+    async def on_execution_result(self, msg: ExecutionResult, game: MemberGameState, context_id: Optional[str]) -> str:
+        """투표 처형 결과"""
+        executed = msg.target
+        print(f"🔪 {executed} 가 투표로 처형됨: {msg.message}")
+
+        if executed == self.name:
+            game.alive = False             
+        # Known list에서 제거
+        if executed in game.known_agents:
+            game.known_agents.remove(executed)
+        return "처형 결과 확인"
+
+    async def on_killed_result(self, msg: KilledResult, game: MemberGameState, context_id: Optional[str]) -> str:
+        """밤 사망 결과"""
+        killed = msg.target
+        print(f"💀 {killed} 가 밤에 사망함: {msg.message}")
+                       
+        if killed == self.name:
+            game.alive = False
+        if killed in game.known_agents:
+            game.known_agents.remove(killed)
+            
+        return "사망 처리 완료"
+
+    async def on_game_result(self, msg: GameResult, game: MemberGameState, context_id: Optional[str]) -> str:
+        """게임 종료"""
+        print("🎉 게임 결과:", msg.message)
+        self.end_game(context_id)
+
+        # 진행 중인 게임이 더 없을 때만 콜백으로 서버 종료 요청 (같은 서버로 동시에 진행 중인 다른 게임 보호)
+        if hasattr(self, 'shutdown_callback') and not self.games:
+            print("🎮 모든 게임 종료됨 - 서버 종료 콜백 실행")
+            self.shutdown_callback()
+
+        return "게임 종료 확인"
+
     
-    def select_vote_target(self) -> str:
+    def select_vote_target(self, game: MemberGameState) -> str:
         
-        alive_candidates = [name for name in self.known_agents] 
+        alive_candidates = [name for name in game.known_agents] 
         if not alive_candidates:
             return self.name  # 자기 자신이라도 선택
 
         # 1. 마피아로 확정된 조사 결과가 있다면 그에게 투표
-        if self.role == Role.DETECTIVE:                
-            suspected_mafias = [name for name, is_mafia in self.investigation_results.items()
+        if game.role == Role.DETECTIVE:                
+            suspected_mafias = [name for name, is_mafia in game.investigation_results.items()
                                 if is_mafia and name in alive_candidates]
 
             if suspected_mafias:
@@ -337,9 +574,9 @@ class MemberAgent(BaseAgent):
                 return target
         
         # 2. 점수가 높은 순으로 정렬
-        if self.suspicion_scores:
+        if game.suspicion_scores:
             sorted_by_suspicion = sorted(
-                [(name, score) for name, score in self.suspicion_scores.items() if name in alive_candidates],
+                [(name, score) for name, score in game.suspicion_scores.items() if name in alive_candidates],
                 key=lambda x: x[1],
                 reverse=True
             )
@@ -350,25 +587,25 @@ class MemberAgent(BaseAgent):
                
         # 3. 없다면 무작위 생존자 중 선택
         choice = random.choice(alive_candidates)
-        self.vote_history.append(choice)
+        game.vote_history.append(choice)
         return choice
 
-    def choose_night_target(self) -> str:
+    def choose_night_target(self, game: MemberGameState) -> str:
         
-        if self.role == Role.VILLAGER:
+        if game.role == Role.VILLAGER:
             # 시민은 밤 행동이 없음
             return ""
         
         # 무작위로 살아있는 타겟 중 하나 선택
-        alive_candidates = [name for name in self.known_agents] 
+        alive_candidates = [name for name in game.known_agents] 
         if not alive_candidates:
             return self.name  # 자기 자신이라도 선택
 
 
         # 점수가 높은 순으로 정렬
-        if self.suspicion_scores:
+        if game.suspicion_scores:
             sorted_by_suspicion = sorted(
-                [(name, score) for name, score in self.suspicion_scores.items() if name in alive_candidates],
+                [(name, score) for name, score in game.suspicion_scores.items() if name in alive_candidates],
                 key=lambda x: x[1],
                 reverse=True
             )
@@ -385,17 +622,17 @@ class MemberAgent(BaseAgent):
             
     
     
-    def update_suspicion_score(self, name: str, increment: int = 1):
-        if name not in self.suspicion_scores:
-            self.suspicion_scores[name] = 0
-        self.suspicion_scores[name] += increment
-        print(f"⚠️ {name} 의심 점수 증가: {self.suspicion_scores[name]}")
+    def update_suspicion_score(self, game: MemberGameState, name: str, increment: int = 1):
+        if name not in game.suspicion_scores:
+            game.suspicion_scores[name] = 0
+        game.suspicion_scores[name] += increment
+        print(f"⚠️ {name} 의심 점수 증가: {game.suspicion_scores[name]}")
     
-    def reduce_suspicion_score(self, name: str, decrement: int = 1):
-        if name in self.suspicion_scores:
-            self.suspicion_scores[name] -= decrement
-            if self.suspicion_scores[name] <= 0:
+    def reduce_suspicion_score(self, game: MemberGameState, name: str, decrement: int = 1):
+        if name in game.suspicion_scores:
+            game.suspicion_scores[name] -= decrement
+            if game.suspicion_scores[name] <= 0:
                 print(f"✅ {name} 신뢰 회복됨 (의심 해제)")
-                del self.suspicion_scores[name]
+                del game.suspicion_scores[name]
             else:
-                print(f"ℹ️ {name} 의심 점수 감소: {self.suspicion_scores[name]}")
\ No newline at end of file
+                print(f"ℹ️ {name} 의심 점수 감소: {game.suspicion_scores[name]}")
\ No newline at end of file
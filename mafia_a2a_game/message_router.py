@@ -0,0 +1,105 @@
+import logging
+import time
+
+from dataclasses import dataclass
+from dataclasses import replace
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+
+from messages import GameMessage
+from messages import MessageType
+
+
+logger = logging.getLogger(__name__)
+
+# 핸들러: (검증된 메시지, *dispatch 인자) → 응답 텍스트
+Handler = Callable[..., Awaitable[str]]
+
+
+class UnhandledMessageError(LookupError):
+    """등록된 핸들러가 없는 메시지 유형."""
+
+    def __init__(self, message_type: MessageType):
+        self.message_type = message_type
+        super().__init__(f"알 수 없는 메시지 타입입니다: {message_type.name}")
+
+
+@dataclass(slots=True)
+class HandlerStats:
+    """핸들러 하나의 누적 호출 통계."""
+    calls: int = 0
+    errors: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ns / self.calls / 1e6 if self.calls else 0.0
+
+    @property
+    def max_ms(self) -> float:
+        return self.max_ns / 1e6
+
+
+class MessageRouter:
+    """
+    MessageType → 핸들러 등록부.
+
+    dispatch는 dict 조회 한 번으로 핸들러를 찾으므로 메시지 유형이 늘어나도 비용이 같고,
+    핸들러별 호출 수/오류 수/소요 시간을 자동으로 집계합니다.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[MessageType, Handler] = {}
+        self._stats: Dict[MessageType, HandlerStats] = {}
+
+    def register(self, message_type: MessageType, handler: Handler):
+        if message_type in self._handlers:
+            raise ValueError(f"{message_type.name} 핸들러가 이미 등록되어 있습니다.")
+        self._handlers[message_type] = handler
+        self._stats[message_type] = HandlerStats()
+
+    def route(self, message_type: MessageType) -> Callable[[Handler], Handler]:
+        """함수를 핸들러로 등록하는 데코레이터."""
+        def decorator(handler: Handler) -> Handler:
+            self.register(message_type, handler)
+            return handler
+        return decorator
+
+    def handles(self, message_type: MessageType) -> bool:
+        return message_type in self._handlers
+
+    async def dispatch(self, msg: GameMessage, *args: Any) -> str:
+        """
+        메시지 유형에 맞는 핸들러를 호출합니다.
+
+        Args:
+            msg: parse_message로 검증된 메시지
+            *args: 핸들러에 그대로 전달할 인자 (예: 게임 상태, context_id)
+
+        Raises:
+            UnhandledMessageError: 등록된 핸들러가 없는 경우
+        """
+        handler = self._handlers.get(msg.type)
+        if handler is None:
+            raise UnhandledMessageError(msg.type)
+
+        stats = self._stats[msg.type]
+        start = time.perf_counter_ns()
+        try:
+            return await handler(msg, *args)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            stats.calls += 1
+            stats.total_ns += elapsed
+            if elapsed > stats.max_ns:
+                stats.max_ns = elapsed
+
+    def stats(self) -> Dict[str, HandlerStats]:
+        """메시지 유형 이름 → 핸들러 통계 (복사본)."""
+        return {message_type.name: replace(stats) for message_type, stats in self._stats.items()}
@@ -1,8 +1,25 @@
 import json
 from enum import Enum, auto
+from typing import Callable
+from typing import ClassVar
 from typing import Dict
 from typing import Optional
+from dataclasses import dataclass
+from dataclasses import fields
+from dataclasses import replace
 
+from codec import COMPACT_VERSION
+from codec import JSON_VERSION
+from codec import SEPARATOR
+from codec import CodecError
+from codec import decode_frame
+from codec import encode_broadcast_frame
+from codec import encode_frame
+from codec import frame_tag
+from codec import is_compact
+
+# 압축 포맷은 enum 값을 type/role tag로 사용하므로, 항목의 순서를 바꾸거나 중간에 끼워 넣지 마세요.
+# (새 항목은 항상 끝에 추가하고, 기존 tag의 의미가 바뀌면 codec.COMPACT_VERSION을 올려야 합니다.)
 class Role(Enum):
     MAFIA = auto()
     DETECTIVE = auto()
@@ -22,115 +39,371 @@ class MessageType(Enum):
     GAME_RESULT = auto()
     QUESTION = auto()
     QUESTION_RESPONSE = auto()
+    STATUS_REQUEST = auto()
 
-def create_message(message_type: MessageType, from_name: str, to_name: str,
-                   round: Optional[int] = None,
-                   role: Optional[Role] = None,
-                   target: Optional[str] = None,
-                   is_mafia: Optional[bool] = None,
-                   winner: Optional[str] = None) -> str:
 
-    # 기본 payload 구조
-    payload = {
-        "from": from_name,
-        "to": to_name
-    }
+class MessageValidationError(ValueError):
+    """형식이 잘못되었거나 필수 필드가 빠진 메시지. 핸들러에 전달되기 전에 거부됩니다."""
+
+
+@dataclass(slots=True)
+class GameMessage:
+    """
+    모든 게임 메시지의 공통 필드. MessageType마다 하위 클래스가 하나씩 있습니다.
+    사람이 읽는 문구(message)는 필요할 때만 템플릿으로 만듭니다.
+    """
+    type: ClassVar[MessageType]
+    # 필드 이름 → 기존 JSON payload 키
+    payload_keys: ClassVar[Dict[str, str]] = {}
+
+    from_name: str
+    to_name: str
+
+    @property
+    def message(self) -> str:
+        return self.render()
+
+    def render(self) -> str:
+        return "❓ 정의되지 않은 메시지입니다."
 
-    # 메시지 유형별 처리
-    if message_type == MessageType.ROLE_ASSIGNMENT:
+    def validate(self):
+        """유형별 추가 검증. 문제가 있으면 MessageValidationError를 발생시킵니다."""
+
+    @property
+    def payload(self) -> dict:
+        """기존 JSON 포맷의 payload (JSON만 지원하는 피어에게 보낼 때 사용)."""
+        payload = {
+            "from": self.from_name,
+            "to": self.to_name,
+            "message": self.message,
+        }
+        for name, key in self.payload_keys.items():
+            if key == "message":
+                continue
+            value = getattr(self, name)
+            payload[key] = value.name if isinstance(value, Role) else value
+        return payload
+
+
+@dataclass(slots=True)
+class RoleAssignment(GameMessage):
+    type: ClassVar[MessageType] = MessageType.ROLE_ASSIGNMENT
+    payload_keys: ClassVar[Dict[str, str]] = {"role": "role"}
+    role: Role
+
+    def render(self) -> str:
         role_messages = {
             Role.MAFIA: "😈 당신은 마피아입니다. 밤마다 한 명을 제거할 수 있습니다.",
             Role.DETECTIVE: "🕵️ 당신은 경찰입니다. 밤마다 한 명의 정체를 확인할 수 있습니다.",
             Role.VILLAGER: "👨‍🌾 당신은 시민입니다. 토론을 통해 마피아를 찾아내세요."
         }
-        payload.update({
-            "message": role_messages[role],
-            "role": role.name
-        })
+        return role_messages[self.role]
+
+
+@dataclass(slots=True)
+class IntroRequest(GameMessage):
+    type: ClassVar[MessageType] = MessageType.INTRO_REQUEST
+
+    def render(self) -> str:
+        return "🌞 첫째날 낮이 되었습니다. 모두 자기소개를 해주세요."
+
+
+@dataclass(slots=True)
+class IntroResponse(GameMessage):
+    type: ClassVar[MessageType] = MessageType.INTRO_RESPONSE
+    payload_keys: ClassVar[Dict[str, str]] = {"text": "message"}
+    text: str
 
-    elif message_type == MessageType.INTRO_REQUEST:
-        payload["message"] = "🌞 첫째날 낮이 되었습니다. 모두 자기소개를 해주세요."
+    def render(self) -> str:
+        return f"{self.text}"
 
-    elif message_type == MessageType.DAY_ACTION_REQUEST:
-        payload["message"] = "🌞 낮이 되었습니다. 자유롭게 토론하고, 누가 의심스러운지 누가 마피아인지 후보를 선정해주세요.."
 
-    elif message_type == MessageType.VOTE_REQUEST:
-        payload["message"] = "🗳️ 누구를 처형할지 투표해주세요. 살아있는 에이전트 이름 중에서 선택하세요."
+@dataclass(slots=True)
+class DayActionRequest(GameMessage):
+    type: ClassVar[MessageType] = MessageType.DAY_ACTION_REQUEST
 
-    elif message_type == MessageType.EXECUTION_RESULT:
-        payload.update({
-            "message": f"🔪 {target} 가 투표로 처형되었습니다.",
-            "executed": target
-        })
+    def render(self) -> str:
+        return "🌞 낮이 되었습니다. 자유롭게 토론하고, 누가 의심스러운지 누가 마피아인지 후보를 선정해주세요.."
 
-    elif message_type == MessageType.KILLED_RESULT:
-        payload.update({
-            "message": f"💀 밤 사이 {target} 가 사망했습니다.",
-            "killed": target
-        })
 
-    elif message_type == MessageType.NIGHT_ACTION_REQUEST:
+@dataclass(slots=True)
+class VoteRequest(GameMessage):
+    type: ClassVar[MessageType] = MessageType.VOTE_REQUEST
+
+    def render(self) -> str:
+        return "🗳️ 누구를 처형할지 투표해주세요. 살아있는 에이전트 이름 중에서 선택하세요."
+
+
+@dataclass(slots=True)
+class VoteResponse(GameMessage):
+    type: ClassVar[MessageType] = MessageType.VOTE_RESPONSE
+
+
+@dataclass(slots=True)
+class ExecutionResult(GameMessage):
+    type: ClassVar[MessageType] = MessageType.EXECUTION_RESULT
+    payload_keys: ClassVar[Dict[str, str]] = {"target": "executed"}
+    target: str
+
+    def render(self) -> str:
+        return f"🔪 {self.target} 가 투표로 처형되었습니다."
+
+
+@dataclass(slots=True)
+class KilledResult(GameMessage):
+    type: ClassVar[MessageType] = MessageType.KILLED_RESULT
+    payload_keys: ClassVar[Dict[str, str]] = {"target": "killed"}
+    target: str
+
+    def render(self) -> str:
+        return f"💀 밤 사이 {self.target} 가 사망했습니다."
+
+
+@dataclass(slots=True)
+class NightActionRequest(GameMessage):
+    type: ClassVar[MessageType] = MessageType.NIGHT_ACTION_REQUEST
+    payload_keys: ClassVar[Dict[str, str]] = {"role": "role"}
+    role: Role
+
+    def render(self) -> str:
         role_messages = {
             Role.MAFIA: "밤입니다. 제거할 대상을 선택하세요.",
             Role.DETECTIVE: "밤입니다. 조사할 대상을 선택하세요."
         }
-        payload.update({
-            "message": role_messages[role],
-            "role": role.name
-        })
-
-    elif message_type == MessageType.NIGHT_ACTION_RESULT:
-        payload.update({
-            "message": f"🔍 당신이 조사한 {target} 은(는) {'마피아' if is_mafia else '시민'}입니다.",
-            "target": target,
-            "is_mafia": is_mafia
-        })
-
-    elif message_type == MessageType.GAME_RESULT:
-        payload.update({
-            "message": f"🏁 게임 종료! 승리 팀: {winner}",
-            "winner": winner
-        })
-
-    else:
-        payload["message"] = "❓ 정의되지 않은 메시지입니다."
+        return role_messages[self.role]
+
+    def validate(self):
+        if self.role not in (Role.MAFIA, Role.DETECTIVE):
+            raise MessageValidationError(f"밤 행동이 없는 역할입니다: {self.role.name}")
+
+
+@dataclass(slots=True)
+class NightActionResult(GameMessage):
+    type: ClassVar[MessageType] = MessageType.NIGHT_ACTION_RESULT
+    payload_keys: ClassVar[Dict[str, str]] = {"target": "target", "is_mafia": "is_mafia"}
+    target: str
+    is_mafia: bool
+
+    def render(self) -> str:
+        return f"🔍 당신이 조사한 {self.target} 은(는) {'마피아' if self.is_mafia else '시민'}입니다."
+
+
+@dataclass(slots=True)
+class GameResult(GameMessage):
+    type: ClassVar[MessageType] = MessageType.GAME_RESULT
+    payload_keys: ClassVar[Dict[str, str]] = {"winner": "winner"}
+    winner: str
+
+    def render(self) -> str:
+        return f"🏁 게임 종료! 승리 팀: {self.winner}"
+
+
+@dataclass(slots=True)
+class Question(GameMessage):
+    type: ClassVar[MessageType] = MessageType.QUESTION
 
+    def render(self) -> str:
+        return f"{self.to_name}, 방금 메시지가 이상해 보여요. 설명해주세요."
+
+
+@dataclass(slots=True)
+class QuestionResponse(GameMessage):
+    type: ClassVar[MessageType] = MessageType.QUESTION_RESPONSE
+    payload_keys: ClassVar[Dict[str, str]] = {"text": "message"}
+    text: str
+
+    def render(self) -> str:
+        return f"{self.text}"
+
+
+@dataclass(slots=True)
+class StatusRequest(GameMessage):
+    type: ClassVar[MessageType] = MessageType.STATUS_REQUEST
+
+    def render(self) -> str:
+        return "📊 현재 처리 중인 대화 수를 알려주세요."
+
+
+MESSAGE_CLASSES: Dict[MessageType, type[GameMessage]] = {
+    cls.type: cls for cls in (
+        RoleAssignment, IntroRequest, IntroResponse, DayActionRequest, VoteRequest, VoteResponse,
+        ExecutionResult, KilledResult, NightActionRequest, NightActionResult, GameResult,
+        Question, QuestionResponse, StatusRequest,
+    )
+}
+assert set(MESSAGE_CLASSES) == set(MessageType), "모든 MessageType에 메시지 클래스가 있어야 합니다."
+
+# 메시지 유형별로 압축 포맷에 싣는 필드 (클래스 필드 순서, 자유 텍스트는 항상 마지막)
+MESSAGE_FIELDS: Dict[MessageType, tuple[str, ...]] = {
+    message_type: tuple(f.name for f in fields(cls) if f.name not in ("from_name", "to_name"))
+    for message_type, cls in MESSAGE_CLASSES.items()
+}
+
+_CLASSES_BY_TAG = {message_type.value: cls for message_type, cls in MESSAGE_CLASSES.items()}
+_ROLES_BY_TAG = {role.value: role for role in Role}
+_ARG_COUNTS = {message_type.value: len(names) for message_type, names in MESSAGE_FIELDS.items()}
+
+
+def build_message(message_type: MessageType, from_name: str, to_name: str, **values) -> GameMessage:
+    """유형에 맞는 메시지 객체를 만듭니다. 해당 유형에 없는 필드는 무시합니다."""
+    names = MESSAGE_FIELDS[message_type]
+    return MESSAGE_CLASSES[message_type](from_name, to_name, **{name: values.get(name) for name in names})
+
+
+def _field_args(msg: GameMessage) -> list[str]:
+    args = []
+    for name in MESSAGE_FIELDS[msg.type]:
+        value = getattr(msg, name)
+        if value is None:
+            args.append("")
+        elif name == "role":
+            args.append(str(value.value))
+        elif name == "is_mafia":
+            args.append("1" if value else "0")
+        else:
+            args.append(str(value))
+    return args
+
+
+def encode_message(msg: GameMessage, version: int = COMPACT_VERSION) -> str:
+    """
+    메시지를 지정한 코덱 버전으로 인코딩합니다.
+    압축 포맷으로 표현할 수 없는 경우(이름에 구분자 포함 등)에는 JSON으로 대체합니다.
+    """
+    if version >= COMPACT_VERSION:
+        try:
+            return encode_frame(msg.type.value, msg.from_name, msg.to_name, _field_args(msg))
+        except CodecError:
+            pass
     return json.dumps({
-        "type": message_type.name,
-        "payload": payload
+        "type": msg.type.name,
+        "payload": msg.payload
     })
 
 
+def _compact_value(name: str, raw: str):
+    if name == "text":
+        return raw
+    if name == "role":
+        return _ROLES_BY_TAG[int(raw)]
+    if name == "is_mafia":
+        if raw not in ("0", "1"):
+            raise MessageValidationError(f"is_mafia 값이 잘못되었습니다: {raw!r}")
+        return raw == "1"
+    if not raw:
+        raise MessageValidationError(f"'{name}' 필드가 비어 있습니다.")
+    return raw
+
+
+def _json_value(name: str, raw):
+    if name == "role":
+        return Role[raw]
+    if name == "is_mafia":
+        if not isinstance(raw, bool):
+            raise MessageValidationError(f"is_mafia 값이 잘못되었습니다: {raw!r}")
+        return raw
+    if not isinstance(raw, str) or (name != "text" and not raw):
+        raise MessageValidationError(f"'{name}' 필드가 없거나 잘못되었습니다: {raw!r}")
+    return raw
+
+
+def parse_message(text: str) -> GameMessage:
+    """
+    압축 포맷과 JSON 포맷을 모두 해석하고, 핸들러에 넘기기 전에 한 번만 검증합니다.
+
+    Raises:
+        MessageValidationError: 해석할 수 없거나 필수 필드가 잘못된 메시지
+    """
+    try:
+        if is_compact(text):
+            tag, from_name, to_name, args = decode_frame(text, _ARG_COUNTS)
+            cls = _CLASSES_BY_TAG[tag]
+            names = MESSAGE_FIELDS[cls.type]
+            if len(args) != len(names):
+                raise MessageValidationError(f"{cls.type.name} 필드 수가 맞지 않습니다: {len(args)}/{len(names)}")
+            values = [_compact_value(name, arg) for name, arg in zip(names, args)]
+        else:
+            data = json.loads(text)
+            cls = MESSAGE_CLASSES[MessageType[data["type"]]]
+            payload = data.get("payload", {})
+            from_name, to_name = payload.get("from"), payload.get("to")
+            values = [_json_value(name, payload.get(cls.payload_keys[name])) for name in MESSAGE_FIELDS[cls.type]]
+
+        if not isinstance(from_name, str) or not from_name or not isinstance(to_name, str):
+            raise MessageValidationError(f"발신자/수신자가 잘못되었습니다: {from_name!r} → {to_name!r}")
+        msg = cls(from_name, to_name, *values)
+        msg.validate()
+        return msg
+
+    except MessageValidationError:
+        raise
+    except (CodecError, KeyError, TypeError, ValueError, AttributeError) as e:
+        # json.JSONDecodeError도 ValueError
+        raise MessageValidationError(f"메시지를 해석할 수 없습니다: {e!r}") from e
+
+
+def peek_message_type(text: str) -> str:
+    """
+    메시지 전체를 해석하지 않고 유형 이름만 읽습니다. (지표 레이블용)
+
+    Returns:
+        str: MessageType 이름, 알 수 없으면 "UNKNOWN"
+    """
+    try:
+        if is_compact(text):
+            return MessageType(frame_tag(text)).name
+        return MessageType[json.loads(text)["type"]].name
+    except (KeyError, TypeError, ValueError):
+        return "UNKNOWN"
+
+
+def downgrade_message(text: str, version: int) -> str:
+    """압축 포맷 메시지를 피어가 지원하는 버전으로 바꿉니다. 이미 해당 버전이면 그대로 반환합니다."""
+    if version >= COMPACT_VERSION or not is_compact(text):
+        return text
+    return encode_message(parse_message(text), JSON_VERSION)
+
+
+def create_message(message_type: MessageType, from_name: str, to_name: str,
+                   round: Optional[int] = None,
+                   role: Optional[Role] = None,
+                   target: Optional[str] = None,
+                   is_mafia: Optional[bool] = None,
+                   winner: Optional[str] = None,
+                   version: int = COMPACT_VERSION) -> str:
+
+    msg = build_message(message_type, from_name, to_name,
+                        role=role, target=target, is_mafia=is_mafia, winner=winner)
+    return encode_message(msg, version)
+
 
 def create_chat_message(message_type: MessageType, from_name: str, to_name: str,
-                    text: Optional[str] = None   ) -> str:
-
-    # 기본 payload 구조
-    payload = {
-        "from": from_name,
-        "to": to_name
-    }
-
-    # 메시지 유형별 처리
-    if message_type == MessageType.INTRO_RESPONSE:
-        payload.update({
-            "message": f"{text}"
-        })
-    elif message_type == MessageType.QUESTION:
-        payload.update({
-            "message": f"{to_name}, 방금 메시지가 이상해 보여요. 설명해주세요."
-        })
-    elif message_type == MessageType.QUESTION_RESPONSE:
-        payload.update({
-            "message": f"{text}"
-        })
-
-    else:
-        payload["message"] = "❓ 정의되지 않은 메시지입니다."
+                    text: Optional[str] = None,
+                    version: int = COMPACT_VERSION) -> str:
 
-    return json.dumps({
-        "type": message_type.name,
-        "payload": payload
-    })
+    msg = build_message(message_type, from_name, to_name, text=text)
+    return encode_message(msg, version)
+
+
+def create_broadcast(message_type: MessageType, from_name: str,
+                     role: Optional[Role] = None,
+                     target: Optional[str] = None,
+                     is_mafia: Optional[bool] = None,
+                     winner: Optional[str] = None,
+                     text: Optional[str] = None) -> Callable[[str], str]:
+    """
+    수신자만 다른 메시지를 만드는 함수를 반환합니다. (executor.multicast에 그대로 전달)
+    본문은 한 번만 인코딩하고 수신자마다 이름만 이어 붙입니다.
+    """
+    msg = build_message(message_type, from_name, "",
+                        role=role, target=target, is_mafia=is_mafia, winner=winner, text=text)
+    try:
+        head, tail = encode_broadcast_frame(message_type.value, from_name, _field_args(msg))
+    except CodecError:
+        head = tail = None
 
- 
\ No newline at end of file
+    def render(to_name: str) -> str:
+        if head is None or SEPARATOR in to_name:
+            return encode_message(replace(msg, to_name=to_name), JSON_VERSION)
+        return head + to_name + tail
+    return render
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import math
+import random
+
+from collections import Counter
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+from a2a_core.call_policy import deadline_scope
+from messages import MessageType
+from messages import Role
+from messages import create_message
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NightPolicy:
+    """밤 행동 요청의 역할별 응답 기한과 마피아 제거 결정 규칙."""
+    mafia_deadline: float = 10.0
+    detective_deadline: float = 10.0
+    # 살아 있는 마피아 중 기한 안에 유효한 대상을 보내야 하는 비율 (0이면 한 명만 응답해도 결정)
+    mafia_quorum: float = 0.0
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> "NightPolicy":
+        config = config or {}
+        return cls(
+            mafia_deadline=config.get("nightMafiaDeadline", cls.mafia_deadline),
+            detective_deadline=config.get("nightDetectiveDeadline", cls.detective_deadline),
+            mafia_quorum=config.get("nightMafiaQuorum", cls.mafia_quorum),
+        )
+
+    def required_votes(self, mafia_count: int) -> int:
+        return max(1, math.ceil(self.mafia_quorum * mafia_count))
+
+
+@dataclass
+class NightActions:
+    """밤 한 번의 결과."""
+    mafia_targets: Dict[str, str] = field(default_factory=dict)      # 마피아 → 선택한 대상 (기한 안에 도착한 것만)
+    missing_mafia: list[str] = field(default_factory=list)            # 기한 안에 응답하지 않은 마피아
+    detective_results: Dict[str, tuple[str, bool]] = field(default_factory=dict)  # 경찰 → (대상, 마피아 여부)
+    killed: Optional[str] = None
+
+
+def decide_kill(targets: Dict[str, str], candidates: set[str], required: int) -> Optional[str]:
+    """
+    도착한 마피아 선택을 집계해 제거 대상을 정합니다.
+
+    Args:
+        targets: 마피아 → 선택한 대상
+        candidates: 제거할 수 있는 (살아 있는) 에이전트
+        required: 결정에 필요한 최소 유효 표 수 (quorum)
+
+    Returns:
+        str | None: 최다 득표 대상 (동률이면 무작위), 유효 표가 quorum보다 적으면 None
+    """
+    votes = Counter(target for target in targets.values() if target in candidates)
+    if sum(votes.values()) < required:
+        return None
+    max_votes = max(votes.values())
+    return random.choice([name for name, count in votes.items() if count == max_votes])
+
+
+class NightPhase:
+    """
+    살아 있는 마피아와 경찰에게 밤 행동을 동시에 요청합니다.
+
+    - 마피아: mafia_deadline까지 도착한 선택만 집계하고, 늦은 요청은 취소합니다.
+    - 경찰: 응답이 오는 즉시 조사 결과를 계산해 바로 전달합니다 (제거 발표를 기다리지 않음).
+    밤 전체 시간은 응답 시간의 합이 아니라 역할별 기한으로 제한됩니다.
+    """
+
+    def __init__(self, executor, manager_name: str, agent_info: Dict[str, Any],
+                 context_id: Optional[str], policy: NightPolicy):
+        """
+        Args:
+            executor: 메시지를 보낼 GenericAgentExecutor
+            manager_name: 발신자 (매니저) 이름
+            agent_info: 에이전트 이름 → 상태 (role, alive), 제거된 에이전트는 alive=False로 바뀜
+            context_id: 게임 context_id
+            policy: 역할별 기한과 quorum
+        """
+        self.executor = executor
+        self.manager_name = manager_name
+        self.agent_info = agent_info
+        self.context_id = context_id
+        self.policy = policy
+
+    def alive_with_role(self, role: Role) -> list[str]:
+        # circuit이 열린 에이전트는 기한을 기다려도 응답하지 않으므로 제외
+        return [name for name, status in self.agent_info.items()
+                if status.alive and status.role == role and self.executor.reachable(name)]
+
+    async def request_action(self, agent_name: str, role: Role, deadline: float) -> Optional[str]:
+        message = create_message(MessageType.NIGHT_ACTION_REQUEST, self.manager_name, agent_name, role=role)
+        # 기한은 멤버에게도 전달되어, 멤버가 처리 중 보내는 메시지(LLM 호출 등)도 같은 기한을 따름
+        with deadline_scope(deadline):
+            response = await asyncio.wait_for(
+                self.executor.send_to_other(agent_name, message, context_id=self.context_id),
+                timeout=deadline,
+            )
+        return response[0] if response else None
+
+    async def ask_mafia(self, agent_name: str) -> Optional[str]:
+        try:
+            target = await self.request_action(agent_name, Role.MAFIA, self.policy.mafia_deadline)
+        except asyncio.TimeoutError:
+            print(f"⏰ 마피아 {agent_name} 응답 시간 초과 ({self.policy.mafia_deadline}s)")
+            return None
+        except Exception as e:
+            print(f"❌ 마피아 행동 실패: {e}")
+            return None
+        if target:
+            print(f"🧟‍♂️ {agent_name} → {target}")
+        return target
+
+    async def investigate(self, agent_name: str, actions: NightActions):
+        try:
+            target = await self.request_action(agent_name, Role.DETECTIVE, self.policy.detective_deadline)
+        except asyncio.TimeoutError:
+            print(f"⏰ 경찰 {agent_name} 응답 시간 초과 ({self.policy.detective_deadline}s)")
+            return
+        except Exception as e:
+            print(f"❌ 경찰 행동 실패: {e}")
+            return
+        if not target:
+            return
+
+        status = self.agent_info.get(target)
+        is_mafia = status is not None and status.role == Role.MAFIA
+        actions.detective_results[agent_name] = (target, is_mafia)
+        print(f"🕵️ {agent_name} → {target} is {'MAFIA' if is_mafia else 'NOT MAFIA'}")
+
+        # 조사 결과는 계산되는 즉시 전달
+        try:
+            message = create_message(MessageType.NIGHT_ACTION_RESULT, self.manager_name, agent_name,
+                                     target=target, is_mafia=is_mafia)
+            await self.executor.send_to_other(agent_name, message, context_id=self.context_id)
+        except Exception as e:
+            print(f"❌ 경찰 결과 전송 실패: {e}")
+
+    async def run(self, announce_kill: Callable[[str], Awaitable[Any]]) -> NightActions:
+        """
+        밤 행동을 진행합니다.
+
+        Args:
+            announce_kill: 제거 대상이 정해지면 (alive=False로 바꾼 뒤) 호출되는 발표 함수
+
+        Returns:
+            NightActions: 집계 결과
+        """
+        actions = NightActions()
+        mafia = self.alive_with_role(Role.MAFIA)
+        candidates = {name for name, status in self.agent_info.items() if status.alive}
+
+        detective_tasks = [
+            asyncio.create_task(self.investigate(name, actions))
+            for name in self.alive_with_role(Role.DETECTIVE)
+        ]
+        mafia_tasks = {asyncio.create_task(self.ask_mafia(name)): name for name in mafia}
+
+        try:
+            if mafia_tasks:
+                # 개별 요청이 각자 기한을 가지므로 모든 마피아 요청은 mafia_deadline 안에 끝남
+                for task, name in mafia_tasks.items():
+                    target = await task
+                    if target:
+                        actions.mafia_targets[name] = target
+                    else:
+                        actions.missing_mafia.append(name)
+
+            required = self.policy.required_votes(len(mafia))
+            actions.killed = decide_kill(actions.mafia_targets, candidates, required) if mafia else None
+            if actions.killed:
+                self.agent_info[actions.killed].alive = False
+                await announce_kill(actions.killed)
+            elif mafia:
+                print(f"😴 마피아가 아무도 제거하지 않았습니다. "
+                      f"(응답 {len(actions.mafia_targets)}/{len(mafia)}, 필요 {required})")
+            else:
+                print("😴 마피아가 아무도 제거하지 않았습니다.")
+
+            await asyncio.gather(*detective_tasks)
+        finally:
+            for task in [*mafia_tasks, *detective_tasks]:
+                if not task.done():
+                    task.cancel()
+        return actions
@@ -0,0 +1,220 @@
+import argparse
+import contextlib
+import math
+import os
+import random
+import sys
+import time
+
+import asyncio
+
+from collections import Counter
+from dataclasses import dataclass
+
+from agent_factory import build_agent_card
+from agent_factory import get_agent
+from a2a_core.a2a_client import A2AServerEntry
+from a2a_core.a2a_client import LoopbackHub
+from a2a_core.server_executor import GenericAgentExecutor
+from manager_agent import ManagerAgent
+from messages import Role
+
+
+MANAGER_AGENT_NAME = "Manager Agent"
+
+
+@dataclass
+class GameRecord:
+    """시뮬레이션 게임 한 판의 결과."""
+    winner: str | None
+    duration: float
+    roles: dict[str, Role]
+
+
+def make_roster(num_players: int, llm: dict | None = None) -> list[dict]:
+    """
+    Manager와 num_players명의 멤버 설정을 생성합니다.
+
+    Args:
+        num_players: 멤버 수
+        llm: 멤버가 사용할 LLM 설정 (예: {"backend": "fake", "latency": "lognormal:800,0.6"}),
+             None이면 규칙 기반(use_llm=False) 멤버
+    """
+    configs = [{
+        "name": MANAGER_AGENT_NAME,
+        "description": "Manager",
+        "host": "loopback",
+        "port": 20000,
+        "version": "1.0.0",
+        "capabilities": {"streaming": False},
+    }]
+    for i in range(1, num_players + 1):
+        configs.append({
+            "name": f"Player{i:03d} Agent",
+            "description": f"Member{i}",
+            "host": "loopback",
+            "port": 20000 + i,
+            "version": "1.0.0",
+            "capabilities": {"streaming": False},
+            "useLlm": llm is not None,
+            "llm": llm,
+            # 부하 측정이 이전 실행의 캐시 결과에 영향받지 않도록 공유 캐시는 끔
+            "llmCache": False,
+        })
+    return configs
+
+
+def build_simulated_table(roster: list[dict]) -> ManagerAgent:
+    """
+    HTTP 서버 없이 LoopbackHub로 연결된 게임 테이블 하나를 생성합니다.
+    게임 상태는 context_id 별로 분리되므로 한 테이블에서 여러 게임을 동시에 진행할 수 있습니다.
+
+    Returns:
+        ManagerAgent: 초기화가 끝난 매니저
+    """
+    hub = LoopbackHub()
+    entries = [
+        A2AServerEntry(name=config["name"], url=f"http://{config['host']}:{config['port']}/")
+        for config in roster
+    ]
+
+    manager = None
+    for config in roster:
+        card = build_agent_card(config)
+        others = [entry for entry in entries if entry.name != config["name"]]
+        executor = GenericAgentExecutor(agent=get_agent(card, config),
+                                        remote_agent_entries=others,
+                                        loopback=hub)
+        hub.register(card, executor)
+        if isinstance(executor.agent, ManagerAgent):
+            manager = executor.agent
+
+    # 시뮬레이션에서는 대화 종료 감지(STATUS_REQUEST polling) 없이 바로 다음 단계로 진행
+    manager.discussion_max_wait = 0
+    return manager
+
+
+async def play_game(manager: ManagerAgent) -> GameRecord:
+    start = time.perf_counter()
+    session = await manager.run_game_loop()
+    duration = time.perf_counter() - start
+    roles = {name: status.role for name, status in session.agent_info.items()}
+    return GameRecord(winner=session.winner, duration=duration, roles=roles)
+
+
+async def simulate(num_games: int, num_players: int, seed: int | None = None,
+                   concurrency: int = 1, llm: dict | None = None) -> tuple[list[GameRecord], float]:
+    """
+    규칙 기반 멤버로 게임을 num_games판 실행합니다.
+
+    Args:
+        num_games: 실행할 게임 수
+        num_players: 테이블당 멤버 수 (Manager 제외)
+        seed: 난수 시드 (concurrency=1일 때만 게임 순서까지 재현됨)
+        concurrency: 동시에 진행할 게임 수
+        llm: 멤버 LLM 설정 (make_roster 참고), None이면 규칙 기반 멤버
+
+    Returns:
+        (게임별 결과 목록, 전체 소요 시간)
+    """
+    if seed is not None:
+        random.seed(seed)
+
+    # 모든 게임이 같은 에이전트들을 공유 (게임은 context_id로 구분)
+    manager = build_simulated_table(make_roster(num_players, llm))
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one() -> GameRecord:
+        async with semaphore:
+            return await play_game(manager)
+
+    start = time.perf_counter()
+    if concurrency <= 1:
+        records = [await play_game(manager) for _ in range(num_games)]
+    else:
+        records = await asyncio.gather(*(run_one() for _ in range(num_games)))
+    return list(records), time.perf_counter() - start
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """nearest-rank 방식의 백분위수."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def report(records: list[GameRecord], elapsed: float) -> dict:
+    """games/sec, 게임 소요 시간 p50/p99, 역할별 승률을 계산합니다."""
+    durations = [record.duration for record in records]
+    winners = Counter(record.winner for record in records)
+
+    role_games: Counter = Counter()
+    role_wins: Counter = Counter()
+    for record in records:
+        for role in set(record.roles.values()):
+            role_games[role.name] += 1
+            team = "MAFIA" if role == Role.MAFIA else "CITIZENS"
+            if record.winner == team:
+                role_wins[role.name] += 1
+
+    return {
+        "games": len(records),
+        "elapsed_sec": elapsed,
+        "games_per_sec": len(records) / elapsed if elapsed > 0 else 0.0,
+        "duration_p50_ms": percentile(durations, 50) * 1000,
+        "duration_p99_ms": percentile(durations, 99) * 1000,
+        "team_win_rate": {team: count / len(records) for team, count in winners.items()},
+        "role_win_rate": {role: role_wins[role] / role_games[role] for role in role_games},
+    }
+
+
+def print_report(summary: dict):
+    print(f"🎲 games        : {summary['games']}")
+    print(f"⏱️ elapsed      : {summary['elapsed_sec']:.3f}s")
+    print(f"🚀 games/sec    : {summary['games_per_sec']:.1f}")
+    print(f"📈 duration p50 : {summary['duration_p50_ms']:.2f}ms")
+    print(f"📈 duration p99 : {summary['duration_p99_ms']:.2f}ms")
+    for team, rate in sorted(summary["team_win_rate"].items(), key=lambda x: str(x[0])):
+        print(f"🏁 {team} 승률 : {rate:.1%}")
+    for role, rate in sorted(summary["role_win_rate"].items()):
+        print(f"🧩 {role} 승률 : {rate:.1%}")
+
+
+async def main(args: argparse.Namespace):
+    llm = None
+    if args.fake_llm:
+        llm = {"backend": "fake", "latency": args.fake_llm, "rateLimit": args.llm_rate_limit, "seed": args.seed}
+        if args.fake_llm_url:
+            llm["url"] = args.fake_llm_url
+
+    # 에이전트들의 print 출력은 처리량을 떨어뜨리므로 기본적으로 버림
+    with open(os.devnull, "w") as devnull:
+        redirect = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(devnull)
+        with redirect:
+            records, elapsed = await simulate(args.games, args.players, args.seed, args.concurrency, llm)
+
+    print(f"👥 players={args.players}, seed={args.seed}, concurrency={args.concurrency}, "
+          f"llm={args.fake_llm or 'rule-based'}")
+    print_report(report(records, elapsed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="규칙 기반 멤버로 마피아 게임을 대량 시뮬레이션합니다.")
+    parser.add_argument("--games", type=int, default=100, help="실행할 게임 수")
+    parser.add_argument("--players", type=int, default=5, help="테이블당 멤버 수 (Manager 제외)")
+    parser.add_argument("--seed", type=int, default=None, help="난수 시드")
+    parser.add_argument("--concurrency", type=int, default=1, help="동시에 진행할 게임 수")
+    parser.add_argument("--verbose", action="store_true", help="에이전트 로그 출력")
+    parser.add_argument("--fake-llm", metavar="LATENCY",
+                        help="규칙 기반 대신 가짜 LLM 멤버 사용 (fixed:<ms> | lognormal:<ms>,<sigma> | histogram:<file>)")
+    parser.add_argument("--fake-llm-url", help="in-process 대신 사용할 fake_llm 서버 주소 (지연/429는 서버 설정을 따름)")
+    parser.add_argument("--llm-rate-limit", type=float, default=0.0, help="가짜 LLM이 429로 거부할 호출 비율")
+    args = parser.parse_args()
+
+    if args.players < 3:
+        print("❌ 플레이어 수는 3명 이상이어야 합니다.")
+        sys.exit(1)
+
+    asyncio.run(main(args))
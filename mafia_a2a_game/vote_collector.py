@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+
+from collections import Counter
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+from a2a_core.call_policy import deadline_scope
+from a2a_core.metrics import VOTES_TOTAL
+
+
+logger = logging.getLogger(__name__)
+
+# 투표 단계가 끝난 뒤에도 늦은 투표를 기록하기 위해 남겨 둔 요청 (GC 방지)
+_stragglers: set[asyncio.Task] = set()
+
+
+@dataclass
+class VoteResult:
+    """투표 한 번의 결과."""
+    votes: Dict[str, str] = field(default_factory=dict)       # 집계된 표 (단계가 끝나기 전에 도착)
+    missing: list[str] = field(default_factory=list)          # 응답이 없거나 실패한 투표자
+    late_votes: Dict[str, str] = field(default_factory=dict)  # 단계가 끝난 뒤 도착한 표 (분석용, 나중에 채워짐)
+    decided_early: bool = False   # 남은 표와 관계없이 결과가 정해져 일찍 끝났는지
+    timed_out: bool = False       # 기한이 지나 끝났는지
+    elapsed: float = 0.0
+
+
+def is_decided(tally: Counter, outstanding: int) -> bool:
+    """
+    남은 표가 모두 2위에게 가도 1위가 바뀌거나 동률이 될 수 없는지 확인합니다.
+    (동률이면 무작위로 정하므로, 동률 가능성이 있으면 결정되지 않은 것으로 봅니다.)
+
+    Args:
+        tally: 대상 → 지금까지의 득표
+        outstanding: 아직 도착하지 않은 표 수
+
+    Returns:
+        bool: 결과가 확정되었으면 True
+    """
+    if not tally:
+        return outstanding == 0
+    first, *rest = tally.most_common(2)
+    runner_up = rest[0][1] if rest else 0
+    return first[1] > runner_up + outstanding
+
+
+class VoteCollector:
+    """
+    살아 있는 에이전트에게 동시에 투표를 요청하고, 도착하는 순서대로 집계합니다.
+
+    결과가 확정되거나 기한이 지나면 바로 단계를 끝내므로, 투표 단계 시간은
+    가장 느린 투표자가 아니라 결과를 확정하는 표가 도착하는 시점에 맞춰집니다.
+    나머지 요청은 취소하지 않고 기한까지 기다려 VoteResult.late_votes에 기록합니다.
+    """
+
+    def __init__(self, executor, manager_name: str, context_id: Optional[str],
+                 message_for: Callable[[str], str], deadline: float = 10.0):
+        """
+        Args:
+            executor: 메시지를 보낼 GenericAgentExecutor
+            manager_name: 발신자 (매니저) 이름 (지표 레이블)
+            context_id: 게임 context_id
+            message_for: 투표자 이름 → VOTE_REQUEST 메시지
+            deadline: 투표 단계 최대 시간(초), 투표자에게도 같은 기한이 전달됨
+        """
+        self.executor = executor
+        self.manager_name = manager_name
+        self.context_id = context_id
+        self.message_for = message_for
+        self.deadline = deadline
+
+    async def ask(self, voter: str) -> tuple[str, Optional[str]]:
+        try:
+            with deadline_scope(self.deadline):
+                response = await self.executor.send_to_other(voter, self.message_for(voter), context_id=self.context_id)
+        except asyncio.TimeoutError:
+            print(f"⏰ {voter} 투표 시간 초과 ({self.deadline}s)")
+            return voter, None
+        except Exception as e:
+            print(f"❌ {voter} 응답 실패: {e}")
+            return voter, None
+        if not response:
+            print(f"⚠️ {voter} 응답 없음.")
+            return voter, None
+        return voter, response[0]
+
+    async def collect(self, voters: list[str]) -> VoteResult:
+        """
+        투표를 모읍니다.
+
+        Returns:
+            VoteResult: 집계된 표와 일찍 끝났는지 여부
+        """
+        result = VoteResult()
+        start = time.perf_counter()
+        tally: Counter = Counter()
+        tasks = {asyncio.create_task(self.ask(voter)): voter for voter in voters}
+        answered: set[str] = set()
+
+        try:
+            for next_vote in asyncio.as_completed(tasks, timeout=self.deadline):
+                voter, target = await next_vote
+                answered.add(voter)
+                if target is None:
+                    result.missing.append(voter)
+                else:
+                    result.votes[voter] = target
+                    tally[target] += 1
+                    print(f"🗳️ {voter} → {target}")
+
+                outstanding = len(tasks) - len(answered)
+                if outstanding and is_decided(tally, outstanding):
+                    result.decided_early = True
+                    print(f"✅ 투표 결과 확정 ({len(answered)}/{len(tasks)}표 도착)")
+                    break
+        except asyncio.TimeoutError:
+            result.timed_out = True
+            print(f"⏰ 투표 기한 도달 ({len(answered)}/{len(tasks)}표 도착)")
+
+        result.elapsed = time.perf_counter() - start
+        for task, voter in tasks.items():
+            if voter not in answered:
+                self.record_late(task, voter, result)
+
+        VOTES_TOTAL.inc((self.manager_name, "counted"), len(result.votes))
+        VOTES_TOTAL.inc((self.manager_name, "missing"), len(result.missing))
+        return result
+
+    def record_late(self, task: asyncio.Task, voter: str, result: VoteResult):
+        """단계가 끝난 뒤 도착하는 표를 late_votes에 기록합니다. (요청 자체가 기한을 가지므로 언젠가 끝남)"""
+        def on_done(task: asyncio.Task):
+            _stragglers.discard(task)
+            if task.cancelled():
+                return
+            _, target = task.result()
+            if target is not None:
+                result.late_votes[voter] = target
+                VOTES_TOTAL.inc((self.manager_name, "late"))
+                logger.info(f"늦은 투표: {voter} → {target}")
+
+        _stragglers.add(task)
+        task.add_done_callback(on_done)
@@ -3,6 +3,7 @@ import asyncio
 import os
 import base64
 import json
+import time
 import uuid
 
 
@@ -10,8 +11,13 @@ from uuid import uuid4
 from typing import Any
 from typing import Optional
 from a2a.client import A2ACardResolver, A2AClient
+from a2a.client.errors import A2AClientJSONRPCError
+from a2a.client.errors import A2AClientTimeoutError
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.events import EventQueue
 from a2a.types import (
     AgentCard,
+    Artifact,
     JSONRPCErrorResponse,
     Message,
     MessageSendParams,
@@ -25,7 +31,31 @@ from a2a.types import (
     Part,
     TextPart,
 )
+from a2a.utils import append_artifact_to_task
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+from .call_policy import CallPolicy
+from .call_policy import DeadlineExceeded
+from .call_policy import IDEMPOTENT_MESSAGE_TYPES
+from .call_policy import LatencyTracker
+from .call_policy import TERMINAL_MESSAGE_TYPES
+from .call_policy import current_deadline
+from .call_policy import deadline_scope
+from .call_policy import inject_deadline
+from .call_policy import remaining
+from .card_cache import AgentCardCache
+from .circuit_breaker import CircuitBreaker
+from .circuit_breaker import CircuitBreakerConfig
+from .circuit_breaker import CircuitOpenError
+from .http_pool import HttpPool
+from .http_pool import HttpPoolConfig
+from .http_pool import PoolStats
+from .metrics import ERRORS_TOTAL
+from .metrics import RETRIES_TOTAL
+from .metrics import SEND_OUTCOMES
+from .metrics import SEND_SECONDS
+from .tracing import inject
 from collections.abc import Callable
+from messages import peek_message_type
 from pydantic import BaseModel, HttpUrl
 
 PUBLIC_AGENT_CARD_PATH = '/.well-known/agent_card.json'
@@ -33,6 +63,10 @@ EXTENDED_AGENT_CARD_PATH = '/agent/authenticatedExtendedCard'
 
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
+# 스트리밍 응답의 부분 텍스트(artifact 조각)를 받는 콜백
+PartialCallback = Callable[[str], None]
+# 응답 기한 초과로 분류하는 예외 (a2a SDK는 httpx의 connect/read timeout을 A2AClientTimeoutError로 바꿔서 발생)
+TIMEOUT_ERRORS = (TimeoutError, A2AClientTimeoutError, httpx.TimeoutException)
 
 
 
@@ -58,26 +92,35 @@ class RemoteAgentConnections:
         self,
         request: MessageSendParams,
         task_callback: TaskUpdateCallback | None,
+        on_partial: PartialCallback | None = None,
     ) -> Task | Message | None:
         if self.card.capabilities.streaming:
             task = None
+            result = None
             #print("send_message : streaming")
+            # 스트림을 끝까지 읽어야 연결이 풀로 반환되어 재사용됨
+            # (중간에 return/break 하면 httpx가 해당 연결을 닫아 다음 요청에 TCP 핸드셰이크가 발생)
             async for response in self.agent_client.send_message_streaming(
                 SendStreamingMessageRequest(id=str(uuid4()), params=request)
             ):
+                if result is not None:
+                    continue
                 if not response.root.result:
-                    return response.root.error
+                    result = response.root.error
+                    continue
                 # In the case a message is returned, that is the end of the interaction.
                 event = response.root.result
                 if isinstance(event, Message):
-                    return event
+                    result = event
+                    continue
 
                 # Otherwise we are in the Task + TaskUpdate cycle.
+                task = apply_task_event(task, event)
+                if on_partial and isinstance(event, TaskArtifactUpdateEvent):
+                    on_partial(artifact_text(event.artifact))
                 if task_callback and event:
                     task = task_callback(event, self.card)
-                if hasattr(event, 'final') and event.final:
-                    break
-            return task
+            return result if result is not None else task
         
         #print("send_message : Non-streaming")
         # Non-streaming
@@ -95,6 +138,140 @@ class RemoteAgentConnections:
 
 
 
+class LoopbackHub:
+    """같은 프로세스(같은 이벤트 루프)에서 실행되는 에이전트들의 레지스트리.
+
+    loopback 모드에서는 HTTP/JSON-RPC/Starlette를 거치지 않고
+    대상 에이전트의 executor.execute를 직접 호출합니다.
+    """
+
+    def __init__(self):
+        self.cards: dict[str, AgentCard] = {}
+        self.executors: dict[str, AgentExecutor] = {}
+
+    def register(self, card: AgentCard, executor: AgentExecutor):
+        self.cards[card.name] = card
+        self.executors[card.name] = executor
+
+    def resolve(self, name: str) -> tuple[AgentCard, AgentExecutor] | None:
+        if name not in self.executors:
+            return None
+        return self.cards[name], self.executors[name]
+
+
+class LoopbackAgentConnections:
+    """RemoteAgentConnections와 같은 인터페이스를 가진 in-process 연결.
+
+    요청을 RequestContext/EventQueue로 감싸 대상 executor에 그대로 전달하므로
+    Message/Task 의미는 HTTP 경로와 동일하고, 소켓/직렬화 비용만 사라집니다.
+    """
+
+    def __init__(self, executor: AgentExecutor, agent_card: AgentCard):
+        self.executor = executor
+        self.card = agent_card
+        self.pending_tasks = set()
+
+    def get_agent(self) -> AgentCard:
+        return self.card
+
+    async def send_message(
+        self,
+        request: MessageSendParams,
+        task_callback: TaskUpdateCallback | None,
+        on_partial: PartialCallback | None = None,
+    ) -> Task | Message | None:
+        context = RequestContext(
+            request=request,
+            task_id=request.message.task_id,
+            context_id=request.message.context_id,
+        )
+        event_queue = EventQueue()
+        if on_partial is not None:
+            return await self.send_streaming(context, event_queue, task_callback, on_partial)
+        try:
+            await self.executor.execute(context, event_queue)
+
+            task = None
+            while True:
+                try:
+                    event = await event_queue.dequeue_event(no_wait=True)
+                except asyncio.QueueEmpty:
+                    break
+                event_queue.task_done()
+
+                # Message가 오면 상호작용 종료 (HTTP 경로와 동일)
+                if isinstance(event, Message):
+                    return event
+                task = apply_task_event(task, event)
+                if task_callback:
+                    task_callback(event, self.card)
+            return task
+        finally:
+            await event_queue.close()
+
+    async def send_streaming(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
+        task_callback: TaskUpdateCallback | None,
+        on_partial: PartialCallback,
+    ) -> Task | Message | None:
+        """대상 executor 실행과 동시에 이벤트를 읽어, 부분 응답을 도착하는 즉시 on_partial로 전달합니다."""
+        producer = asyncio.create_task(self.executor.execute(context, event_queue))
+        task = None
+        result = None
+        try:
+            while True:
+                getter = asyncio.ensure_future(event_queue.dequeue_event())
+                done, _ = await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    event = getter.result()
+                else:
+                    # executor 종료: 남은 이벤트만 처리
+                    getter.cancel()
+                    try:
+                        event = await event_queue.dequeue_event(no_wait=True)
+                    except asyncio.QueueEmpty:
+                        break
+                event_queue.task_done()
+
+                if result is not None:
+                    continue
+                if isinstance(event, Message):
+                    result = event
+                    continue
+                task = apply_task_event(task, event)
+                if isinstance(event, TaskArtifactUpdateEvent):
+                    on_partial(artifact_text(event.artifact))
+                if task_callback:
+                    task_callback(event, self.card)
+
+            await producer
+            return result if result is not None else task
+        finally:
+            if not producer.done():
+                producer.cancel()
+            await event_queue.close()
+
+
+def artifact_text(artifact: Artifact) -> str:
+    return "".join(part.root.text for part in artifact.parts if isinstance(part.root, TextPart))
+
+
+def apply_task_event(task: Task | None, event: TaskCallbackArg) -> Task | None:
+    """Task / TaskUpdate 이벤트를 누적해 최신 Task 상태를 만듭니다."""
+    if isinstance(event, Task):
+        return event
+    if task is None:
+        return None
+    if isinstance(event, TaskStatusUpdateEvent):
+        task.status = event.status
+    elif isinstance(event, TaskArtifactUpdateEvent):
+        append_artifact_to_task(task, event)
+    return task
+
+
+
 class A2AClientAgent:
     """The client agent.
 
@@ -108,13 +285,50 @@ class A2AClientAgent:
         http_client: httpx.AsyncClient | None = None,
         task_callback: TaskUpdateCallback | None = None,
         auto_init: bool = True,
+        loopback: LoopbackHub | None = None,
+        pool_config: HttpPoolConfig | None = None,
+        card_cache: AgentCardCache | None = None,
+        owner: str = "",
+        call_policy: CallPolicy | None = None,
+        breaker_config: CircuitBreakerConfig | None = None,
+        http_pool: HttpPool | None = None,
     ):
         self.task_callback = task_callback
-        self.httpx_client = http_client or httpx.AsyncClient()
-        self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
+        # 이 클라이언트를 사용하는 에이전트 이름 (지표 레이블)
+        self.owner = owner
+        # 호출별 deadline / 재시도 / hedging 정책과 hedging 지연 계산용 응답 시간 기록
+        self.call_policy = call_policy or CallPolicy()
+        self.latency = LatencyTracker()
+        # 피어별 circuit breaker (연결이 다시 등록되어도 상태 유지)와 열린 circuit의 회복 확인 작업
+        self.breaker_config = breaker_config or CircuitBreakerConfig()
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self._probes: dict[str, asyncio.Task] = {}
+        self.loopback = loopback
+        # http_client를 직접 넘기면 모든 피어가 그 클라이언트를 공유하고,
+        # 아니면 피어별 연결 풀을 사용 (loopback 모드에서는 소켓을 쓰지 않으므로 만들지 않음)
+        # http_pool을 넘기면 같은 프로세스의 여러 에이전트가 연결 풀을 공유 (닫는 것은 넘긴 쪽 책임)
+        self.httpx_client = http_client
+        self.http_pool: HttpPool | None = http_pool
+        self._owns_pool = False
+        if http_pool is None and http_client is None and loopback is None:
+            self.http_pool = HttpPool(pool_config)
+            self._owns_pool = True
+        self.remote_agent_connections: dict[str, RemoteAgentConnections | LoopbackAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
         self.agents: str = ''
         self.remote_agent_entries = remote_agent_entries
+        # 이름 → 서버 엔트리 인덱스 (retrieve_card_by_name에서 사용)
+        self.entries_by_name: dict[str, A2AServerEntry] = {
+            entry.name: entry for entry in remote_agent_entries or []
+        }
+        self.card_cache = card_cache if loopback is None else None
+        self._card_fingerprints: dict[str, str] = {}
+        self._card_etags: dict[str, str | None] = {}
+        self._resolving: dict[str, asyncio.Task] = {}
+
+        # 캐시된 카드로 연결을 즉시 등록 (첫 게임 메시지가 카드 조회를 기다리지 않도록)
+        if self.card_cache is not None:
+            self.register_cached_cards(self.remote_agent_entries or [])
         
         if auto_init : 
             loop = asyncio.get_running_loop()
@@ -127,23 +341,94 @@ class A2AClientAgent:
     async def init_remote_agents(
         self, entries: list[A2AServerEntry]
     ):
-        async with asyncio.TaskGroup() as task_group:
-            for entry in entries:
-                task_group.create_task(self.retrieve_card(entry))
-        # The task groups run in the background and complete.
+        # 캐시로 이미 등록된 피어는 재검증만 하므로, 한 피어의 실패가 다른 피어 조회를 취소하지 않게 함
+        results = await asyncio.gather(
+            *(self.retrieve_card(entry) for entry in entries),
+            return_exceptions=True,
+        )
+        for entry, result in zip(entries, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ 에이전트 카드 조회 실패: {entry.name} ({result})")
         # Once completed the self.agents string is set and the remote
         # connections are established
 
 
+    def register_cached_cards(self, entries: list[A2AServerEntry]):
+        """디스크 캐시에 카드가 있는 피어들의 연결을 네트워크 요청 없이 등록합니다."""
+        for entry in entries:
+            cached = self.card_cache.get(str(entry.url))
+            if cached is None or cached.card.name != entry.name:
+                continue
+            self.register_agent_card(cached.card)
+            self._card_fingerprints[cached.card.name] = cached.fingerprint
+            self._card_etags[cached.card.name] = cached.etag
+
+
     async def retrieve_card(self, entry: A2AServerEntry):
+        if self.loopback is not None:
+            # loopback 모드: 같은 프로세스에 등록된 executor에 직접 연결
+            resolved = self.loopback.resolve(entry.name)
+            if resolved is None:
+                print(f"⚠️ loopback에 '{entry.name}' 에이전트가 아직 등록되지 않았습니다.")
+                return
+            card, executor = resolved
+            self.register_agent_card(card, LoopbackAgentConnections(executor, card))
+            return
+
         address = str(entry.url)
-        card_resolver = A2ACardResolver(self.httpx_client, address)
-        card = await card_resolver.get_agent_card()
-        self.register_agent_card(card)
+        card, etag = await self.fetch_card(address, self._card_etags.get(entry.name))
+        if card is None:
+            # 304 Not Modified: 캐시로 등록한 카드가 최신
+            card = self.cards[entry.name]
+        else:
+            fingerprint = AgentCardCache.fingerprint(card)
+            if self._card_fingerprints.get(card.name) != fingerprint:
+                # 처음 보는 카드이거나 캐시 이후 카드가 바뀜 → 연결 재등록
+                self.register_agent_card(card)
+                self._card_fingerprints[card.name] = fingerprint
+            if self.card_cache is not None:
+                self.card_cache.put(address, card, etag)
+            self._card_etags[card.name] = etag
+
+        # 첫 요청 전에 피어와의 keep-alive 연결을 미리 열어 둠
+        if self.http_pool is not None:
+            await self.http_pool.preconnect(card.url, path=AGENT_CARD_WELL_KNOWN_PATH)
+
+    async def fetch_card(self, address: str, etag: str | None = None) -> tuple[AgentCard | None, str | None]:
+        """
+        피어의 공개 카드를 조회합니다.
 
+        Returns:
+            (카드, ETag). etag를 보냈고 서버가 304를 주면 카드는 None
+        """
+        headers = {"If-None-Match": etag} if etag else {}
+        response = await self.client_for(address).get(
+            address.rstrip('/') + AGENT_CARD_WELL_KNOWN_PATH, headers=headers
+        )
+        if response.status_code == 304 and etag:
+            return None, etag
+        response.raise_for_status()
+        return AgentCard.model_validate(response.json()), response.headers.get("etag")
 
-    def register_agent_card(self, card: AgentCard):
-        remote_connection = RemoteAgentConnections(self.httpx_client, card)
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """url로 요청을 보낼 때 사용할 HTTP 클라이언트를 반환합니다."""
+        if self.http_pool is not None:
+            return self.http_pool.client_for(url)
+        return self.httpx_client
+
+    def pool_stats(self) -> dict[str, PoolStats]:
+        """피어별 연결 풀 상태 (active / idle / waiting)를 반환합니다."""
+        if self.http_pool is None:
+            return {}
+        return self.http_pool.stats()
+
+
+    def register_agent_card(
+        self,
+        card: AgentCard,
+        connection: RemoteAgentConnections | LoopbackAgentConnections | None = None,
+    ):
+        remote_connection = connection or RemoteAgentConnections(self.client_for(card.url), card)
         self.remote_agent_connections[card.name] = remote_connection
         self.cards[card.name] = card
         agent_info = []
@@ -161,12 +446,61 @@ class A2AClientAgent:
             raise ValueError("⚠️ remote_agent_entries가 초기화되지 않았습니다.")
 
         # name으로 entry 찾기
-        entry = next((e for e in self.remote_agent_entries if e.name == name), None)
+        entry = self.entries_by_name.get(name)
         if entry is None:
             raise ValueError(f"❌ 이름이 '{name}'인 A2A 서버 엔트리를 찾을 수 없습니다.")
 
-        # retrieve_card 실행
-        await self.retrieve_card(entry)
+        # retrieve_card 실행 (같은 피어에 대한 동시 요청은 조회 한 번을 공유)
+        task = self._resolving.get(name)
+        if task is None:
+            task = asyncio.create_task(self.retrieve_card(entry))
+            self._resolving[name] = task
+            task.add_done_callback(lambda _: self._resolving.pop(name, None))
+        await asyncio.shield(task)
+
+    def breaker_for(self, agent_name: str) -> CircuitBreaker:
+        breaker = self.breakers.get(agent_name)
+        if breaker is None:
+            breaker = self.breakers[agent_name] = CircuitBreaker(
+                self.owner, agent_name, self.breaker_config, on_open=self.start_probe)
+        return breaker
+
+    def is_available(self, agent_name: str) -> bool:
+        """피어의 circuit이 닫혀 있는지 (한 번도 보낸 적 없는 피어도 True)."""
+        breaker = self.breakers.get(agent_name)
+        return breaker is None or breaker.available
+
+    def start_probe(self, breaker: CircuitBreaker):
+        """circuit이 열리면 피어가 회복될 때까지 백그라운드에서 확인합니다."""
+        task = self._probes.get(breaker.peer)
+        if task is not None and not task.done():
+            return
+        self._probes[breaker.peer] = asyncio.get_running_loop().create_task(self.probe_until_closed(breaker))
+
+    async def probe_until_closed(self, breaker: CircuitBreaker):
+        while not breaker.available:
+            await asyncio.sleep(breaker.retry_in())
+            # 다른 요청이 시험 중이면 다음 차례까지 대기
+            if not breaker.allow():
+                await asyncio.sleep(self.breaker_config.reset_timeout)
+                continue
+            try:
+                healthy = await asyncio.wait_for(self.probe_peer(breaker.peer), timeout=self.breaker_config.probe_timeout)
+            except Exception:
+                healthy = False
+            if healthy:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+    async def probe_peer(self, agent_name: str) -> bool:
+        """피어가 응답하는지 확인합니다. (HTTP: 공개 카드 조회, loopback: 등록 여부)"""
+        if self.loopback is not None:
+            return self.loopback.resolve(agent_name) is not None
+        entry = self.entries_by_name.get(agent_name)
+        address = str(entry.url) if entry is not None else self.cards[agent_name].url
+        card, _ = await self.fetch_card(address)
+        return card is not None and card.name == agent_name
 
     def list_remote_agents(self):
         """List the available remote agents you can use to delegate the task."""
@@ -183,7 +517,8 @@ class A2AClientAgent:
 
 
     async def send_message(self, agent_name:str, user_text: str, 
-                            task_id:Optional[str] = None, context_id:Optional[str] = None ) -> Any:
+                            task_id:Optional[str] = None, context_id:Optional[str] = None,
+                            on_partial: PartialCallback | None = None) -> Any:
         """Sends a task either streaming (if supported) or non-streaming.
 
         This will send a message to the remote agent named agent_name.
@@ -192,6 +527,7 @@ class A2AClientAgent:
           agent_name: The name of the agent to send the task to.
           message: The message to send to the agent for the task.
           tool_context: The tool context this method runs in.
+          on_partial: Called with each streamed artifact chunk as soon as it arrives.
 
         Yields:
           A dictionary of JSON data.
@@ -205,6 +541,15 @@ class A2AClientAgent:
         if not client:
             raise ValueError(f'Client not available for {agent_name}')
 
+        # circuit이 열린 피어에는 보내지 않고 즉시 실패 (죽은 피어가 메시지마다 timeout을 쓰지 않도록)
+        # 단, 게임 종료 통보(TERMINAL_MESSAGE_TYPES)는 circuit 상태와 관계없이 한 번 시도
+        message_type = peek_message_type(user_text)
+        breaker = self.breaker_for(agent_name)
+        bypass = message_type in TERMINAL_MESSAGE_TYPES and not breaker.available
+        if not bypass and not breaker.allow():
+            SEND_OUTCOMES.inc((self.owner, agent_name, "circuit_open"))
+            raise CircuitOpenError(f'Circuit open for {agent_name} (retry in {breaker.retry_in():.2f}s)')
+
 
         # setting request message
        
@@ -220,7 +565,8 @@ class A2AClientAgent:
                 message_id=str(uuid.uuid4()),
                 #**{"messageId": message_id},   # alias 이름으로 명시적 전달
                 context_id=context_id,
-                task_id=task_id
+                task_id=task_id,
+                metadata=inject(),   # 현재 span을 받는 쪽 execute의 부모로 전달 (deadline은 시도마다 추가)
             ),
             configuration=MessageSendConfiguration(
                 accepted_output_modes=['text', 'text/plain', 'image/png'],
@@ -228,7 +574,41 @@ class A2AClientAgent:
         )
 
         # message 전송 및 응답 수신
-        response = await client.send_message(request, task_callback=None)
+        # deadline(기본 timeout과 호출한 쪽에서 물려받은 deadline 중 짧은 쪽) 안에서만 재시도/hedging
+        inherited = current_deadline.get()
+        caller_expired = False
+        start = time.perf_counter()
+        outcome = "failure"
+        try:
+            with deadline_scope(self.call_policy.budget()) as deadline:
+                response = await self.send_with_policy(client, agent_name, message_type, request, on_partial)
+            outcome = "ok"
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except TIMEOUT_ERRORS as e:
+            outcome = "timeout"
+            # 호출한 쪽이 정한 더 짧은 deadline이 먼저 지났으면 피어 장애가 아님 (breaker에 반영하지 않음)
+            caller_expired = isinstance(e, DeadlineExceeded) and inherited is not None and deadline == inherited
+            ERRORS_TOTAL.inc((self.owner, "send"))
+            raise
+        except Exception:
+            ERRORS_TOTAL.inc((self.owner, "send"))
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            SEND_SECONDS.observe((self.owner, agent_name), elapsed)
+            SEND_OUTCOMES.inc((self.owner, agent_name, outcome))
+            if outcome == "ok":
+                self.latency.record(agent_name, message_type, elapsed)
+                breaker.record_success()
+            elif bypass:
+                # circuit을 거치지 않은 시도의 실패는 진행 중인 차단/시험 상태를 바꾸지 않음
+                pass
+            elif outcome == "cancelled" or caller_expired:
+                breaker.release()
+            else:
+                breaker.record_failure()
         print("Recv Response :", response.model_dump(mode='json', exclude_none=True))
 
         if isinstance(response, Message):
@@ -247,12 +627,91 @@ class A2AClientAgent:
                     await self.convert_parts(task.status.message.parts)
                 )
             if task.artifacts:
+                # 스트리밍 조각으로 나뉘어 온 artifact는 하나의 텍스트로 합침
                 for artifact in task.artifacts:
-                    result.extend(
-                        await self.convert_parts(artifact.parts)
-                    )
+                    result.append(artifact_text(artifact))
             return result
 
+
+    async def send_with_policy(self, client: RemoteAgentConnections | LoopbackAgentConnections,
+                               agent_name: str, message_type: str, request: MessageSendParams,
+                               on_partial: PartialCallback | None = None) -> Task | Message | None:
+        """
+        현재 deadline 안에서 요청을 보냅니다.
+
+        재시도(jitter backoff)와 hedging은 멱등 메시지 유형의 비스트리밍 호출에만 적용되며,
+        deadline이 지나면 더 시도하지 않고 DeadlineExceeded를 발생시킵니다.
+        같은 요청을 다시 보낼 때도 messageId는 그대로이므로 받는 쪽은 중복을 구분할 수 있습니다.
+        """
+        policy = self.call_policy
+        retryable = on_partial is None and message_type in IDEMPOTENT_MESSAGE_TYPES
+        attempt = 0
+        while True:
+            left = remaining()
+            if left is not None and left <= 0:
+                raise DeadlineExceeded(f"{agent_name} {message_type}: deadline exceeded")
+            try:
+                send = self.send_hedged(client, agent_name, message_type, request) \
+                    if retryable and policy.hedge else self.send_once(client, request, on_partial)
+                return await asyncio.wait_for(send, timeout=left)
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f"{agent_name} {message_type}: no response within {left}s") from None
+            except Exception as e:
+                if not retryable or attempt >= policy.max_retries:
+                    raise
+                delay = policy.backoff(attempt)
+                left = remaining()
+                if left is not None and left <= delay:
+                    raise
+                attempt += 1
+                RETRIES_TOTAL.inc(("send_retry",))
+                print(f"🔁 {agent_name} {message_type} 재시도 {attempt}/{policy.max_retries} ({delay:.3f}s 후): {e}")
+                await asyncio.sleep(delay)
+
+    async def send_once(self, client: RemoteAgentConnections | LoopbackAgentConnections,
+                        request: MessageSendParams,
+                        on_partial: PartialCallback | None = None) -> Task | Message | None:
+        # 남은 시간은 시도마다 달라지므로 보내기 직전에 metadata에 담음
+        attempt = request.model_copy(update={
+            "message": request.message.model_copy(update={"metadata": inject_deadline(request.message.metadata)}),
+        })
+        response = await client.send_message(attempt, task_callback=None, on_partial=on_partial)
+        if response is not None and not isinstance(response, (Task, Message)):
+            # 서버가 돌려준 JSON-RPC 오류도 실패로 집계 (재시도/circuit breaker 대상)
+            raise A2AClientJSONRPCError(JSONRPCErrorResponse(id=None, error=response))
+        return response
+
+    async def send_hedged(self, client: RemoteAgentConnections | LoopbackAgentConnections,
+                          agent_name: str, message_type: str,
+                          request: MessageSendParams) -> Task | Message | None:
+        """
+        응답이 최근 응답 시간의 hedge_quantile(p95)보다 늦으면 같은 요청을 한 번 더 보내고
+        먼저 성공한 응답을 사용합니다. 나머지 요청은 취소됩니다.
+        """
+        policy = self.call_policy
+        delay = self.latency.quantile(agent_name, message_type, policy.hedge_quantile, policy.hedge_min_samples)
+        if delay is None:
+            # 응답 시간 표본이 부족하면 hedging하지 않음
+            return await self.send_once(client, request)
+
+        pending = {asyncio.create_task(self.send_once(client, request))}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                RETRIES_TOTAL.inc(("send_hedge",))
+                pending.add(asyncio.create_task(self.send_once(client, request)))
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
         
     async def convert_parts(self, parts: list[Part]):
         rval = []
@@ -282,21 +741,26 @@ class A2AClientAgent:
         return f'Unknown type: {part.kind}'
 
     async def close(self):
-        await self.httpx_client.aclose()
+        for task in self._probes.values():
+            task.cancel()
+        if self.http_pool is not None and self._owns_pool:
+            await self.http_pool.aclose()
+        if self.httpx_client is not None:
+            await self.httpx_client.aclose()
 
 
 
 async def fetch_agent_card(httpx_client:httpx.AsyncClient, url: str):
-    async with httpx_client:
-        resolver = A2ACardResolver(httpx_client=httpx_client, base_url=url)
-        try:
-            card = await resolver.get_agent_card()
-            print('Successfully fetched public agent card:')
-            print(card.model_dump_json(indent=2, exclude_none=True))
-            return card
-        except Exception as e:
-            print(f"Failed to fetch agent card from {url}: {e}")
-            return None
+    # 공유 클라이언트이므로 여기서 닫지 않음 (연결 풀 유지)
+    resolver = A2ACardResolver(httpx_client=httpx_client, base_url=url)
+    try:
+        card = await resolver.get_agent_card()
+        print('Successfully fetched public agent card:')
+        print(card.model_dump_json(indent=2, exclude_none=True))
+        return card
+    except Exception as e:
+        print(f"Failed to fetch agent card from {url}: {e}")
+        return None
 
 async def select_agent_by_capability(agent_urls, required_capability):
     for url in agent_urls:
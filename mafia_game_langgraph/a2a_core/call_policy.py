@@ -0,0 +1,154 @@
+import asyncio
+import math
+import random
+import time
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+from typing import Optional
+
+
+# A2A Message.metadata 안에서 남은 시간(초)을 담는 키 (호스트마다 시계가 다르므로 상대값)
+DEADLINE_METADATA_KEY = "mafia.deadline"
+
+# 여러 번 받아도 결과가 같은 메시지 유형 (재시도/hedging 대상)
+#  - INTRO_REQUEST, DAY_ACTION_REQUEST는 다른 멤버에게 메시지를 다시 퍼뜨리고,
+#    GAME_RESULT는 게임 상태를 지우므로 제외
+IDEMPOTENT_MESSAGE_TYPES = frozenset({
+    "ROLE_ASSIGNMENT", "VOTE_REQUEST", "NIGHT_ACTION_REQUEST", "NIGHT_ACTION_RESULT",
+    "EXECUTION_RESULT", "KILLED_RESULT", "STATUS_REQUEST",
+})
+
+# 피어의 circuit 상태와 관계없이 항상 보내는 메시지 유형
+#  - GAME_RESULT를 받지 못한 멤버는 게임 상태를 TTL까지 들고 있고, 단일 게임 서버는 종료되지 않음
+TERMINAL_MESSAGE_TYPES = frozenset({"GAME_RESULT"})
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """호출 deadline이 지났습니다. (기존 asyncio.TimeoutError 처리 코드에서 그대로 잡힘)"""
+
+
+# 현재 작업의 절대 deadline (time.monotonic 기준), 중첩되면 더 이른 값이 유지됨
+current_deadline: ContextVar[Optional[float]] = ContextVar("mafia_call_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(timeout: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    블록 안의 모든 호출이 timeout초 안에 끝나야 한다고 표시합니다.
+    바깥에 더 이른 deadline이 있으면 그 값을 유지하므로, 중첩된 호출일수록 남은 시간이 줄어듭니다.
+
+    Yields:
+        float | None: 적용된 절대 deadline (time.monotonic 기준)
+    """
+    if timeout is None:
+        yield current_deadline.get()
+        return
+    deadline = time.monotonic() + max(0.0, timeout)
+    outer = current_deadline.get()
+    if outer is not None and outer < deadline:
+        deadline = outer
+    token = current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        current_deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """현재 deadline까지 남은 시간(초), deadline이 없으면 None."""
+    deadline = current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def inject_deadline(metadata: Optional[dict] = None) -> Optional[dict]:
+    """남은 시간을 Message.metadata에 담아, 받는 쪽의 하위 호출도 같은 deadline을 따르게 합니다."""
+    left = remaining()
+    if left is None:
+        return metadata
+    metadata = dict(metadata or {})
+    metadata[DEADLINE_METADATA_KEY] = round(max(0.0, left), 3)
+    return metadata
+
+
+def extract_deadline(metadata: Optional[dict]) -> Optional[float]:
+    """받은 Message.metadata의 남은 시간(초). 없거나 형식이 다르면 None."""
+    value = (metadata or {}).get(DEADLINE_METADATA_KEY)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return max(0.0, float(value))
+
+
+@dataclass
+class CallPolicy:
+    """
+    A2AClientAgent.send_message의 호출 정책.
+
+    timeout은 호출 하나의 기본 상한이며, 바깥 deadline_scope가 더 짧으면 그 값을 따릅니다.
+    재시도와 hedging은 IDEMPOTENT_MESSAGE_TYPES에만, 스트리밍(on_partial)이 아닌 호출에만 적용됩니다.
+    """
+    timeout: Optional[float] = 60.0
+    max_retries: int = 2
+    initial_backoff: float = 0.05
+    max_backoff: float = 1.0
+    # p95 지연 후에도 응답이 없으면 같은 요청을 한 번 더 보냄 (먼저 온 응답 사용)
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> "CallPolicy":
+        """
+        에이전트 설정의 "calls" 항목.
+        예: {"timeout": 10, "maxRetries": 2, "hedge": true}
+        """
+        config = config or {}
+        return cls(
+            timeout=config.get("timeout", cls.timeout),
+            max_retries=config.get("maxRetries", cls.max_retries),
+            initial_backoff=config.get("initialBackoff", cls.initial_backoff),
+            max_backoff=config.get("maxBackoff", cls.max_backoff),
+            hedge=config.get("hedge", cls.hedge),
+            hedge_quantile=config.get("hedgeQuantile", cls.hedge_quantile),
+            hedge_min_samples=config.get("hedgeMinSamples", cls.hedge_min_samples),
+        )
+
+    def budget(self) -> Optional[float]:
+        """이번 호출에 쓸 수 있는 시간(초): 기본 timeout과 현재 deadline 중 짧은 쪽."""
+        left = remaining()
+        if left is None:
+            return self.timeout
+        if self.timeout is None:
+            return left
+        return min(left, self.timeout)
+
+    def backoff(self, attempt: int) -> float:
+        """attempt번째 재시도 전 대기 시간 (full jitter)."""
+        return random.uniform(0, min(self.max_backoff, self.initial_backoff * (2 ** attempt)))
+
+
+class LatencyTracker:
+    """(피어, 메시지 유형)별 최근 응답 시간으로 hedging 지연(백분위수)을 계산합니다."""
+
+    def __init__(self, window: int = 256):
+        self.window = window
+        self._samples: dict[tuple[str, str], deque[float]] = {}
+
+    def record(self, peer: str, message_type: str, seconds: float):
+        samples = self._samples.get((peer, message_type))
+        if samples is None:
+            samples = self._samples[(peer, message_type)] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def quantile(self, peer: str, message_type: str, q: float, min_samples: int) -> Optional[float]:
+        """표본이 min_samples보다 적으면 None (hedging하지 않음)."""
+        samples = self._samples.get((peer, message_type))
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
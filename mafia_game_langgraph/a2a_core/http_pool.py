@@ -0,0 +1,230 @@
+import asyncio
+import importlib.util
+import logging
+
+from dataclasses import dataclass
+from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from urllib.parse import urlsplit
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HttpPoolConfig:
+    """
+    A2A 피어 HTTP 연결 풀 설정. 에이전트 설정 JSON의 "httpClient" 항목에서 읽습니다.
+
+    예시:
+        "httpClient": {"maxConnectionsPerPeer": 32, "keepaliveExpiry": 60, "http2": false,
+                       "connectTimeout": 5, "readTimeout": 120, "preconnect": 4}
+    """
+    max_connections_per_peer: int = 32
+    max_keepalive_per_peer: int = 32
+    keepalive_expiry: float = 60.0
+    http2: bool = False
+    connect_timeout: float = 5.0
+    read_timeout: float | None = 120.0     # LLM 응답을 기다리므로 넉넉하게
+    write_timeout: float = 10.0
+    pool_timeout: float | None = None      # None이면 풀이 가득 차도 실패하지 않고 대기
+    preconnect: int = 1                    # 피어마다 미리 열어 둘 연결 수, 0이면 사용 안 함
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any] | None) -> "HttpPoolConfig":
+        config = config or {}
+        default = cls()
+        max_connections = config.get("maxConnectionsPerPeer", default.max_connections_per_peer)
+        return cls(
+            max_connections_per_peer=max_connections,
+            max_keepalive_per_peer=config.get("maxKeepalivePerPeer", max_connections),
+            keepalive_expiry=config.get("keepaliveExpiry", default.keepalive_expiry),
+            http2=config.get("http2", default.http2),
+            connect_timeout=config.get("connectTimeout", default.connect_timeout),
+            read_timeout=config.get("readTimeout", default.read_timeout),
+            write_timeout=config.get("writeTimeout", default.write_timeout),
+            pool_timeout=config.get("poolTimeout", default.pool_timeout),
+            preconnect=config.get("preconnect", default.preconnect),
+        )
+
+
+@dataclass
+class PoolStats:
+    """피어 하나에 대한 연결 풀 상태."""
+    active: int = 0     # 요청을 처리 중인 연결
+    idle: int = 0       # keep-alive로 열려 있는 유휴 연결
+    waiting: int = 0    # 연결을 얻지 못해 대기 중인 요청 (HTTP/1.1에서만 계산, HTTP/2는 0)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """응답 본문을 다 읽거나 닫으면 release를 한 번 호출합니다."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self.stream = stream
+        self.release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self.stream.aclose()
+        finally:
+            if self.release is not None:
+                self.release()
+                self.release = None
+
+
+class _CountingTransport(httpx.AsyncBaseTransport):
+    """
+    진행 중인 요청 수(연결을 기다리는 요청 포함)를 세는 transport.
+    요청은 응답 본문이 닫힐 때까지 연결을 점유하므로 그때까지 하나로 셉니다.
+    """
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport):
+        self.transport = transport
+        self.in_flight = 0
+
+    @property
+    def pool(self) -> Any:
+        """
+        httpcore.AsyncConnectionPool. httpx가 공개하지 않는 속성이라 여기서만 접근하며,
+        requirements.txt에 httpx/httpcore 버전을 고정해 둡니다.
+        """
+        return getattr(self.transport, "_pool", None)
+
+    def release(self):
+        self.in_flight -= 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            self.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, self.release)
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class HttpPool:
+    """
+    피어(에이전트 카드 URL)마다 별도의 httpx.AsyncClient를 두는 연결 풀.
+
+    httpx의 Limits는 클라이언트 전체에 적용되므로, 피어별 최대 연결 수를 보장하고
+    한 피어가 느려져도 다른 피어의 연결을 잡아먹지 않도록 피어마다 클라이언트를 만듭니다.
+    host_main.py의 paths 모드처럼 여러 에이전트가 같은 host:port에 경로로 나뉘어 있어도
+    피어 주소(origin + 경로)로 구분하므로 피어별 연결 수 제한이 그대로 적용됩니다.
+    SSL 컨텍스트는 한 번만 만들어 모든 클라이언트가 공유합니다.
+    """
+
+    def __init__(self, config: HttpPoolConfig | None = None):
+        self.config = config or HttpPoolConfig()
+        self.http2 = self.config.http2
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("⚠️ http2 설정이 켜져 있지만 'h2' 패키지가 없어 HTTP/1.1을 사용합니다. (pip install 'httpx[http2]')")
+            self.http2 = False
+
+        self._ssl_context = httpx.create_ssl_context()
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._transports: dict[str, _CountingTransport] = {}
+
+    @staticmethod
+    def peer_key(url: str) -> str:
+        """피어 주소(scheme://host:port/경로, 끝의 / 제외). 에이전트 카드 URL 단위로 풀을 나눕니다."""
+        parts = urlsplit(str(url))
+        return f"{parts.scheme}://{parts.netloc}{parts.path.rstrip('/')}"
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        """url(피어의 카드 URL)에 해당하는 클라이언트를 반환하고, 없으면 새로 만듭니다."""
+        peer = self.peer_key(url)
+        client = self._clients.get(peer)
+        if client is None:
+            config = self.config
+            transport = _CountingTransport(httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=config.max_connections_per_peer,
+                    max_keepalive_connections=config.max_keepalive_per_peer,
+                    keepalive_expiry=config.keepalive_expiry,
+                ),
+                http2=self.http2,
+                verify=self._ssl_context,
+            ))
+            client = httpx.AsyncClient(
+                transport=transport,
+                timeout=httpx.Timeout(
+                    connect=config.connect_timeout,
+                    read=config.read_timeout,
+                    write=config.write_timeout,
+                    pool=config.pool_timeout,
+                ),
+            )
+            self._clients[peer] = client
+            self._transports[peer] = transport
+        return client
+
+    async def preconnect(self, url: str, path: str = "/", connections: int | None = None) -> int:
+        """
+        피어와의 연결을 미리 열어 keep-alive 상태로 둡니다.
+        첫 fan-out 때 TCP 핸드셰이크가 hot path에 들어가지 않도록 하기 위함입니다.
+
+        Args:
+            url: 피어 주소
+            path: 연결을 열 때 요청할 경로 (가벼운 GET, 예: 에이전트 카드 경로)
+            connections: 열어 둘 연결 수, None이면 설정의 preconnect 값
+
+        Returns:
+            int: 성공한 요청 수
+        """
+        count = self.config.preconnect if connections is None else connections
+        # HTTP/2는 연결 하나로 다중화되므로 하나만 열면 충분
+        count = min(1 if self.http2 else count, self.config.max_connections_per_peer)
+        if count <= 0:
+            return 0
+
+        client = self.client_for(url)
+        target = self.peer_key(url) + path
+        # HTTP/1.1 연결은 동시에 한 요청만 처리하므로, 동시 요청 수만큼 연결이 생성됨
+        results = await asyncio.gather(
+            *(client.get(target) for _ in range(count)),
+            return_exceptions=True,
+        )
+        failures = [r for r in results if isinstance(r, Exception)]
+        if failures:
+            logger.warning(f"⚠️ {target} 사전 연결 {len(failures)}/{count}건 실패: {failures[0]}")
+        return count - len(failures)
+
+    def stats(self) -> dict[str, PoolStats]:
+        """
+        피어(카드 URL)별 연결 풀 상태를 반환합니다.
+
+        연결 상태는 httpcore의 공개 API(connections, is_idle)로, 대기 요청은 _CountingTransport가 센
+        진행 중 요청 수에서 사용 중인 연결 수를 빼서 구합니다. (HTTP/1.1 연결은 한 번에 요청 하나)
+        """
+        result: dict[str, PoolStats] = {}
+        for peer, transport in self._transports.items():
+            stats = PoolStats()
+            pool = transport.pool
+            if pool is None:
+                raise RuntimeError("httpx transport에서 연결 풀을 찾을 수 없습니다. (requirements.txt의 httpx 버전 확인)")
+            for connection in pool.connections:
+                if connection.is_idle():
+                    stats.idle += 1
+                elif not connection.is_closed():
+                    stats.active += 1
+            if not self.http2:
+                stats.waiting = max(0, transport.in_flight - stats.active)
+            result[peer] = stats
+        return result
+
+    async def aclose(self):
+        clients, self._clients = list(self._clients.values()), {}
+        self._transports = {}
+        await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True)
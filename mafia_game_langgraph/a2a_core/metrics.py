@@ -0,0 +1,185 @@
+import functools
+import time
+
+from bisect import bisect_left
+from typing import Awaitable
+from typing import Callable
+from typing import Iterable
+from typing import TypeVar
+
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from .tracing import span
+
+
+# 초 단위, LLM 호출(수 초)과 loopback 메시지(수 ms)를 모두 구분할 수 있는 범위
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRICS_PATH = "/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = tuple[str, ...]
+T = TypeVar("T")
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Labels, values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size   # 버킷별 (누적 아님), 마지막은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram:
+    """
+    레이블 조합별 누적 히스토그램.
+
+    관측 한 번은 bisect 한 번과 정수 덧셈 몇 번이며, 레이블 조합별 버킷 배열은
+    처음 관측될 때 한 번만 만듭니다. (이벤트 루프 한 스레드에서만 기록하므로 락이 없습니다.)
+    """
+
+    def __init__(self, name: str, help_text: str, label_names: Labels, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[Labels, _HistogramSeries] = {}
+
+    def observe(self, labels: Labels, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _HistogramSeries(len(self.buckets) + 1)
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.sum += value
+        series.count += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), series.counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series.sum)}")
+            lines.append(f"{self.name}_count{label_text} {series.count}")
+        return lines
+
+
+class Counter:
+    """레이블 조합별 단조 증가 카운터."""
+
+    def __init__(self, name: str, help_text: str, label_names: Labels):
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """프로세스 하나의 지표 모음. Prometheus 텍스트 포맷으로 내보냅니다."""
+
+    def __init__(self):
+        self._metrics: dict[str, Histogram | Counter] = {}
+
+    def histogram(self, name: str, help_text: str, label_names: Labels,
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, label_names, buckets))
+
+    def counter(self, name: str, help_text: str, label_names: Labels) -> Counter:
+        return self._register(Counter(name, help_text, label_names))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 지표입니다: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+EXECUTE_SECONDS = REGISTRY.histogram(
+    "mafia_execute_seconds", "Time spent handling an incoming A2A message.", ("agent", "message_type"))
+SEND_SECONDS = REGISTRY.histogram(
+    "mafia_send_seconds", "Round-trip time of outbound A2A messages.", ("agent", "peer"))
+LLM_SECONDS = REGISTRY.histogram(
+    "mafia_llm_seconds", "Duration of LLM calls by agent method.", ("agent", "method"))
+ERRORS_TOTAL = REGISTRY.counter(
+    "mafia_errors_total", "Errors by component.", ("agent", "component"))
+RETRIES_TOTAL = REGISTRY.counter(
+    "mafia_retries_total", "Retried operations.", ("operation",))
+SEND_OUTCOMES = REGISTRY.counter(
+    "mafia_send_outcomes_total", "Outbound A2A calls by final outcome (ok/timeout/failure/circuit_open).",
+    ("agent", "peer", "outcome"))
+CIRCUIT_TRANSITIONS = REGISTRY.counter(
+    "mafia_circuit_transitions_total", "Per-peer circuit breaker state changes.", ("agent", "peer", "state"))
+VOTES_TOTAL = REGISTRY.counter(
+    "mafia_votes_total", "Day votes by arrival (counted/late/missing).", ("agent", "status"))
+LLM_CACHE_TOTAL = REGISTRY.counter(
+    "mafia_llm_cache_total", "Shared LLM response cache lookups by result (hit/miss/wait).", ("result",))
+
+
+def timed_llm(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """에이전트의 LLM 호출 메서드(gemini_*) 소요 시간과 오류를 메서드 이름별로 기록하고, trace span으로도 남깁니다."""
+    method = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with span(method, agent=self.agent_name):
+                return await func(self, *args, **kwargs)
+        except Exception:
+            ERRORS_TOTAL.inc((self.agent_name, "llm"))
+            raise
+        finally:
+            LLM_SECONDS.observe((self.agent_name, method), time.perf_counter() - start)
+    return wrapper
+
+
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+def metrics_routes() -> list[Route]:
+    """A2A Starlette 앱에 추가할 /metrics 라우트."""
+    return [Route(METRICS_PATH, metrics_endpoint, methods=["GET"])]
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import random
+import time
+
+from .a2a_client import A2AClientAgent
+from .metrics import RETRIES_TOTAL
+
+
+logger = logging.getLogger(__name__)
+
+
+class PeersNotReadyError(Exception):
+    """deadline 안에 준비되지 않은 피어가 있을 때 발생합니다."""
+
+    def __init__(self, missing: list[str], deadline: float):
+        self.missing = missing
+        self.deadline = deadline
+        super().__init__(f"{deadline:.1f}초 안에 준비되지 않은 에이전트: {', '.join(missing)}")
+
+
+async def wait_for_peers(
+    client_agent: A2AClientAgent,
+    names: list[str] | None = None,
+    deadline: float = 30.0,
+    initial_backoff: float = 0.05,
+    max_backoff: float = 0.5,
+) -> dict[str, float]:
+    """
+    모든 피어의 에이전트 카드 엔드포인트가 응답할 때까지 동시에 polling합니다.
+
+    고정 sleep 대신 사용하는 readiness barrier로, 모든 피어가 응답하는 즉시 반환하고
+    deadline이 지나면 준비되지 않은 에이전트 목록과 함께 실패합니다.
+    카드 조회에 성공한 피어는 최신 카드로 연결이 등록(또는 갱신)됩니다.
+
+    Args:
+        client_agent: 피어 목록과 연결을 가진 클라이언트
+        names: 기다릴 피어 이름, None이면 remote_agent_entries 전체
+        deadline: 최대 대기 시간(초)
+        initial_backoff: 첫 재시도 간격(초), 실패할 때마다 두 배
+        max_backoff: 재시도 간격 상한(초)
+
+    Returns:
+        dict[str, float]: 피어 이름 → 준비되기까지 걸린 시간(초)
+
+    Raises:
+        PeersNotReadyError: deadline 안에 응답하지 않은 피어가 있을 때
+    """
+    if names is None:
+        names = list(client_agent.entries_by_name.keys())
+
+    start = time.perf_counter()
+    ready: dict[str, float] = {}
+
+    async def probe(name: str):
+        entry = client_agent.entries_by_name[name]
+        backoff = initial_backoff
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await client_agent.retrieve_card(entry)
+                ready[name] = time.perf_counter() - start
+                logger.info(f"✅ {name} 준비 완료 ({ready[name]:.3f}s, 시도 {attempt}회)")
+                return
+            except Exception as e:
+                logger.debug(f"{name} 아직 준비되지 않음 (시도 {attempt}회): {e}")
+                RETRIES_TOTAL.inc(("readiness_probe",))
+            # 여러 에이전트가 동시에 재시도하지 않도록 jitter 적용
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
+            backoff = min(backoff * 2, max_backoff)
+
+    tasks = [asyncio.create_task(probe(name)) for name in names]
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    missing = [name for name in names if name not in ready]
+    if missing:
+        raise PeersNotReadyError(missing, deadline)
+    return ready
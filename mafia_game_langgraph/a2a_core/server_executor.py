@@ -1,26 +1,83 @@
 import os
 import asyncio
 import logging
+import time
+
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Iterable
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
 from a2a.utils import new_agent_text_message
 
 from .a2a_client import A2AClientAgent
 from .a2a_client import A2AServerEntry
+from .a2a_client import LoopbackHub
+from .a2a_client import PartialCallback
+from .call_policy import CallPolicy
+from .call_policy import deadline_scope
+from .call_policy import extract_deadline
+from .card_cache import AgentCardCache
+from .circuit_breaker import CircuitBreakerConfig
+from .http_pool import HttpPool
+from .http_pool import HttpPoolConfig
+from .metrics import ERRORS_TOTAL
+from .metrics import EXECUTE_SECONDS
+from .streaming import ArtifactStream
+from .streaming import current_stream
+from .tracing import extract
+from .tracing import span
 from base_agent import BaseAgent
+from codec import negotiate_version
+from messages import downgrade_message
+from messages import peek_message_type
 
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class MulticastResult:
+    """multicast 수신자 한 명에 대한 결과."""
+    agent_name: str
+    response: Any = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class GenericAgentExecutor(AgentExecutor):
 
     def __init__(self,
         agent: BaseAgent,
-        remote_agent_entries: list[A2AServerEntry]
+        remote_agent_entries: list[A2AServerEntry],
+        loopback: LoopbackHub | None = None,
+        http_pool_config: HttpPoolConfig | None = None,
+        card_cache: AgentCardCache | None = None,
+        call_policy: CallPolicy | None = None,
+        breaker_config: CircuitBreakerConfig | None = None,
+        http_pool: HttpPool | None = None,
+        discover_peers: bool = True,
     ):   
         self.agent = agent
-        self.client_agent = A2AClientAgent(remote_agent_entries)
+        # loopback이 주어지면 HTTP 대신 같은 프로세스의 executor로 직접 전달
+        # discover_peers=False이면 시작할 때 피어 카드를 조회하지 않음 (카드를 직접 등록하거나 첫 전송 때 조회)
+        self.client_agent = A2AClientAgent(remote_agent_entries, loopback=loopback,
+                                           auto_init=discover_peers,
+                                           pool_config=http_pool_config,
+                                           card_cache=card_cache,
+                                           owner=agent.agent_name,
+                                           call_policy=call_policy,
+                                           breaker_config=breaker_config,
+                                           http_pool=http_pool)
+
+        # 처리 중인 수신 메시지 + 응답을 기다리는 송신 메시지 수 (context_id별)
+        self._inflight: Counter[str] = Counter()
 
         # 등록된 에이전트 이름만 추출
         self.other_agentes = [entry.name for entry in remote_agent_entries]
@@ -43,14 +100,67 @@ class GenericAgentExecutor(AgentExecutor):
         task = context.current_task
         #print("Recv Request :", text)
 
-        # 2. 
-        response_text = await self.agent.handle_message( text )
+        # 2. 게임 상태는 A2A context_id 별로 분리됨
+        #    에이전트가 emit_partial로 보낸 부분 응답은 TaskArtifactUpdateEvent로 바로 전송
+        #    보낸 쪽 span(Message.metadata)을 부모로 trace를 이어감
+        #    보낸 쪽의 남은 시간(deadline)도 이어받아, 처리 중 보내는 메시지는 그 안에서 끝나야 함
+        stream = ArtifactStream(event_queue, context.task_id, context.context_id)
+        token = current_stream.set(stream)
+        message_type = peek_message_type(text)
+        metadata = context.message.metadata if context.message else None
+        parent = extract(metadata)
+        start = time.perf_counter()
+        try:
+            with self.track_inflight(context.context_id), \
+                    deadline_scope(extract_deadline(metadata)), \
+                    span(f"execute {message_type}", agent=self.agent.agent_name,
+                         context_id=context.context_id, parent=parent):
+                response_text = await self.agent.handle_message( text, context_id=context.context_id )
+        except Exception:
+            ERRORS_TOTAL.inc((self.agent.agent_name, "execute"))
+            raise
+        finally:
+            current_stream.reset(token)
+            EXECUTE_SECONDS.observe((self.agent.agent_name, message_type), time.perf_counter() - start)
 
-        # 3. 응답 전송
-        await event_queue.enqueue_event(new_agent_text_message(response_text))
+        # 3. 응답 전송 (스트리밍했으면 Task 완료, 아니면 Message 하나)
+        if stream.started:
+            logger.debug(f"first chunk {stream.time_to_first_chunk:.3f}s, {stream.chunks} chunks")
+            await stream.complete(response_text)
+        else:
+            await event_queue.enqueue_event(new_agent_text_message(response_text))
     
     
-    async def send_to_other(self, agent_name:str, user_text:str) -> None:
+    @contextmanager
+    def track_inflight(self, context_id: str | None):
+        """블록이 끝날 때까지 해당 게임의 진행 중인 메시지로 집계합니다."""
+        key = context_id or ""
+        self._inflight[key] += 1
+        try:
+            yield
+        finally:
+            self._inflight[key] -= 1
+            if self._inflight[key] <= 0:
+                del self._inflight[key]
+
+    def inflight(self, context_id: str | None = None) -> int:
+        """해당 게임에서 처리 중이거나 응답을 기다리는 메시지 수."""
+        return self._inflight.get(context_id or "", 0)
+
+
+    def reachable(self, agent_name: str) -> bool:
+        """피어의 circuit이 닫혀 있는지. 열려 있으면 보내도 즉시 실패하므로 매니저는 없는 것으로 봅니다."""
+        return self.client_agent.is_available(agent_name)
+
+
+    def codec_version(self, agent_name: str) -> int:
+        """피어 카드에서 협상한 메시지 코덱 버전. 카드가 없으면 JSON."""
+        connection = self.client_agent.remote_agent_connections.get(agent_name)
+        return negotiate_version(connection.card if connection else None)
+
+
+    async def send_to_other(self, agent_name:str, user_text:str, context_id: str | None = None,
+                            on_partial: PartialCallback | None = None) -> None:
         
         if agent_name not in self.client_agent.remote_agent_connections:
             print(f"❌ 에이전트 '{agent_name}' 을 찾을 수 없습니다.")
@@ -72,7 +182,12 @@ class GenericAgentExecutor(AgentExecutor):
                 print(f"✅ 에이전트 '{agent_name}' 연결 완료.")
 
            
-        response = await self.client_agent.send_message(agent_name, user_text, task_id=None, context_id=None)
+        # 피어가 압축 포맷을 지원하지 않으면 JSON으로 변환
+        user_text = downgrade_message(user_text, self.codec_version(agent_name))
+
+        with self.track_inflight(context_id), \
+                span(f"send → {agent_name}", agent=self.agent.agent_name, context_id=context_id):
+            response = await self.client_agent.send_message(agent_name, user_text, task_id=None, context_id=context_id, on_partial=on_partial)
         
         #if response :
         #    print("Response:") 
@@ -85,7 +200,56 @@ class GenericAgentExecutor(AgentExecutor):
         return response
 
 
-    async def broadcast_to_roles(self, roles: list[str], user_text: str) -> None:
+    async def multicast(
+        self,
+        recipients: Iterable[str],
+        text: str | Callable[[str], str],
+        concurrency: int = 8,
+        per_recipient_timeout: float | None = None,
+        context_id: str | None = None,
+    ) -> dict[str, MulticastResult]:
+        """
+        여러 에이전트에게 동시에 메시지를 전송하고 수신자별 결과를 반환합니다.
+
+        전체 소요 시간은 응답 시간의 합이 아니라 가장 느린 수신자에 맞춰집니다.
+
+        Args:
+            recipients: 수신 에이전트 이름 목록
+            text: 보낼 메시지, 또는 수신자 이름을 받아 메시지를 만드는 함수
+            concurrency: 동시에 전송할 최대 요청 수
+            per_recipient_timeout: 수신자별 응답 대기 시간(초), None이면 호출 정책의 timeout
+                (수신자가 처리 중 보내는 메시지에도 같은 deadline이 전달됨)
+            context_id: 메시지가 속한 게임의 A2A context_id
+
+        Returns:
+            dict[str, MulticastResult]: 수신자 이름 → 응답 또는 에러
+        """
+        names = list(dict.fromkeys(recipients))
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def send_one(agent_name: str) -> MulticastResult:
+            async with semaphore:
+                try:
+                    user_text = text(agent_name) if callable(text) else text
+                    with deadline_scope(per_recipient_timeout):
+                        response = await asyncio.wait_for(
+                            self.send_to_other(agent_name, user_text, context_id=context_id),
+                            timeout=per_recipient_timeout,
+                        )
+                    return MulticastResult(agent_name, response=response)
+                except asyncio.TimeoutError as e:
+                    print(f"⏰ '{agent_name}' 응답 시간 초과 ({per_recipient_timeout}s)")
+                    return MulticastResult(agent_name, error=e)
+                except Exception as e:
+                    print(f"❌ '{agent_name}' 전송 실패: {e}")
+                    return MulticastResult(agent_name, error=e)
+
+        with span("multicast", agent=self.agent.agent_name, context_id=context_id, recipients=len(names)):
+            results = await asyncio.gather(*(send_one(name) for name in names))
+        return {result.agent_name: result for result in results}
+
+
+    async def broadcast_to_roles(self, roles: list[str], user_text: str) -> dict[str, MulticastResult]:
         """
         특정 역할을 가진 에이전트들에게만 메시지를 브로드캐스트합니다.
         
@@ -93,12 +257,9 @@ class GenericAgentExecutor(AgentExecutor):
             roles: 역할 문자열 리스트 (예: ["mafia", "detective"])
             user_text: 보낼 메시지 내용
         """
-        for agent_name, role in self.agent.agent_roles.items():
-            if role not in roles:
-                continue  # 역할이 매칭되지 않으면 skip
-
-            print(f"\n🎯 '{agent_name}' ({role})에게 메시지를 전송 중...")
-            self.send_to_other(agent_name, user_text)
+        agent_roles = getattr(self.agent, "agent_roles", {})
+        recipients = [agent_name for agent_name, role in agent_roles.items() if role in roles]
+        return await self.multicast(recipients, user_text)
 
     async def cancel(
         self, context: RequestContext, event_queue: EventQueue
@@ -0,0 +1,87 @@
+import time
+
+from contextvars import ContextVar
+from typing import Optional
+from uuid import uuid4
+
+from a2a.server.events import EventQueue
+from a2a.server.tasks import TaskUpdater
+from a2a.types import Part
+from a2a.types import Task
+from a2a.types import TaskState
+from a2a.types import TaskStatus
+from a2a.types import TextPart
+
+
+class ArtifactStream:
+    """
+    A2A 요청 하나에 대한 부분 응답을 TaskArtifactUpdateEvent로 내보냅니다.
+
+    첫 조각이 나오면 Task(working)를 만들고 같은 artifact에 조각을 이어 붙이며,
+    complete에서 최종 응답을 상태 메시지로 보내고 Task를 완료합니다.
+    조각이 한 번도 없으면 아무 이벤트도 만들지 않으므로, 호출 측은 기존처럼 Message로 응답하면 됩니다.
+    """
+
+    def __init__(self, event_queue: EventQueue, task_id: str, context_id: str, name: str = "response"):
+        self.event_queue = event_queue
+        self.task_id = task_id
+        self.context_id = context_id
+        self.name = name
+        self.updater = TaskUpdater(event_queue, task_id, context_id)
+        self.artifact_id = str(uuid4())
+        self.chunks = 0
+        self.started_at = time.perf_counter()
+        self.first_chunk_at: Optional[float] = None
+
+    @property
+    def started(self) -> bool:
+        return self.chunks > 0
+
+    async def write(self, text: str):
+        if not text:
+            return
+        if not self.started:
+            self.first_chunk_at = time.perf_counter()
+            await self.event_queue.enqueue_event(Task(
+                id=self.task_id,
+                context_id=self.context_id,
+                status=TaskStatus(state=TaskState.working),
+            ))
+        await self.updater.add_artifact(
+            [Part(root=TextPart(text=text))],
+            artifact_id=self.artifact_id,
+            name=self.name,
+            append=self.started,
+            last_chunk=False,
+        )
+        self.chunks += 1
+
+    async def complete(self, final_text: str):
+        """스트림을 닫고 최종 응답으로 Task를 완료합니다."""
+        await self.updater.complete(
+            self.updater.new_agent_message([Part(root=TextPart(text=final_text))])
+        )
+
+    @property
+    def time_to_first_chunk(self) -> Optional[float]:
+        if self.first_chunk_at is None:
+            return None
+        return self.first_chunk_at - self.started_at
+
+
+# 현재 처리 중인 A2A 요청의 스트림 (executor.execute가 요청마다 설정)
+current_stream: ContextVar[Optional[ArtifactStream]] = ContextVar("a2a_artifact_stream", default=None)
+
+
+async def emit_partial(text: str) -> bool:
+    """
+    처리 중인 요청의 응답 스트림에 부분 텍스트를 보냅니다.
+
+    Returns:
+        bool: 스트림이 있어 전송했으면 True (A2A 요청 밖에서 호출되면 False)
+    """
+    stream = current_stream.get()
+    if stream is None:
+        return False
+    await stream.write(text)
+    return True
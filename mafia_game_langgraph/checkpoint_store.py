@@ -0,0 +1,422 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+
+from collections.abc import AsyncIterator
+from collections.abc import Iterator
+from collections.abc import Sequence
+from typing import Any
+from typing import Collection
+from typing import List
+from typing import Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import WRITES_IDX_MAP
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.base import ChannelVersions
+from langgraph.checkpoint.base import Checkpoint
+from langgraph.checkpoint.base import CheckpointMetadata
+from langgraph.checkpoint.base import CheckpointTuple
+from langgraph.checkpoint.base import get_checkpoint_id
+from langgraph.checkpoint.base import get_checkpoint_metadata
+from langgraph.checkpoint.base import writes_sort_key
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(tempfile.gettempdir(), "mafia_checkpoints.sqlite3")
+
+# 게임 상태(GameState.agent_info)에 저장되는 사용자 정의 타입 (module, class)
+# 허용 목록에 없으면 체크포인트에서 읽을 때 dict로 풀려 재개한 게임이 status.alive 등에서 실패함
+CHECKPOINT_TYPES = [
+    ("messages", "Role"),
+    ("langgraph_manager_agent", "AgentStatus"),
+]
+
+
+def default_serde() -> SerializerProtocol:
+    """게임 상태 타입을 허용한 체크포인트 직렬화기."""
+    return JsonPlusSerializer(allowed_msgpack_modules=CHECKPOINT_TYPES)
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    LangGraph 체크포인트를 로컬 SQLite(WAL 모드) 파일에 저장하는 checkpointer.
+
+    MemorySaver는 모든 단계의 체크포인트를 프로세스 메모리에 계속 쌓고, 매니저가
+    죽으면 모두 잃어버립니다. 이 저장소는 체크포인트를 디스크에 남기므로 재시작한
+    매니저가 같은 thread_id(= 게임 context_id)로 마지막 단계부터 이어서 진행할 수 있고,
+    보관 정책에 따라 오래된 체크포인트를 저장 시점에 바로 정리합니다.
+      - keep_last: thread(네임스페이스)마다 최근 K개만 보관
+      - boundary_nodes: 지정하면 최근 K개 이전의 체크포인트 중 해당 노드 직전
+                        (예: 'day_phase', 'night_phase') 체크포인트만 추가로 보관
+    """
+
+    def __init__(self,
+        path: Optional[str] = None,
+        keep_last: int = 3,
+        boundary_nodes: Optional[Collection[str]] = None,
+        serde: Optional[SerializerProtocol] = None,
+    ):
+        """
+        Args:
+            path: SQLite 파일 경로, None이면 MAFIA_CHECKPOINT_PATH 또는 임시 디렉터리
+            keep_last: thread마다 보관할 최근 체크포인트 수 (재개에는 1개면 충분)
+            boundary_nodes: 최근 K개 외에 추가로 보관할 단계 경계 노드 이름들
+            serde: 체크포인트 직렬화기, None이면 게임 상태 타입을 허용한 default_serde()
+        """
+        super().__init__(serde=serde or default_serde())
+        self.path = path or os.getenv("MAFIA_CHECKPOINT_PATH", DEFAULT_CHECKPOINT_PATH)
+        self.keep_last = max(1, keep_last)
+        self.boundary_nodes = set(boundary_nodes or ())
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                parent_checkpoint_id TEXT,
+                type TEXT,
+                checkpoint BLOB,
+                metadata_type TEXT,
+                metadata BLOB,
+                is_boundary INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+            )""")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS writes (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                channel TEXT NOT NULL,
+                type TEXT,
+                value BLOB,
+                task_path TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+            )""")
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """config의 checkpoint_id에 해당하는 체크포인트, 없으면 thread의 최신 체크포인트를 반환합니다."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        with self._lock:
+            if checkpoint_id:
+                row = self._conn.execute(
+                    "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+                    "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+                    "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            return self._to_tuple(thread_id, checkpoint_ns, row)
+
+    def list(self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """조건에 맞는 체크포인트를 최신순으로 반환합니다."""
+        query = ("SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+                 "type, checkpoint, metadata_type, metadata FROM checkpoints")
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        for thread_id, checkpoint_ns, *row in rows:
+            if limit is not None and limit <= 0:
+                break
+            with self._lock:
+                item = self._to_tuple(thread_id, checkpoint_ns, row)
+            if filter and not all(item.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            if limit is not None:
+                limit -= 1
+            yield item
+
+    def list_thread_ids(self) -> List[str]:
+        """체크포인트가 남아 있는 모든 thread_id를 반환합니다."""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT thread_id FROM checkpoints").fetchall()
+        return [row[0] for row in rows]
+
+    def _to_tuple(self, thread_id: str, checkpoint_ns: str, row: Sequence) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata_type, metadata = row
+        writes = self._conn.execute(
+            "SELECT task_id, channel, type, value, idx, task_path FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        writes.sort(key=lambda w: writes_sort_key(w[5], w[0], w[4]))
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((type_, checkpoint)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((w_type, value)))
+                for task_id, channel, w_type, value, _, _ in writes
+            ],
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+    def put(self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """체크포인트를 저장하고 보관 정책에 따라 같은 thread의 오래된 체크포인트를 정리합니다."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        type_, serialized = self.serde.dumps_typed(checkpoint)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, "
+                    "parent_checkpoint_id, type, checkpoint, metadata_type, metadata, is_boundary) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, checkpoint["id"], config["configurable"].get("checkpoint_id"),
+                     type_, serialized, metadata_type, serialized_metadata,
+                     int(self.is_boundary(checkpoint))),
+                )
+                self._apply_retention(thread_id, checkpoint_ns)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """노드 실행 중간 결과(pending writes)를 저장합니다."""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        # 특수 채널(에러, 인터럽트 등, idx < 0)은 덮어쓰고, 일반 채널은 처음 기록만 유지
+        replace_rows, insert_rows = [], []
+        for idx, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, idx)
+            type_, serialized = self.serde.dumps_typed(value)
+            row = (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type_, serialized, task_path)
+            (replace_rows if idx < 0 else insert_rows).append(row)
+
+        columns = "(thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, task_path)"
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO writes {columns} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", replace_rows)
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO writes {columns} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", insert_rows)
+
+    def is_boundary(self, checkpoint: Checkpoint) -> bool:
+        """체크포인트가 boundary_nodes 중 하나를 실행하기 직전 상태인지 확인합니다."""
+        updated = checkpoint.get("updated_channels") or ()
+        return any(f"branch:to:{node}" in updated for node in self.boundary_nodes)
+
+    def _apply_retention(self, thread_id: str, checkpoint_ns: str):
+        # 최근 keep_last개 이전 체크포인트 중 단계 경계가 아닌 것을 삭제
+        stale = self._conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND is_boundary = 0 "
+            "AND checkpoint_id < (SELECT MIN(checkpoint_id) FROM ("
+            "  SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "  ORDER BY checkpoint_id DESC LIMIT ?))",
+            (thread_id, checkpoint_ns, thread_id, checkpoint_ns, self.keep_last),
+        ).fetchall()
+        if stale:
+            self._delete_checkpoints(thread_id, checkpoint_ns, [row[0] for row in stale])
+
+    def _delete_checkpoints(self, thread_id: str, checkpoint_ns: str, checkpoint_ids: List[str]):
+        params = [(thread_id, checkpoint_ns, checkpoint_id) for checkpoint_id in checkpoint_ids]
+        self._conn.executemany(
+            "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?", params)
+        self._conn.executemany(
+            "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?", params)
+
+    # ------------------------------------------------------------------
+    # 삭제
+    # ------------------------------------------------------------------
+    def delete_thread(self, thread_id: str) -> None:
+        """thread(게임)의 모든 체크포인트를 삭제합니다."""
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            self._conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+
+    def prune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        """
+        지정한 thread들의 체크포인트를 정리합니다.
+
+        Args:
+            thread_ids: 정리할 thread 목록
+            strategy: "keep_latest"면 네임스페이스마다 최신 체크포인트만 남기고, "delete"면 모두 삭제
+        """
+        if strategy == "delete":
+            for thread_id in thread_ids:
+                self.delete_thread(thread_id)
+            return
+        if strategy != "keep_latest":
+            raise ValueError(f"지원하지 않는 prune 전략입니다: {strategy}")
+
+        with self._lock:
+            for thread_id in thread_ids:
+                namespaces = self._conn.execute(
+                    "SELECT checkpoint_ns, MAX(checkpoint_id) FROM checkpoints WHERE thread_id = ? "
+                    "GROUP BY checkpoint_ns",
+                    (thread_id,),
+                ).fetchall()
+                for checkpoint_ns, latest in namespaces:
+                    stale = self._conn.execute(
+                        "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                        "AND checkpoint_id < ?",
+                        (thread_id, checkpoint_ns, latest),
+                    ).fetchall()
+                    self._delete_checkpoints(thread_id, checkpoint_ns, [row[0] for row in stale])
+
+    # ------------------------------------------------------------------
+    # 비동기 버전 (SQLite 호출은 스레드에서 실행해 이벤트 루프를 막지 않음)
+    # ------------------------------------------------------------------
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: [*self.list(config, filter=filter, before=before, limit=limit)]
+        )
+        for item in items:
+            yield item
+
+    async def aput(self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    async def aprune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        await asyncio.to_thread(self.prune, thread_ids, strategy=strategy)
+
+    async def alist_thread_ids(self) -> List[str]:
+        return await asyncio.to_thread(self.list_thread_ids)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def build_checkpointer(config: Optional[dict] = None) -> BaseCheckpointSaver:
+    """
+    에이전트 설정의 "checkpointer" 항목으로 LangGraph checkpointer를 생성합니다.
+
+    예시:
+        "checkpointer": {"backend": "sqlite", "path": "tmp/mafia.sqlite3",
+                         "keepLast": 3, "boundaryNodes": ["day_phase", "night_phase"]}
+
+    Args:
+        config: "checkpointer" 설정, None이면 기본값(sqlite)을 사용
+
+    Returns:
+        BaseCheckpointSaver: "memory"면 MemorySaver, "sqlite"면 SqliteCheckpointSaver
+    """
+    config = config or {}
+    backend = config.get("backend", "sqlite")
+    if backend == "memory":
+        return MemorySaver(serde=default_serde())
+    if backend == "sqlite":
+        return SqliteCheckpointSaver(
+            path=config.get("path"),
+            keep_last=config.get("keepLast", 3),
+            boundary_nodes=config.get("boundaryNodes"),
+        )
+    raise ValueError(f"지원하지 않는 checkpointer backend입니다: {backend}")
@@ -0,0 +1,246 @@
+import argparse
+import os
+import re
+import sys
+import time
+
+import uvicorn
+import asyncio
+
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from agent_factory import build_agent_card
+from agent_factory import build_agent_from_config
+from a2a_core.a2a_client import A2AServerEntry
+from a2a_core.config_loader import agent_url
+from a2a_core.config_loader import load_a2a_config
+from a2a_core.http_pool import HttpPool
+from a2a_core.http_pool import HttpPoolConfig
+from a2a_core.readiness import PeersNotReadyError
+from a2a_core.readiness import wait_for_peers
+from langgraph_manager_agent import LangGraphManagerAgent
+from member_agent import MemberAgent
+
+
+MANAGER_AGENT_NAME = "Manager Agent"
+# agent_cards/*.json과 같은 capabilities (streaming이 없으면 QUESTION 답변이 스트리밍되지 않아 실제 테이블과 다른 경로를 탐)
+ROSTER_CAPABILITIES = {"streaming": True, "pushNotifications": False}
+
+
+def load_cards(config_dir: str) -> list[dict]:
+    """config_dir의 모든 에이전트 카드(JSON)를 읽습니다."""
+    return [
+        load_a2a_config(os.path.join(config_dir, filename))
+        for filename in sorted(os.listdir(config_dir))
+        if filename.endswith(".json")
+    ]
+
+
+def make_host_roster(num_players: int, host: str, base_port: int, llm: dict | None = None) -> list[dict]:
+    """
+    Manager(base_port)와 num_players명의 멤버(base_port + i) 카드를 생성합니다.
+
+    Args:
+        num_players: 멤버 수
+        host: 서버 주소
+        base_port: Manager 포트, 멤버는 그 다음 포트부터
+        llm: 멤버 LLM 설정 (예: {"backend": "fake"}), None이면 규칙 기반 멤버
+    """
+    configs = [{
+        "name": MANAGER_AGENT_NAME,
+        "description": "Manager",
+        "host": host,
+        "port": base_port,
+        "version": "1.0.0",
+        "capabilities": dict(ROSTER_CAPABILITIES),
+    }]
+    for i in range(1, num_players + 1):
+        configs.append({
+            "name": f"Player{i:03d} Agent",
+            "description": f"Member{i}",
+            "host": host,
+            "port": base_port + i,
+            "version": "1.0.0",
+            "capabilities": dict(ROSTER_CAPABILITIES),
+            "useLlm": llm is not None,
+            "llm": llm,
+        })
+    return configs
+
+
+def slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def route_by_path(configs: list[dict], host: str, port: int) -> list[dict]:
+    """모든 에이전트를 서버 하나(host:port)의 /agents/<이름>/ 경로로 옮긴 카드를 반환합니다."""
+    return [{**config, "host": host, "port": port, "path": f"agents/{slug(config['name'])}"} for config in configs]
+
+
+class AgentHost:
+    """
+    여러 에이전트를 한 프로세스, 한 이벤트 루프에서 실행합니다.
+
+    - ports 모드: 카드마다 uvicorn 서버를 하나씩 (카드의 host:port 그대로)
+    - paths 모드: uvicorn 서버 하나에 에이전트별 경로(/agents/<이름>/)로 mount
+
+    import된 모듈, 연결 풀, LLM 캐시를 모든 에이전트가 공유하므로
+    플레이어 수가 늘어도 인터프리터는 하나입니다.
+    """
+
+    def __init__(self, configs: list[dict], hosted: list[str] | None = None,
+                 mode: str = "ports", pool_config: HttpPoolConfig | None = None, log_level: str = "warning"):
+        """
+        Args:
+            configs: 테이블의 모든 에이전트 카드 (다른 프로세스에서 실행되는 에이전트 포함)
+            hosted: 이 프로세스에서 실행할 에이전트 이름, None이면 전부
+            mode: "ports" 또는 "paths" (paths이면 configs는 route_by_path로 옮긴 카드여야 함)
+            pool_config: 모든 에이전트가 공유하는 HTTP 연결 풀 설정
+            log_level: uvicorn 로그 레벨 (에이전트 수만큼 접속 로그가 쌓이지 않도록 기본 warning)
+        """
+        self.mode = mode
+        self.log_level = log_level
+        self.http_pool = HttpPool(pool_config)
+        entries = [A2AServerEntry(name=config["name"], url=agent_url(config)) for config in configs]
+
+        self.configs = [config for config in configs if hosted is None or config["name"] in hosted]
+        self.handlers = {}
+        self.apps = {}
+        for config in self.configs:
+            others = [entry for entry in entries if entry.name != config["name"]]
+            # 에이전트마다 시작 시 모든 피어 카드를 조회하면 N² 요청이 되므로 끄고, 아래에서 카드를 직접 등록
+            app, handler = build_agent_from_config(config, others, http_pool=self.http_pool, discover_peers=False)
+            self.apps[config["name"]] = app
+            self.handlers[config["name"]] = handler
+
+        # 같은 프로세스의 피어 카드는 이미 알고 있으므로 네트워크 조회 없이 등록
+        cards = [build_agent_card(config) for config in self.configs]
+        for handler in self.handlers.values():
+            client_agent = handler.agent_executor.client_agent
+            for card in cards:
+                if card.name != client_agent.owner:
+                    client_agent.register_agent_card(card)
+        # 다른 프로세스에서 실행되는 피어 (서버가 뜬 뒤 조회)
+        self.remote_entries = [entry for entry in entries if entry.name not in self.handlers]
+
+        self.servers: dict[str, uvicorn.Server] = {}
+        # 아직 게임이 끝나지 않은 에이전트 (paths 모드에서는 모두 끝나야 서버 종료)
+        self.running: set[str] = set(self.handlers)
+        for name, handler in self.handlers.items():
+            agent = handler.agent_executor.agent
+            if isinstance(agent, (LangGraphManagerAgent, MemberAgent)):
+                agent.set_server_shutdown_callback(lambda name=name: self.shutdown(name))
+
+    def build_servers(self) -> list[uvicorn.Server]:
+        if self.mode == "paths":
+            first = self.configs[0]
+            app = Starlette(routes=[
+                Mount("/" + config["path"].strip("/"), app=self.apps[config["name"]]) for config in self.configs
+            ])
+            server = uvicorn.Server(uvicorn.Config(app=app, host=first["host"], port=first["port"],
+                                                   log_level=self.log_level, lifespan="off"))
+            self.servers = {name: server for name in self.handlers}
+            return [server]
+
+        for config in self.configs:
+            self.servers[config["name"]] = uvicorn.Server(uvicorn.Config(
+                app=self.apps[config["name"]], host=config["host"], port=config["port"],
+                log_level=self.log_level, lifespan="off"))
+        return list(self.servers.values())
+
+    def shutdown(self, name: str):
+        """에이전트의 게임이 끝나면 호출됩니다. (main.py의 shutdown_server와 같은 역할)"""
+        self.running.discard(name)
+        server = self.servers.get(name)
+        if server is None:
+            return
+        if self.mode == "paths" and self.running:
+            return
+        print(f"🛑 {name} 서버 종료")
+        server.should_exit = True
+
+    def shutdown_all(self):
+        for server in self.servers.values():
+            server.should_exit = True
+
+    async def serve(self, readiness_timeout: float = 30):
+        started_at = time.perf_counter()
+        servers = self.build_servers()
+        tasks = [asyncio.create_task(server.serve()) for server in servers]
+        print(f"✅ 에이전트 {len(self.handlers)}개를 서버 {len(servers)}개로 실행 중 ({self.mode} 모드)")
+        discovery = [
+            asyncio.create_task(handler.agent_executor.client_agent.init_remote_agents(self.remote_entries))
+            for handler in self.handlers.values()
+        ] if self.remote_entries else []
+
+        try:
+            manager = self.handlers.get(MANAGER_AGENT_NAME)
+            if manager is not None:
+                # Manager가 이 프로세스에 있으면 모든 멤버가 응답할 때까지 기다린 뒤 게임 시작
+                try:
+                    ready = await wait_for_peers(manager.agent_executor.client_agent, deadline=readiness_timeout)
+                except PeersNotReadyError as e:
+                    print(f"❌ 게임을 시작할 수 없습니다. 준비되지 않은 에이전트: {e.missing}")
+                    self.shutdown_all()
+                    await asyncio.gather(*tasks)
+                    sys.exit(1)
+                print(f"✅ 모든 에이전트 준비 완료 (가장 늦은 에이전트: {max(ready.values(), default=0):.3f}s)")
+                print(f"⏱️ 서버 시작 → 첫 게임 메시지: {time.perf_counter() - started_at:.3f}s")
+                agent = manager.agent_executor.agent
+                initial_state = {
+                    "agent_info" : {}, 
+                    "round" : 1, 
+                    "game_over" : False, 
+                    "winner" : {}
+                }
+                # 이전 실행에서 끝나지 않은 게임이 있으면 체크포인트에서 이어서 진행
+                unfinished = await agent.unfinished_games()
+                await agent.start_game(initial_state, context_id=unfinished[0] if unfinished else None)
+
+            await asyncio.gather(*tasks)
+        finally:
+            for task in discovery:
+                task.cancel()
+            await self.http_pool.aclose()
+
+
+async def main(args: argparse.Namespace):
+    if args.roster:
+        configs = make_host_roster(args.roster, args.host, args.port,
+                                   llm={"backend": "fake", "latency": args.fake_llm} if args.fake_llm else None)
+    else:
+        configs = load_cards(args.config_dir)
+    if args.mode == "paths":
+        configs = route_by_path(configs, args.host, args.port)
+
+    names = [config["name"] for config in configs]
+    hosted = [name for name in names if name not in args.exclude]
+    if args.members_only:
+        hosted = [name for name in hosted if name != MANAGER_AGENT_NAME]
+
+    host = AgentHost(configs, hosted=hosted, mode=args.mode, pool_config=HttpPoolConfig.from_config(
+        {"maxConnectionsPerPeer": args.max_connections}))
+    await host.serve(readiness_timeout=args.readiness_timeout)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="여러 에이전트를 한 프로세스(한 이벤트 루프)에서 실행합니다.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("config_dir", nargs="?", help="에이전트 카드 디렉터리 (main.py의 카드와 같은 형식)")
+    source.add_argument("--roster", type=int, metavar="N", help="카드 대신 Manager + 멤버 N명을 생성")
+    parser.add_argument("--mode", choices=["ports", "paths"], default="ports",
+                        help="ports: 카드마다 서버 하나, paths: 서버 하나에 /agents/<이름>/ 경로로 mount")
+    parser.add_argument("--host", default="127.0.0.1", help="--roster 또는 paths 모드의 서버 주소")
+    parser.add_argument("--port", type=int, default=21000, help="--roster의 시작 포트 또는 paths 모드의 서버 포트")
+    parser.add_argument("--members-only", action="store_true", help="Manager는 실행하지 않음 (다른 프로세스에서 실행)")
+    parser.add_argument("--exclude", action="append", default=[], metavar="NAME", help="이 프로세스에서 실행하지 않을 에이전트")
+    parser.add_argument("--fake-llm", metavar="LATENCY", help="--roster 멤버가 fake LLM을 사용 (예: lognormal:800,0.6)")
+    parser.add_argument("--max-connections", type=int, default=32, help="피어(에이전트)별 최대 HTTP 연결 수 (공유 풀)")
+    parser.add_argument("--readiness-timeout", type=float, default=30, help="Manager가 멤버를 기다리는 최대 시간(초)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("👋 서버가 정상적으로 종료되었습니다.")
@@ -2,6 +2,7 @@ import logging
 import random
 import json
 import asyncio
+import uuid
 
 from math import floor
 from typing import Dict
@@ -11,17 +12,25 @@ from typing import Callable
 from collections import Counter
 
 from base_agent import BaseAgent
+from checkpoint_store import SqliteCheckpointSaver
 from a2a_core.server_executor import GenericAgentExecutor
+from a2a_core.server_executor import MulticastResult
+from a2a_core.tracing import span
+from night_phase import NightPhase
+from night_phase import NightPolicy
+from vote_collector import VoteCollector
 from messages import Role
 from messages import (
     Role,
     MessageType,
+    create_broadcast,
     create_message
     )
 from dataclasses import dataclass
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langchain_core.runnables import RunnableConfig
 #from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 
@@ -43,7 +52,9 @@ logger = logging.getLogger(__name__)
 
 class LangGraphManagerAgent(BaseAgent):
     """Manager Agent."""
-    def __init__(self, agent_name: str, description: str):
+    def __init__(self, agent_name: str, description: str, checkpointer: Optional[BaseCheckpointSaver] = None,
+                 discussion_max_wait: float = 15, night_policy: Optional[NightPolicy] = None,
+                 vote_deadline: float = 10):
         
         super().__init__(
             agent_name=agent_name,
@@ -54,6 +65,17 @@ class LangGraphManagerAgent(BaseAgent):
         self.name = agent_name
         self.agent_info: Dict[str, AgentStatus] = {}
         self.executor: GenericAgentExecutor | None = None
+        # 게임 진행 상태 저장소 (기본: 로컬 SQLite, 매니저 재시작 시 진행 중이던 단계부터 재개)
+        self.checkpointer = checkpointer or SqliteCheckpointSaver()
+        # 낮 대화가 잦아들기를 기다리는 최대 시간(초), 0이면 기다리지 않음
+        self.discussion_max_wait: float = discussion_max_wait
+        self.quiescence_poll_interval: float = 0.05
+        # 밤 행동 요청의 역할별 응답 기한과 마피아 quorum
+        self.night_policy: NightPolicy = night_policy or NightPolicy()
+        # 투표 단계 최대 시간(초), 결과가 확정되면 그 전에 끝남
+        self.vote_deadline: float = vote_deadline
+        # 진행 중인 게임의 context_id (모두 끝나야 서버 종료 콜백 실행)
+        self.active_games: set[str] = set()
 
         self.graph = StateGraph(GameState)
         self.setup_graph()
@@ -79,7 +101,7 @@ class LangGraphManagerAgent(BaseAgent):
             return END if state.get("game_over") else "day_phase"        
         self.graph.add_conditional_edges("check_end", next_phase)
 
-        self.runnable = self.graph.compile(checkpointer=MemorySaver())
+        self.runnable = self.graph.compile(checkpointer=self.checkpointer)
     
     
     def initialize(self, agent_names: list[str], executor: GenericAgentExecutor = None):
@@ -91,32 +113,78 @@ class LangGraphManagerAgent(BaseAgent):
         self.shutdown_callback = callback
 
 
-    async def start_game(self, initial_state:dict):
-        print("✅ LangGraph: 게임 시작")
-        result_state = await self.runnable.ainvoke(initial_state,
-            config={
-                "configurable": {
-                    "thread_id": "game-001",
-                    "checkpoint_id": "mafia-001",
-                    "checkpoint_ns": "mafia-namespace"
-                }
+    async def start_game(self, initial_state:dict, context_id: Optional[str] = None) -> dict:
+        """
+        게임 한 판을 실행합니다. 게임마다 LangGraph thread가 분리되므로 여러 게임을 동시에 실행할 수 있습니다.
+        같은 context_id의 끝나지 않은 체크포인트가 있으면 처음부터 다시 하지 않고 마지막 단계부터 재개합니다.
+
+        Args:
+            initial_state: 그래프 초기 상태
+            context_id: 게임을 식별하는 A2A context_id (LangGraph thread_id로 사용), None이면 새로 생성
+
+        Returns:
+            dict: 게임 종료 시점의 상태
+        """
+        context_id = context_id or str(uuid.uuid4())
+        config = {
+            "configurable": {
+                "thread_id": context_id,
             }
-        )
+        }
+
+        self.active_games.add(context_id)
+        try:
+            snapshot = await self.runnable.aget_state(config)
+            # 게임 한 판이 하나의 trace (MAFIA_TRACE_DIR가 설정된 경우)
+            with span("game", agent=self.agent_name, context_id=context_id, resumed=bool(snapshot.next)):
+                if snapshot.next:
+                    print(f"♻️ LangGraph: 체크포인트에서 게임 재개 ({context_id}, 다음 단계: {', '.join(snapshot.next)})")
+                    result_state = await self.runnable.ainvoke(None, config=config)
+                else:
+                    print(f"✅ LangGraph: 게임 시작 ({context_id})")
+                    result_state = await self.runnable.ainvoke(initial_state, config=config)
+        finally:
+            self.active_games.discard(context_id)
+
+        # 끝난 게임은 최종 체크포인트 하나만 남김
+        try:
+            await self.checkpointer.aprune([context_id])
+        except NotImplementedError:
+            pass
 
         print("✅ 게임 종료. 최종 상태:", result_state)
-        # 게임 종료 후 서버 종료
-        if hasattr(self, "shutdown_callback"):
+        # 진행 중인 게임이 더 없을 때만 서버 종료
+        if hasattr(self, "shutdown_callback") and not self.active_games:
             self.shutdown_callback()
+        return result_state
+
+    async def unfinished_games(self) -> list[str]:
+        """체크포인트 저장소에 남아 있는, 아직 끝나지 않은 게임의 context_id 목록을 반환합니다."""
+        if not isinstance(self.checkpointer, SqliteCheckpointSaver):
+            return []
+
+        unfinished = []
+        for context_id in await self.checkpointer.alist_thread_ids():
+            snapshot = await self.runnable.aget_state({"configurable": {"thread_id": context_id}})
+            if snapshot.next:
+                unfinished.append(context_id)
+        return unfinished
+
+    @staticmethod
+    def get_context_id(config: RunnableConfig) -> Optional[str]:
+        """노드 실행 config에서 현재 게임의 context_id(thread_id)를 꺼냅니다."""
+        return config.get("configurable", {}).get("thread_id")
     
 
-    async def node_assign_roles(self, state: GameState):
+    async def node_assign_roles(self, state: GameState, config: RunnableConfig):
         """게임내 역할을 무작위로 할당합니다."""
-        agent_names = self.agent_list
+        context_id = self.get_context_id(config)
+        agent_names = list(self.agent_list)
         total_agents = len(agent_names)
         if total_agents < 3:
             raise ValueError("플레이어 수가 3명 이상이어야 역할을 배정할 수 있습니다.")
 
-        # 셔플
+        # 셔플 (게임마다 배정하므로 원본 목록은 유지)
         random.shuffle(agent_names)
 
         # mafia 수 = 총 인원의 1/3, 최소 1명
@@ -137,9 +205,12 @@ class LangGraphManagerAgent(BaseAgent):
             print(f"  - {agent_name}: {status.role.name} (alive={status.alive})")
         
         for agent_name, status in state["agent_info"].items():
+            if not self.executor.reachable(agent_name):
+                print(f"🔌 {agent_name} 연결 차단 중, 역할 전송 생략")
+                continue
             try:
                 msg = create_message(MessageType.ROLE_ASSIGNMENT, self.name, agent_name, role=status.role)
-                asyncio.create_task( self.executor.send_to_other(agent_name, msg))
+                asyncio.create_task( self.executor.send_to_other(agent_name, msg, context_id=context_id))
                 print(f"역할 전송 완료: {agent_name} → {status.role.name}")
             except Exception as e:
                 print(f"역할 전송 실패: {agent_name} → {status.role.name} ({e})")
@@ -147,62 +218,109 @@ class LangGraphManagerAgent(BaseAgent):
         return state
 
 
-    async def node_day_phase(self, state: GameState):
+    async def node_day_phase(self, state: GameState, config: RunnableConfig):
+        context_id = self.get_context_id(config)
         round = state["round"]
         print(f"{round} 낮 시작 메시지를 모든 에이전트에게 전송합니다.")
 
         if round <= 1 : 
             
-            for nm, status in state["agent_info"].items():
-                if status.alive:
-                    msg = create_message(MessageType.INTRO_REQUEST, self.name, nm, round=round)
-                    asyncio.create_task(self.executor.send_to_other(nm, msg))
+            for nm in self.present_agents(state["agent_info"]):
+                msg = create_message(MessageType.INTRO_REQUEST, self.name, nm, round=round)
+                asyncio.create_task(self.executor.send_to_other(nm, msg, context_id=context_id))
 
         else : 
             print("💬 토론 시간이 주어집니다. 멤버들이 자유롭게 대화할 수 있습니다.")
 
-            for nm, status in state["agent_info"].items():
-                if status.alive:
-                    msg = create_message(MessageType.DAY_ACTION_REQUEST, self.name, nm, round=round)
-                    asyncio.create_task(self.executor.send_to_other(nm, msg))
-            
+            for nm in self.present_agents(state["agent_info"]):
+                msg = create_message(MessageType.DAY_ACTION_REQUEST, self.name, nm, round=round)
+                asyncio.create_task(self.executor.send_to_other(nm, msg, context_id=context_id))
 
-            # 비동기로 잠시 대기 (예: 15초)
-            await asyncio.sleep(15)
+        # 고정 대기 대신 멤버들 사이의 대화가 끝나는 즉시 다음 단계로 (최대 discussion_max_wait초)
+        await self.wait_for_quiescence(state, context_id, self.discussion_max_wait)
 
+        if round > 1:
             print("🕒 토론 시간이 종료되었습니다.")
 
         state["round"] = round+1
         return state
 
 
-    async def node_vote_phase(self, state: GameState) -> GameState:
-        # 1. Vote 
-        votes: Dict[str, str] = {}
-        agent_info = state["agent_info"]
-        alive_agents = [name for name, status in agent_info.items() if status.alive]
+    async def wait_for_quiescence(self, state: GameState, context_id: Optional[str], max_wait: float,
+                                  settle_polls: int = 2) -> float:
+        """
+        멤버들 사이에 처리 중인 대화가 없어질 때까지 기다립니다.
 
-        async def send_and_receive_vote(agent_name: str):
-            msg = create_message(MessageType.VOTE_REQUEST, self.name, agent_name, round=state["round"])
-            try:
-                response = await asyncio.wait_for(self.executor.send_to_other(agent_name, msg), timeout=10)
-                if response:
-                    print(f"🗳️ {agent_name} → {response[0]}")
-                    return (agent_name, response[0])
-                else:
-                    print(f"⚠️ {agent_name} 응답 없음.")
-                    return (agent_name, None)
-            except Exception as e:
-                print(f"❌ {agent_name} 응답 실패: {e}")
-                return (agent_name, None)
+        각 멤버에게 STATUS_REQUEST로 진행 중인 메시지 수를 묻고, 매니저 자신이 보낸
+        응답 대기 중인 메시지까지 합쳐 settle_polls번 연속 0이면 즉시 반환합니다.
 
-        # 모든 요청을 병렬 실행
-        results = await asyncio.gather(*(send_and_receive_vote(name) for name in alive_agents))
+        Args:
+            state: 현재 게임 상태
+            context_id: 게임의 A2A context_id
+            max_wait: 최대 대기 시간(초), 0 이하이면 기다리지 않음
+            settle_polls: 0이 연속으로 관측되어야 하는 횟수
 
-        # 결과 정리
-        votes: Dict[str, str] = {
-            voter: vote for voter, vote in results if vote is not None
-        }
+        Returns:
+            float: 실제로 기다린 시간(초)
+        """
+        if max_wait <= 0 or not self.executor:
+            return 0.0
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + max_wait
+        quiet = 0
+
+        while True:
+            # 매니저 자신의 전송도 포함 (STATUS_REQUEST를 보내기 전에 읽음)
+            pending = self.executor.inflight(context_id)
+            message = create_message(MessageType.STATUS_REQUEST, self.name, "All-Alive")
+            remaining = max(deadline - loop.time(), 0.01)
+            results = await self.executor.multicast(
+                self.present_agents(state["agent_info"]),
+                message,
+                per_recipient_timeout=remaining,
+                context_id=context_id,
+            )
+            for result in results.values():
+                pending += self.parse_inflight(result)
+
+            quiet = quiet + 1 if pending == 0 else 0
+            elapsed = loop.time() - start
+            if quiet >= settle_polls:
+                print(f"🤫 대화 종료 감지 ({elapsed:.2f}s)")
+                return elapsed
+            if loop.time() >= deadline:
+                print(f"⏰ 최대 대기 시간 도달, 진행 중인 대화 {pending}건 ({elapsed:.2f}s)")
+                return elapsed
+
+            await asyncio.sleep(min(self.quiescence_poll_interval, max(deadline - loop.time(), 0)))
+
+    @staticmethod
+    def parse_inflight(result: MulticastResult) -> int:
+        """STATUS_REQUEST 응답에서 진행 중인 메시지 수를 읽습니다. 알 수 없으면 0으로 봅니다."""
+        if not result.ok or not result.response:
+            return 0
+        try:
+            return int(json.loads(result.response[0]).get("inflight", 0))
+        except (TypeError, ValueError, AttributeError):
+            return 0
+
+
+    async def node_vote_phase(self, state: GameState, config: RunnableConfig) -> GameState:
+        context_id = self.get_context_id(config)
+        # 1. Vote 
+        agent_info = state["agent_info"]
+
+        # 모든 요청을 병렬 실행, 도착하는 순서대로 집계 (결과가 확정되면 나머지를 기다리지 않음)
+        collector = VoteCollector(
+            self.executor, self.name, context_id,
+            message_for=lambda agent_name: create_message(MessageType.VOTE_REQUEST, self.name, agent_name,
+                                                          round=state["round"]),
+            deadline=self.vote_deadline,
+        )
+        result = await collector.collect(self.present_agents(agent_info))
+        votes: Dict[str, str] = result.votes
 
         # 투표 집계 후 상태에 반영
         state["last_votes"] = votes
@@ -222,9 +340,11 @@ class LangGraphManagerAgent(BaseAgent):
         if target and target in agent_info : 
             state["agent_info"][target].alive = False
             print(f"🔪 {target} 가 처형되었습니다.")
-            for agent_name in agent_info.keys():
-                msg = create_message(MessageType.EXECUTION_RESULT, self.name, agent_name, target=target)
-                await self.executor.send_to_other(agent_name, msg)
+            await self.executor.multicast(
+                self.reachable_agents(agent_info),
+                create_broadcast(MessageType.EXECUTION_RESULT, self.name, target=target),
+                context_id=context_id,
+            )
 
         else : 
             print("⚖️ 처형 없음 (동률 또는 투표 실패).")
@@ -232,70 +352,28 @@ class LangGraphManagerAgent(BaseAgent):
         return state
 
 
-    async def node_night_phase(self, state: GameState):
-        
+    async def node_night_phase(self, state: GameState, config: RunnableConfig):
+        context_id = self.get_context_id(config)
+
         print("\n🌙 밤이 되었습니다. 마피아는 공격할 대상을 선택하고, 경찰은 조사를 수행합니다.\n")
         agent_info = state["agent_info"]
-        
-        mafia_targets = []
-        detective_results = {}
-       
-        for agent_name, status in agent_info.items():
-            if not status.alive:
-                continue
-
-            # 4-1. 마피아의 밤 공격
-            if status.role == Role.MAFIA:
-                try:
-                    message = create_message(MessageType.NIGHT_ACTION_REQUEST, self.name, agent_name, role=status.role)
-                    response = await self.executor.send_to_other(agent_name, message)
-                    if response:
-                        mafia_targets.append(response[0])
-                        print(f"🧟‍♂️ {agent_name} → {response[0]}")
-                except Exception as e:
-                    print(f"❌ 마피아 행동 실패: {e}")
-
-            # 4-2. 경찰의 조사
-            elif status.role == Role.DETECTIVE:
-                try:
-                    message = create_message(MessageType.NIGHT_ACTION_REQUEST, self.name, agent_name, role=status.role)
-                    response = await self.executor.send_to_other(agent_name, message)
-                    if response:
-                        target = response[0]
-                        is_mafia = agent_info.get(target, AgentStatus(Role.VILLAGER)).role == Role.MAFIA
-                        detective_results[agent_name] = (target, is_mafia)
-                        print(f"🕵️ {agent_name} → {target} is {'MAFIA' if is_mafia else 'NOT MAFIA'}")
-                except Exception as e:
-                    print(f"❌ 경찰 행동 실패: {e}")
-
-        # 4-3. 마피아 타겟 결정 (복수일 경우 랜덤 선택)
-        if mafia_targets:
-            votes = Counter(mafia_targets)
-            max_vote = max(votes.values())
-            candidates = [name for name, count in votes.items() if count == max_vote]
-            killed = random.choice(candidates)
-            if killed in agent_info:
-                state["agent_info"][killed].alive = False
-                print(f"\n💀 밤 동안 {killed} 가 제거되었습니다.")
-
-                # 전체에게 제거 사실을 알림
-                for agent_name in agent_info.keys():
-                    msg = create_message(MessageType.KILLED_RESULT, self.name, agent_name, target=killed)
-                    await self.executor.send_to_other(agent_name, msg)
-        else:
-            print("😴 마피아가 아무도 제거하지 않았습니다.")
-
-        # 4-4. 경찰에게 조사 결과 전달
-        for detective, (target, is_mafia) in detective_results.items():
-            try:
-                message = create_message(MessageType.NIGHT_ACTION_RESULT, self.name, detective, target=target, is_mafia=is_mafia)
-                await self.executor.send_to_other(detective, message)
-            except Exception as e:
-                print(f"❌ 경찰 결과 전송 실패: {e}")
 
+        async def announce_kill(killed: str):
+            print(f"\n💀 밤 동안 {killed} 가 제거되었습니다.")
+            # 전체에게 제거 사실을 알림
+            await self.executor.multicast(
+                self.reachable_agents(agent_info),
+                create_broadcast(MessageType.KILLED_RESULT, self.name, target=killed),
+                context_id=context_id,
+            )
+
+        # 마피아/경찰에게 동시에 요청 (역할별 기한은 night_policy)
+        night = NightPhase(self.executor, self.name, agent_info, context_id, self.night_policy)
+        await night.run(announce_kill)
         return state
 
-    async def node_check_end(self, state: GameState):
+    async def node_check_end(self, state: GameState, config: RunnableConfig):
+        context_id = self.get_context_id(config)
         over, winner = self.evaluate_game_over(state["agent_info"])
         state["game_over"] = over
 
@@ -303,12 +381,26 @@ class LangGraphManagerAgent(BaseAgent):
             print(f"🏁 게임 종료! 승리 팀: {winner}")
 
             state["winner"] = winner
-            for agent_name in state["agent_info"].keys():
-                msg = create_message(MessageType.GAME_RESULT, self.name, agent_name, winner=winner)
-                await self.executor.send_to_other(agent_name, msg)
+            # 게임 종료 통보는 circuit이 열린 에이전트에게도 한 번씩은 시도
+            await self.executor.multicast(
+                list(state["agent_info"]),
+                create_broadcast(MessageType.GAME_RESULT, self.name, winner=winner),
+                context_id=context_id,
+            )
                      
         return state
 
+    def present_agents(self, agent_info: Dict[str, AgentStatus]) -> list[str]:
+        """
+        메시지를 보낼 살아 있는 에이전트.
+        circuit이 열린 (응답하지 않는) 에이전트는 회복될 때까지 없는 것으로 봅니다.
+        """
+        return [name for name, status in agent_info.items()
+                if status.alive and self.executor.reachable(name)]
+
+    def reachable_agents(self, agent_info: Dict[str, AgentStatus]) -> list[str]:
+        return [name for name in agent_info if self.executor.reachable(name)]
+
     def evaluate_game_over(self, agent_info: Dict[str, AgentStatus]):
         """
         게임 종료 조건을 확인합니다.
@@ -325,7 +417,6 @@ class LangGraphManagerAgent(BaseAgent):
         else:
             return False, None
 
-        
-
-
-        
\ No newline at end of file
+    async def handle_message(self, message: str, context_id: Optional[str] = None) -> str:
+        logger.info(f"📩 LangGraphManagerAgent received message: {message}")
+        return "Manager does not respond to messages."
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import os
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator
+from typing import Dict
+from typing import Optional
+
+import google.generativeai as genai
+
+from llm_cache import SharedResponseCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class GeminiExecutor:
+    """
+    Gemini 호출을 이벤트 루프 밖에서 실행하는 LLM 실행 계층.
+
+    google-generativeai의 generate_content는 동기 함수이므로 에이전트 전용
+    스레드 풀에서 실행합니다. 그 사이에도 uvicorn 이벤트 루프는 다른 A2A 요청
+    (투표, 다른 메시지 판단 등)을 계속 처리할 수 있습니다.
+    """
+
+    def __init__(self, model_name: str, max_concurrency: int = 4, api_key: Optional[str] = None,
+                 cache: Optional[SharedResponseCache] = None):
+        """
+        Args:
+            model_name: 기본으로 사용할 모델 이름 (예: 'gemini-2.5-flash')
+            max_concurrency: 이 에이전트가 동시에 실행할 수 있는 최대 LLM 호출 수
+            api_key: Gemini API 키, None이면 GEMINI_API_KEY 환경 변수를 사용
+            cache: 프로세스 간 공유 응답 캐시, None이면 캐시하지 않음
+        """
+        self.model_name = model_name
+        self.cache = cache
+        self.max_concurrency = max(1, max_concurrency)
+        self._models: Dict[str, genai.GenerativeModel] = {}
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="gemini",
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        genai.configure(api_key=api_key or os.getenv("GEMINI_API_KEY"))
+
+    def get_model(self, model_name: Optional[str] = None) -> genai.GenerativeModel:
+        """모델 이름별로 GenerativeModel 인스턴스를 한 번만 만들고 재사용합니다."""
+        name = model_name or self.model_name
+        model = self._models.get(name)
+        if model is None:
+            model = genai.GenerativeModel(name)
+            self._models[name] = model
+        return model
+
+    async def generate(self, prompt: str, model_name: Optional[str] = None,
+                       cache_version: Optional[str] = None) -> str:
+        """
+        프롬프트를 스레드 풀에서 실행하고 응답 텍스트를 반환합니다.
+
+        동시 실행 수를 넘는 호출은 스레드 풀 큐가 아니라 세마포어에서 대기하므로,
+        대기 중에 취소된 요청은 모델을 호출하지 않습니다.
+
+        Args:
+            prompt: 모델에 보낼 프롬프트
+            model_name: 사용할 모델, None이면 기본 모델
+            cache_version: 프롬프트 템플릿 버전. 지정하면 공유 캐시를 사용합니다.
+                           (수신자와 무관한 판단 프롬프트처럼 결과를 공유해도 되는 경우에만)
+        """
+        name = model_name or self.model_name
+        if self.cache and cache_version:
+            return await self.cache.get_or_compute(
+                name, cache_version, prompt,
+                lambda: self._generate(prompt, name),
+            )
+        return await self._generate(prompt, name)
+
+    async def _generate(self, prompt: str, model_name: str) -> str:
+        model = self.get_model(model_name)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(self._pool, model.generate_content, prompt)
+        return response.text
+
+    async def stream(self, prompt: str, model_name: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        응답을 생성되는 대로 조각 단위로 돌려줍니다. (generate_content(stream=True))
+
+        동기 스트림 반복은 스레드 풀에서 실행하고 조각은 큐를 통해 이벤트 루프로 넘기므로,
+        호출 측은 전체 응답을 기다리지 않고 첫 조각부터 처리할 수 있습니다.
+        스트리밍 응답은 수신자마다 다르므로 공유 캐시를 사용하지 않습니다.
+        """
+        model = self.get_model(model_name)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stopped = threading.Event()
+        done = object()
+
+        def produce():
+            try:
+                for chunk in model.generate_content(prompt, stream=True):
+                    if stopped.is_set():
+                        break
+                    if chunk.text:
+                        loop.call_soon_threadsafe(queue.put_nowait, chunk.text)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        async with self._semaphore:
+            future = loop.run_in_executor(self._pool, produce)
+            try:
+                while (item := await queue.get()) is not done:
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+            finally:
+                # 소비가 중단되면 (취소 등) 남은 조각은 읽지 않고 스레드를 멈춤
+                stopped.set()
+                await asyncio.shield(future)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self.cache:
+            self.cache.close()